@@ -0,0 +1,4 @@
+"""
+Bronze Layer
+Schemas and ingestion helpers for the raw bronze data.
+"""
@@ -0,0 +1,133 @@
+"""
+Bronze Arrow Cache
+Parse-once cache of typed bronze tables. The first reader of a bronze CSV parses it with the
+schema registry's compact dtypes and writes the result to a cache directory as an uncompressed
+Arrow IPC (Feather v2) file keyed by the source path, stamped with the source fingerprint and
+the dtypes it was parsed with. Later readers memory-map that file instead of parsing the CSV again: Arrow-backed string
+columns are handed to pandas without copying, so processes reading the same table share its
+pages through the OS page cache. A changed source or registry invalidates the cache, and a
+cache directory that cannot be written to falls back to parsing the CSV.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from bronze.landing import BRONZE_DIR
+from bronze.manifest import fingerprint_file
+from bronze.registry import compact_dtypes, read_bronze_csv
+
+# Sources larger than this are streamed from the CSV instead of cached, since building the
+# cache parses the whole file in memory (0 disables the cache)
+ARROW_CACHE_MAX_BYTES = int(os.environ.get('BRONZE_ARROW_CACHE_MAX_BYTES', str(1024 * 1024 * 1024)))
+
+# Directory holding the caches, so source directories (and read-only data mounts) are never written to
+ARROW_CACHE_DIR = os.environ.get('BRONZE_ARROW_CACHE_DIR', os.path.join(BRONZE_DIR, 'arrow_cache'))
+
+ARROW_CACHE_SUFFIX = '.arrow'
+ARROW_CACHE_VERSION = 1
+
+# Schema metadata key holding the cache's source fingerprint and dtypes
+METADATA_KEY = b'bronze_arrow_cache'
+
+# Arrow string columns stay Arrow-backed in pandas, which keeps them zero-copy
+STRING_DTYPES = {pa.string(): pd.StringDtype('pyarrow'), pa.large_string(): pd.StringDtype('pyarrow')}
+
+def arrow_cache_path(path, cache_dir=ARROW_CACHE_DIR):
+    """Return the path of a bronze file's Arrow cache, keyed by the file's absolute path."""
+    path = os.path.abspath(path)
+    key = hashlib.sha256(path.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f'{os.path.basename(path)}-{key}{ARROW_CACHE_SUFFIX}')
+
+def is_cacheable(path, max_bytes=ARROW_CACHE_MAX_BYTES):
+    """Return whether a bronze file is small enough to be cached."""
+    return max_bytes > 0 and os.path.getsize(path) <= max_bytes
+
+def _cache_metadata(table, fingerprint):
+    """Return the schema metadata that ties a cache to its source and dtypes."""
+    return json.dumps({
+        'version': ARROW_CACHE_VERSION,
+        'table': table,
+        'dtypes': compact_dtypes(table),
+        'source': fingerprint,
+    }, sort_keys=True).encode()
+
+def open_arrow_cache(path, table, cache_dir=ARROW_CACHE_DIR):
+    """Memory-map a bronze file's Arrow cache, returning None if it is missing or stale."""
+    cache_path = arrow_cache_path(path, cache_dir)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(cache_path))
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    stored = json.loads((reader.schema.metadata or {}).get(METADATA_KEY, b'{}'))
+    if (stored.get('version') != ARROW_CACHE_VERSION or stored.get('table') != table
+            or stored.get('dtypes') != compact_dtypes(table)):
+        return None
+    # Reuses the stored hash while the source's size and mtime are unchanged
+    if fingerprint_file(path, stored.get('source'))['sha256'] != stored.get('source', {}).get('sha256'):
+        return None
+    return reader.read_all()
+
+def write_arrow_cache(path, table, frame, fingerprint, cache_dir=ARROW_CACHE_DIR):
+    """Atomically write a typed frame as the Arrow cache of a bronze file."""
+    arrow_table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(arrow_table.schema.metadata or {})
+    metadata[METADATA_KEY] = _cache_metadata(table, fingerprint)
+    cache_path = arrow_cache_path(path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    # Uncompressed, so readers can use the mapped buffers as they are
+    feather.write_feather(arrow_table.replace_schema_metadata(metadata), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+def build_arrow_cache(path, table, cache_dir=ARROW_CACHE_DIR):
+    """Parse a bronze CSV with its compact dtypes and cache it, returning the parsed frame."""
+    # Fingerprint before parsing, so a source modified mid-parse leaves a stale cache
+    fingerprint = fingerprint_file(path)
+    frame = read_bronze_csv(path, table)
+    try:
+        write_arrow_cache(path, table, frame, fingerprint, cache_dir)
+    except (OSError, pa.ArrowException):
+        # Unwritable cache directory or a column Arrow cannot store: serve the frame uncached
+        pass
+    return frame
+
+def arrow_to_frame(arrow_table, offset=0):
+    """Convert a (memory-mapped) Arrow table to pandas, keeping string columns zero-copy."""
+    frame = arrow_table.to_pandas(types_mapper=STRING_DTYPES.get, split_blocks=True)
+    frame.index = pd.RangeIndex(offset, offset + len(frame))
+    return frame
+
+def _cached_chunks(arrow_table, chunksize):
+    """Yield a cached table as frames of chunksize rows, like read_csv's chunked reader."""
+    for offset in range(0, arrow_table.num_rows, chunksize):
+        yield arrow_to_frame(arrow_table.slice(offset, chunksize), offset)
+
+def read_cached_bronze(path, table, chunksize=None, max_bytes=ARROW_CACHE_MAX_BYTES, cache_dir=ARROW_CACHE_DIR):
+    """Read a bronze CSV through its Arrow cache, building the cache first if it is missing or stale.
+
+    Returns the same compact dtypes as read_bronze_csv; with chunksize, yields typed chunks.
+    Files above max_bytes, or whose cache cannot be written to cache_dir, are read straight
+    from the CSV.
+    """
+    if not is_cacheable(path, max_bytes):
+        return read_bronze_csv(path, table, chunksize=chunksize)
+
+    arrow_table = open_arrow_cache(path, table, cache_dir)
+    if arrow_table is None:
+        frame = build_arrow_cache(path, table, cache_dir)
+        arrow_table = open_arrow_cache(path, table, cache_dir)
+        if arrow_table is None:
+            return read_bronze_csv(path, table, chunksize=chunksize) if chunksize else frame
+
+    if chunksize:
+        return _cached_chunks(arrow_table, chunksize)
+    return arrow_to_frame(arrow_table)
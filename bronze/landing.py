@@ -0,0 +1,153 @@
+"""
+Bronze Landing Format
+Converts raw bronze CSV exports into typed, compressed Parquet files before they are
+uploaded to GCS. BigQuery loads Parquet in parallel, whereas CSV loads with quoted
+newlines are parsed on a single thread.
+"""
+
+import csv
+import io
+import logging
+import os
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from bronze.schemas import BRONZE_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Define paths
+BRONZE_DIR = os.path.dirname(os.path.abspath(__file__))
+BRONZE_DATA_DIR = os.path.join(BRONZE_DIR, 'data')
+BRONZE_LANDING_DIR = os.path.join(BRONZE_DIR, 'landing')
+
+# Parquet layout
+ROW_GROUP_SIZE = int(os.environ.get('BRONZE_ROW_GROUP_SIZE', '500000'))
+PARQUET_COMPRESSION = os.environ.get('BRONZE_PARQUET_COMPRESSION', 'snappy')
+
+# CSV bytes parsed per record batch
+CSV_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Map BigQuery column types to Arrow types (NUMERIC is DECIMAL(38, 9) in BigQuery)
+BIGQUERY_TO_ARROW_TYPES = {
+    'STRING': pa.string(),
+    'DATE': pa.date32(),
+    'NUMERIC': pa.decimal128(38, 9),
+    'INTEGER': pa.int64(),
+    'FLOAT': pa.float64(),
+    'BOOLEAN': pa.bool_(),
+    'TIMESTAMP': pa.timestamp('us', tz='UTC'),
+}
+
+def arrow_schema(schema_fields):
+    """Build an Arrow schema from BigQuery schema fields."""
+    return pa.schema([
+        pa.field(
+            field['name'],
+            BIGQUERY_TO_ARROW_TYPES[field['type']],
+            nullable=field.get('mode', 'NULLABLE') != 'REQUIRED',
+        )
+        for field in schema_fields
+    ])
+
+def source_path(table):
+    """Return the local path of a bronze table's raw CSV export."""
+    return os.path.join(BRONZE_DATA_DIR, BRONZE_TABLES[table]['source_file'])
+
+def landing_path(table):
+    """Return the local path of a bronze table's Parquet landing file."""
+    return os.path.join(BRONZE_LANDING_DIR, f'{table}.parquet')
+
+def _csv_options(schema, allow_quoted_newlines, skip_rows, invalid_row_handler=None):
+    """Build pyarrow CSV options equivalent to the previous BigQuery CSV load settings."""
+    read_options = pacsv.ReadOptions(column_names=schema.names, skip_rows=skip_rows, block_size=CSV_BLOCK_SIZE)
+    parse_options = pacsv.ParseOptions(
+        newlines_in_values=allow_quoted_newlines,
+        invalid_row_handler=invalid_row_handler,
+    )
+    # BigQuery loads empty CSV fields as NULL for every type
+    convert_options = pacsv.ConvertOptions(
+        column_types=schema,
+        null_values=[''],
+        strings_can_be_null=True,
+    )
+    return read_options, parse_options, convert_options
+
+def _pad_jagged_rows(row_texts, schema):
+    """Parse rows with missing trailing columns, padding them with NULLs like BigQuery's allow_jagged_rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in csv.reader(io.StringIO('\n'.join(row_texts))):
+        writer.writerow(row + [''] * (len(schema) - len(row)))
+    
+    options = _csv_options(schema, allow_quoted_newlines=True, skip_rows=0)
+    return pacsv.read_csv(io.BytesIO(buffer.getvalue().encode('utf-8')), *options)
+
+def convert_csv_to_parquet(csv_path, parquet_path, schema_fields, allow_quoted_newlines=False,
+                           allow_jagged_rows=False, row_group_size=ROW_GROUP_SIZE,
+                           compression=PARQUET_COMPRESSION):
+    """Convert a CSV file with a header row into a typed Parquet file.
+    
+    The CSV is streamed batch by batch, so memory is bounded by the CSV block size, and
+    each batch is written as one or more row groups of at most row_group_size rows.
+    Rows with missing trailing columns are padded with NULLs (and appended after the
+    other rows) when allow_jagged_rows is set. Returns a dict of conversion statistics.
+    """
+    schema = arrow_schema(schema_fields)
+    jagged_rows = []
+    
+    def handle_invalid_row(row):
+        if allow_jagged_rows and row.actual_columns < row.expected_columns:
+            jagged_rows.append(row.text)
+            return 'skip'
+        return 'error'
+    
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp_path = f'{parquet_path}.tmp'
+    row_count = 0
+    
+    # Write to a temporary file so a failed conversion never leaves a partial landing file
+    try:
+        with pq.ParquetWriter(tmp_path, schema, compression=compression) as writer:
+            reader = pacsv.open_csv(csv_path, *_csv_options(schema, allow_quoted_newlines, 1, handle_invalid_row))
+            for batch in reader:
+                table = pa.Table.from_batches([batch]).cast(schema)
+                writer.write_table(table, row_group_size=row_group_size)
+                row_count += table.num_rows
+        
+            if jagged_rows:
+                logger.warning(f"Padding {len(jagged_rows)} jagged rows in {csv_path} with NULLs")
+                table = _pad_jagged_rows(jagged_rows, schema).cast(schema)
+                writer.write_table(table, row_group_size=row_group_size)
+                row_count += table.num_rows
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    os.replace(tmp_path, parquet_path)
+    
+    stats = {
+        'source': csv_path,
+        'destination': parquet_path,
+        'rows': row_count,
+        'jagged_rows': len(jagged_rows),
+        'row_groups': pq.ParquetFile(parquet_path).num_row_groups,
+        'source_bytes': os.path.getsize(csv_path),
+        'parquet_bytes': os.path.getsize(parquet_path),
+    }
+    logger.info(f"Converted {csv_path} to {parquet_path}: {stats}")
+    return stats
+
+def convert_bronze_table(table, **kwargs):
+    """Convert one registered bronze table from its CSV export to its Parquet landing file."""
+    config = BRONZE_TABLES[table]
+    return convert_csv_to_parquet(
+        source_path(table),
+        landing_path(table),
+        config['schema_fields'],
+        allow_quoted_newlines=config['allow_quoted_newlines'],
+        allow_jagged_rows=config['allow_jagged_rows'],
+    )
@@ -0,0 +1,90 @@
+"""
+Bronze Ingestion Manifest
+Records a fingerprint (content hash, size and mtime) of every bronze source file that
+has been loaded, so the pipeline can skip files that have not changed since. Unchanged files
+are still reloaded once their last load is older than the snapshot refresh age, before their
+bronze partition expires.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+
+from bronze.landing import BRONZE_LANDING_DIR, source_path
+from bronze.partitioning import SNAPSHOT_REFRESH_DAYS
+from bronze.schemas import BRONZE_TABLES
+
+MANIFEST_PATH = os.environ.get('BRONZE_MANIFEST_PATH', os.path.join(BRONZE_LANDING_DIR, 'manifest.json'))
+
+# Bytes read per hashing step
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def fingerprint_file(path, previous=None):
+    """Fingerprint a file, reusing the previous content hash if its size and mtime are unchanged."""
+    stat = os.stat(path)
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime') == stat.st_mtime:
+        return {'sha256': previous['sha256'], 'size': stat.st_size, 'mtime': stat.st_mtime}
+    return {'sha256': file_sha256(path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Load the manifest, returning an empty one if it does not exist yet."""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """Atomically write the manifest."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def is_snapshot_stale(entry, refresh_days=SNAPSHOT_REFRESH_DAYS, now=None):
+    """Return whether a manifest entry's last load is old enough for its snapshot to be refreshed."""
+    if refresh_days <= 0:
+        return False
+    if 'loaded_at' not in entry:
+        return True
+    loaded_at = datetime.datetime.fromisoformat(entry['loaded_at'])
+    return (now or datetime.datetime.utcnow()) - loaded_at >= datetime.timedelta(days=refresh_days)
+
+def detect_changed_tables(tables=None, manifest_path=MANIFEST_PATH, refresh_days=SNAPSHOT_REFRESH_DAYS, now=None):
+    """Return {table: fingerprint} for bronze tables whose source file is new or modified.
+    
+    A file only counts as changed when its content hash differs from the manifest, so a
+    touched but otherwise identical file is not reloaded, unless its last load is at least
+    refresh_days old and its snapshot would otherwise expire.
+    """
+    manifest = load_manifest(manifest_path)
+    changed = {}
+    
+    for table in tables or BRONZE_TABLES:
+        previous = manifest.get(table)
+        fingerprint = fingerprint_file(source_path(table), previous)
+        if (previous is None or previous['sha256'] != fingerprint['sha256']
+                or is_snapshot_stale(previous, refresh_days, now)):
+            changed[table] = fingerprint
+    
+    return changed
+
+def record_loaded_tables(fingerprints, manifest_path=MANIFEST_PATH):
+    """Record the fingerprints of bronze tables that were loaded successfully."""
+    if not fingerprints:
+        return
+    
+    manifest = load_manifest(manifest_path)
+    loaded_at = datetime.datetime.utcnow().isoformat()
+    for table, fingerprint in fingerprints.items():
+        manifest[table] = dict(fingerprint, loaded_at=loaded_at)
+    save_manifest(manifest, manifest_path)
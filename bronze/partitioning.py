@@ -0,0 +1,138 @@
+"""
+Bronze Partitioning
+Partitioning and retention of the bronze tables. Every load lands a full snapshot in that
+day's ingestion-time partition and silver reads the latest one, so partitions expire after
+PARTITION_EXPIRATION_DAYS, and unchanged sources are reloaded every SNAPSHOT_REFRESH_DAYS
+(see bronze/manifest.py) so the latest snapshot never expires.
+
+Also holds the one-off migration of bronze tables created before partitioning was introduced.
+Loading through the `table$YYYYMMDD` partition decorator fails while the table exists
+unpartitioned, so each unpartitioned bronze table is recreated as an ingestion-time DAY
+partitioned table, with its current rows kept as the snapshot of the day before the migration
+(the next scheduled load lands beside or replaces it). The rows are copied into a staging table
+first, and the staging table is kept if the final copy fails. Tables that are already
+partitioned only get their partition expiration set, so the migration can be rerun safely.
+Run it once before the first partitioned load:
+
+    python -m bronze.partitioning --project my-project --dataset bronze
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+
+from bronze.schemas import BRONZE_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Days each bronze partition (one full snapshot) is kept before BigQuery drops it (0 keeps them all)
+PARTITION_EXPIRATION_DAYS = int(os.environ.get('BRONZE_PARTITION_EXPIRATION_DAYS', '30'))
+
+# Unchanged sources are reloaded once their last load is this many days old, well before the
+# snapshot silver reads expires (0 when partitions never expire)
+SNAPSHOT_REFRESH_DAYS = max(1, PARTITION_EXPIRATION_DAYS // 2) if PARTITION_EXPIRATION_DAYS > 0 else 0
+
+STAGING_SUFFIX = '_partitioned'
+
+def partition_expiration_ms(expiration_days=PARTITION_EXPIRATION_DAYS):
+    """Return the partition expiration in milliseconds, or None if partitions never expire."""
+    return expiration_days * 24 * 60 * 60 * 1000 if expiration_days > 0 else None
+
+def time_partitioning(expiration_days=PARTITION_EXPIRATION_DAYS):
+    """Return the load job time_partitioning of the bronze tables."""
+    partitioning = {'type': 'DAY'}
+    if expiration_days > 0:
+        partitioning['expirationMs'] = str(partition_expiration_ms(expiration_days))
+    return partitioning
+
+def is_partitioned(table):
+    """Return whether a BigQuery table is ingestion-time partitioned by day."""
+    partitioning = table.time_partitioning
+    return partitioning is not None and partitioning.type_ == 'DAY' and partitioning.field is None
+
+def _set_expiration(client, table, expiration_ms, dry_run):
+    """Set a partitioned table's partition expiration, returning what was done."""
+    if table.time_partitioning.expiration_ms == expiration_ms:
+        return 'partitioned'
+    if dry_run:
+        return 'would set expiration'
+    partitioning = table.time_partitioning
+    partitioning.expiration_ms = expiration_ms
+    table.time_partitioning = partitioning
+    client.update_table(table, ['time_partitioning'])
+    return 'expiration set'
+
+def migrate_bronze_table(client, dataset, name, dry_run=False, expiration_days=PARTITION_EXPIRATION_DAYS, today=None):
+    """Recreate an unpartitioned bronze table as ingestion-time DAY partitioned, returning what was done."""
+    from google.api_core.exceptions import NotFound
+    from google.cloud import bigquery
+
+    table_id = f'{client.project}.{dataset}.{name}'
+    try:
+        table = client.get_table(table_id)
+    except NotFound:
+        # The next load creates it partitioned
+        return 'missing'
+    expiration_ms = partition_expiration_ms(expiration_days)
+    if is_partitioned(table):
+        return _set_expiration(client, table, expiration_ms, dry_run)
+    if table.time_partitioning is not None:
+        raise ValueError(f'{table_id} is partitioned by {table.time_partitioning.field}, not by ingestion time')
+    if dry_run:
+        return 'would migrate'
+
+    staging_id = f'{table_id}{STAGING_SUFFIX}'
+    client.delete_table(staging_id, not_found_ok=True)
+    staging = bigquery.Table(staging_id, schema=table.schema)
+    staging.time_partitioning = bigquery.TimePartitioning(type_='DAY', expiration_ms=expiration_ms)
+    client.create_table(staging)
+
+    columns = ', '.join(f'`{field.name}`' for field in table.schema)
+    day = (today or datetime.date.today()) - datetime.timedelta(days=1)
+    client.query(f"""
+        INSERT INTO `{staging_id}` (_PARTITIONTIME, {columns})
+        SELECT TIMESTAMP('{day.isoformat()}'), {columns}
+        FROM `{table_id}`
+    """).result()
+    copied = client.get_table(staging_id).num_rows
+    if copied != table.num_rows:
+        raise RuntimeError(f'Copied {copied} of the {table.num_rows} rows of {table_id} into {staging_id}')
+    logger.info('Copied %s rows of %s into partition %s of %s', copied, table_id, day, staging_id)
+
+    # A copy job keeps the staging table's partitioning under the original name
+    client.delete_table(table_id)
+    try:
+        client.copy_table(staging_id, table_id).result()
+    except Exception:
+        logger.error('Copying %s back to %s failed; its rows are kept in %s', staging_id, table_id, staging_id)
+        raise
+    client.delete_table(staging_id)
+    return 'migrated'
+
+def migrate_bronze_tables(client, dataset, tables=None, dry_run=False, expiration_days=PARTITION_EXPIRATION_DAYS):
+    """Migrate every bronze table, returning {table: what was done}."""
+    return {
+        name: migrate_bronze_table(client, dataset, name, dry_run=dry_run, expiration_days=expiration_days)
+        for name in (tables or BRONZE_TABLES)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Recreate unpartitioned bronze tables as ingestion-time partitioned tables')
+    parser.add_argument('--project', required=True)
+    parser.add_argument('--dataset', default='bronze')
+    parser.add_argument('--table', action='append', choices=sorted(BRONZE_TABLES), help='Table to migrate (default: all)')
+    parser.add_argument('--expiration-days', type=int, default=PARTITION_EXPIRATION_DAYS)
+    parser.add_argument('--dry-run', action='store_true', help='Only report the tables that need migrating')
+    args = parser.parse_args(argv)
+
+    from google.cloud import bigquery
+
+    logging.basicConfig(level=logging.INFO)
+    client = bigquery.Client(project=args.project)
+    results = migrate_bronze_tables(client, args.dataset, args.table, args.dry_run, args.expiration_days)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
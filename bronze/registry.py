@@ -0,0 +1,144 @@
+"""
+Bronze Schema Registry
+Typed view of every bronze table, shared by validation and local tooling. Column order and
+BigQuery types come from the DAG schema fields, and each column's logical type comes from its
+`meta.logical_type` in the dbt sources.yml (falling back to its BigQuery type). Logical types
+map to compact pandas dtypes: IDs and text as Arrow-backed strings, repeated values as
+categoricals, amounts as float64 and dates and timestamps as datetime64.
+"""
+
+import functools
+import os
+import warnings
+
+import pandas as pd
+import yaml
+
+from bronze.schemas import BRONZE_TABLES
+
+SOURCES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'silver_layer', 'transformations', 'models', 'sources.yml',
+)
+SOURCE_NAME = 'bronze'
+
+# Compact pandas dtype for each logical type
+LOGICAL_DTYPES = {
+    'key': 'string[pyarrow]',
+    'text': 'string[pyarrow]',
+    'reference': 'category',
+    'category': 'category',
+    'amount': 'float64',
+    'integer': 'Int64',
+    'date': 'datetime64[ns]',
+    'timestamp': 'datetime64[ns]',
+}
+
+# Logical type of columns without a meta.logical_type in sources.yml
+BIGQUERY_LOGICAL_TYPES = {
+    'STRING': 'text',
+    'NUMERIC': 'amount',
+    'FLOAT': 'amount',
+    'INTEGER': 'integer',
+    'DATE': 'date',
+    'TIMESTAMP': 'timestamp',
+}
+
+# Dtypes set while parsing the CSV; the others are converted after parsing, see apply_compact_dtypes
+PARSE_DTYPES = {'string[pyarrow]', 'category'}
+
+# Dtype of numeric and date columns holding values that do not parse
+FALLBACK_DTYPE = 'string[pyarrow]'
+
+def load_source_columns(sources_path=SOURCES_PATH, source_name=SOURCE_NAME):
+    """Return {table: {column: column spec}} for one source in a dbt sources.yml."""
+    with open(sources_path, 'r') as f:
+        sources = yaml.safe_load(f)
+    source = next(source for source in sources['sources'] if source['name'] == source_name)
+    return {
+        table['name']: {column['name']: column for column in table.get('columns', [])}
+        for table in source.get('tables', [])
+    }
+
+@functools.lru_cache(maxsize=None)
+def schema_registry(sources_path=SOURCES_PATH):
+    """Return {table: [column, ...]} with each column's name, BigQuery, logical and pandas types."""
+    source_columns = load_source_columns(sources_path)
+    registry = {}
+    for table, config in BRONZE_TABLES.items():
+        documented = source_columns.get(table, {})
+        missing = [field['name'] for field in config['schema_fields'] if field['name'] not in documented]
+        if documented and missing:
+            raise ValueError(f"Bronze table {table} columns missing from {sources_path}: {', '.join(missing)}")
+        columns = []
+        for field in config['schema_fields']:
+            meta = documented.get(field['name'], {}).get('meta') or {}
+            logical_type = meta.get('logical_type', BIGQUERY_LOGICAL_TYPES.get(field['type'], 'text'))
+            if logical_type not in LOGICAL_DTYPES:
+                raise ValueError(f"Unknown logical type {logical_type} for {table}.{field['name']}")
+            columns.append({
+                'name': field['name'],
+                'bigquery_type': field['type'],
+                'logical_type': logical_type,
+                'dtype': LOGICAL_DTYPES[logical_type],
+            })
+        registry[table] = columns
+    return registry
+
+def compact_dtypes(table):
+    """Return {column: pandas dtype} for a bronze table."""
+    return {column['name']: column['dtype'] for column in schema_registry()[table]}
+
+def parse_dtypes(table):
+    """Return the read_csv dtype hints for a bronze table's string and categorical columns."""
+    return {name: dtype for name, dtype in compact_dtypes(table).items() if dtype in PARSE_DTYPES}
+
+def _convert(series, dtype, logical_type):
+    """Convert a parsed column to a numeric or datetime dtype, turning unparseable values into nulls."""
+    if logical_type == 'date':
+        return pd.to_datetime(series, format='%Y-%m-%d', errors='coerce')
+    if dtype == 'datetime64[ns]':
+        with warnings.catch_warnings():
+            # Mixed formats are expected in raw timestamps; the unparseable ones are checked below
+            warnings.simplefilter('ignore', UserWarning)
+            return pd.to_datetime(series, errors='coerce')
+    if dtype == 'Int64':
+        numbers = pd.to_numeric(series, errors='coerce')
+        # Non-integral values count as unparseable rather than being rounded
+        return numbers.mask(numbers % 1 != 0).astype('Int64')
+    return pd.to_numeric(series, errors='coerce').astype(dtype)
+
+def apply_compact_dtypes(frame, table):
+    """Convert a frame's registered columns to their compact dtypes, in place.
+
+    Numeric and date columns are only converted when every value parses. A column with
+    malformed values keeps them as strings, so they (and the validation failures they
+    cause) are never lost.
+    """
+    for column in schema_registry()[table]:
+        name, dtype = column['name'], column['dtype']
+        if name not in frame.columns or str(frame[name].dtype) == dtype:
+            continue
+        series = frame[name]
+        if dtype in PARSE_DTYPES:
+            frame[name] = series.astype(dtype)
+            continue
+        converted = _convert(series, dtype, column['logical_type'])
+        if (converted.isna() & series.notna()).any():
+            # Fractional values in an integer column are kept as strings too, so they fail type checks
+            keep_as_string = series.dtype == object or dtype == 'Int64'
+            frame[name] = series.astype(FALLBACK_DTYPE) if keep_as_string else series
+        else:
+            frame[name] = converted
+    return frame
+
+def read_bronze_csv(path, table, chunksize=None, **kwargs):
+    """Read a CSV with a bronze table's compact dtypes; with chunksize, yield typed chunks."""
+    reader = pd.read_csv(path, dtype=parse_dtypes(table), chunksize=chunksize, **kwargs)
+    if chunksize:
+        return (apply_compact_dtypes(chunk, table) for chunk in reader)
+    return apply_compact_dtypes(reader, table)
+
+def memory_usage_bytes(frame):
+    """Return a frame's deep memory usage in bytes."""
+    return int(frame.memory_usage(deep=True).sum())
@@ -0,0 +1,63 @@
+"""
+Bronze Layer Schemas
+BigQuery schemas for the raw bronze tables, shared by the pipeline DAG and local tooling.
+"""
+
+# Raw source file, BigQuery schema and CSV quirks for each bronze table
+BRONZE_TABLES = {
+    'contracts': {
+        'source_file': 'contracts_simple.csv',
+        'schema_fields': [
+            {'name': 'contract_id', 'type': 'STRING', 'mode': 'REQUIRED'},
+            {'name': 'contract_name', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'client_name', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'start_date', 'type': 'DATE', 'mode': 'NULLABLE'},
+            {'name': 'end_date', 'type': 'DATE', 'mode': 'NULLABLE'},
+            {'name': 'contract_value', 'type': 'NUMERIC', 'mode': 'NULLABLE'},
+            {'name': 'contract_status', 'type': 'STRING', 'mode': 'NULLABLE'},
+        ],
+        'allow_quoted_newlines': False,
+        'allow_jagged_rows': False,
+    },
+    'budgets': {
+        'source_file': 'budgets_simple.csv',
+        'schema_fields': [
+            {'name': 'id', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'contractId', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'name', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'code', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'scope', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'plannedStartDate', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'plannedEndDate', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'actualStartDate', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'actualEndDate', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'originalAmount', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'actualCost', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'createdAt', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'updatedAt', 'type': 'STRING', 'mode': 'NULLABLE'}
+        ],
+        'allow_quoted_newlines': True,
+        'allow_jagged_rows': True,
+    },
+    'co': {
+        'source_file': 'co_simple.csv',
+        'schema_fields': [
+            {'name': 'id', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'number', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'name', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'scope', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'type', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'contractId', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'estimated', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'proposed', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'submitted', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'approved', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'committed', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'createdAt', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'updatedAt', 'type': 'STRING', 'mode': 'NULLABLE'},
+            {'name': 'statusChangedAt', 'type': 'STRING', 'mode': 'NULLABLE'}
+        ],
+        'allow_quoted_newlines': True,
+        'allow_jagged_rows': True,
+    },
+}
@@ -0,0 +1,298 @@
+"""
+Synthetic Bronze Data
+Generates contracts, budgets and change orders at any scale (from thousands to hundreds of
+millions of rows) for benchmarking the pipeline. The output is deterministic for a given
+seed and chunk size, every budget and change order references a generated contract, a few
+clients own most of the contracts, and a configurable share of the budget and change order
+values are dirty so the SAFE_CAST paths of the silver models are exercised.
+
+Rows are generated and written chunk by chunk, so memory is bounded by the chunk size:
+
+    python -m bronze.synthetic --rows 1000000 --out-dir bronze/synthetic --format parquet
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from bronze.landing import PARQUET_COMPRESSION, ROW_GROUP_SIZE, arrow_schema
+from bronze.schemas import BRONZE_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Contracts generated per chunk, together with their budgets and change orders
+CHUNK_CONTRACTS = 100000
+
+# Average budgets and change orders per contract (negative binomial, so some contracts have many)
+BUDGETS_PER_CONTRACT = 3.0
+CHANGE_ORDERS_PER_CONTRACT = 2.0
+
+# Client popularity follows a Zipf law: with the default skew the top 1% of clients own over half the contracts
+CLIENT_COUNT = 1000
+CLIENT_SKEW = 1.2
+
+# Share of budget and change order values replaced with unparseable text
+DIRTY_RATE = 0.01
+DIRTY_VALUES = {
+    'date': ['N/A', 'TBD', '31/12/2024', '2024-13-01', '0000-00-00', 'not set'],
+    'amount': ['N/A', '12,500.00', '$1000', 'approx 5000', '-', 'TBC'],
+    'timestamp': ['N/A', 'yesterday', '2024-02-30 10:00:00', '1700000000', 'unknown'],
+}
+
+CONTRACT_STATUSES = ['executed', 'active', 'completed', 'pending', 'cancelled', 'draft']
+CONTRACT_STATUS_WEIGHTS = [0.35, 0.25, 0.2, 0.1, 0.05, 0.05]
+CHANGE_ORDER_TYPES = ['Schedule Of Rates', 'Subcontract Variation Order', 'Lump Sum', 'Provisional Sum']
+CONTRACT_WORDS = [
+    'Road', 'Bridge', 'Tunnel', 'Rail', 'Drainage', 'Survey', 'Design', 'Maintenance',
+    'Lighting', 'Signalling', 'Earthworks', 'Noise', 'Vibration', 'Temporary Works', 'Utilities',
+]
+
+EPOCH_START = np.datetime64('2018-01-01')
+EPOCH_DAYS = 8 * 365
+FORMATS = ('csv', 'parquet')
+
+def _rng(seed, chunk):
+    """Return the random generator of one chunk, independent of the chunks before it."""
+    return np.random.default_rng([seed, chunk])
+
+def _client_weights(client_count, skew):
+    """Return Zipf probabilities for the clients, most popular first."""
+    weights = 1.0 / np.arange(1, client_count + 1) ** skew
+    return weights / weights.sum()
+
+def _prefixed_ids(prefix, start, count, width=10):
+    """Return zero-padded ids prefix + (start + 1 .. start + count) as an Arrow string array."""
+    numbers = pc.cast(pa.array(np.arange(start, start + count) + 1), pa.string())
+    return pc.binary_join_element_wise(prefix, pc.utf8_lpad(numbers, width, '0'), '')
+
+def _dates(days):
+    """Return days since EPOCH_START as an Arrow date array."""
+    return pa.array(EPOCH_START + days.astype('timedelta64[D]'))
+
+def _amounts(values):
+    """Return amounts rounded to cents as an Arrow string array."""
+    return pc.cast(pa.array(np.round(values, 2)), pa.string())
+
+def _string_dates(days, missing=None):
+    """Return days since EPOCH_START as ISO date strings, NULL where missing is set."""
+    dates = pc.cast(_dates(days), pa.string())
+    if missing is None:
+        return dates
+    return pc.if_else(pa.array(missing), pa.nulls(len(days), pa.string()), dates)
+
+def _timestamps(days, rng):
+    """Return ISO timestamp strings at a random time on each day."""
+    seconds = rng.integers(0, 24 * 3600, len(days))
+    values = EPOCH_START.astype('datetime64[s]') + (days * 86400 + seconds).astype('timedelta64[s]')
+    return pc.cast(pa.array(values), pa.string())
+
+def _dirty(values, kind, rate, rng):
+    """Replace a `rate` share of the values with dirty text of the given kind."""
+    if rate <= 0:
+        return values
+    mask = rng.random(len(values)) < rate
+    dirty = pa.array(rng.choice(DIRTY_VALUES[kind], len(values)))
+    return pc.if_else(pa.array(mask), dirty, values)
+
+def generate_contracts(rng, start, count, client_weights):
+    """Generate a chunk of contracts as a dict of columns, with the numeric columns needed by the child tables."""
+    clients = rng.choice(len(client_weights), count, p=client_weights)
+    start_days = rng.integers(0, EPOCH_DAYS, count)
+    durations = np.clip(rng.lognormal(6.0, 0.6, count), 30, 3650).astype('int64')
+    values = np.round(rng.lognormal(12.5, 1.2, count), 2)
+    words = rng.choice(CONTRACT_WORDS, (count, 2))
+    names = pc.binary_join_element_wise(pa.array(words[:, 0]), pa.array(words[:, 1]), 'Services', ' ')
+
+    columns = {
+        'contract_id': _prefixed_ids('CON-', start, count),
+        'contract_name': names,
+        'client_name': pc.binary_join_element_wise('Client ', pc.utf8_lpad(pc.cast(pa.array(clients + 1), pa.string()), 4, '0'), ''),
+        'start_date': _dates(start_days),
+        'end_date': _dates(start_days + durations),
+        'contract_value': pc.cast(pa.array(values), pa.decimal128(38, 9)),
+        'contract_status': pa.array(rng.choice(CONTRACT_STATUSES, count, p=CONTRACT_STATUS_WEIGHTS)),
+    }
+    return columns, {'start_days': start_days, 'durations': durations, 'values': values}
+
+def _child_counts(rng, count, mean):
+    """Return the number of child rows per contract, negative binomial with the given mean."""
+    return rng.negative_binomial(2, 2.0 / (2.0 + mean), count)
+
+def generate_budgets(rng, start, contract_ids, contracts, dirty_rate, mean=BUDGETS_PER_CONTRACT):
+    """Generate the budgets of a chunk of contracts as a dict of columns."""
+    parents = np.repeat(np.arange(len(contract_ids)), _child_counts(rng, len(contract_ids), mean))
+    count = len(parents)
+    contract_start = contracts['start_days'][parents]
+    duration = contracts['durations'][parents]
+
+    planned_start = contract_start + (rng.random(count) * duration * 0.5).astype('int64')
+    planned_end = planned_start + np.maximum((rng.random(count) * duration * 0.5).astype('int64'), 1)
+    actual_start = planned_start + rng.normal(7, 14, count).astype('int64')
+    actual_end = actual_start + (planned_end - planned_start) + rng.normal(0, 21, count).astype('int64')
+    # Most budgets are still running and have no actual end date yet
+    running = rng.random(count) < 0.6
+
+    original = contracts['values'][parents] / np.maximum(rng.normal(4, 1, count), 1) * rng.lognormal(0, 0.3, count)
+    actual_cost = original * rng.beta(4, 3, count) * 1.3
+    created = planned_start - rng.integers(10, 60, count)
+    updated = created + rng.integers(0, 365, count)
+
+    return {
+        'id': _prefixed_ids('B', start, count),
+        'contractId': pc.take(contract_ids, pa.array(parents)),
+        'name': pc.binary_join_element_wise('Budget ', pc.cast(pa.array(np.arange(start, start + count) + 1), pa.string()), ''),
+        'code': _prefixed_ids('BUD', start, count),
+        'scope': pa.array(np.full(count, 'budgetAndCost')),
+        'plannedStartDate': _dirty(_string_dates(planned_start), 'date', dirty_rate, rng),
+        'plannedEndDate': _dirty(_string_dates(planned_end), 'date', dirty_rate, rng),
+        'actualStartDate': _dirty(_string_dates(actual_start), 'date', dirty_rate, rng),
+        'actualEndDate': _dirty(_string_dates(actual_end, missing=running), 'date', dirty_rate, rng),
+        'originalAmount': _dirty(_amounts(original), 'amount', dirty_rate, rng),
+        'actualCost': _dirty(_amounts(actual_cost), 'amount', dirty_rate, rng),
+        'createdAt': _dirty(_timestamps(created, rng), 'timestamp', dirty_rate, rng),
+        'updatedAt': _dirty(_timestamps(updated, rng), 'timestamp', dirty_rate, rng),
+    }
+
+def generate_change_orders(rng, start, contract_ids, contracts, dirty_rate, mean=CHANGE_ORDERS_PER_CONTRACT):
+    """Generate the change orders of a chunk of contracts as a dict of columns."""
+    counts = _child_counts(rng, len(contract_ids), mean)
+    parents = np.repeat(np.arange(len(contract_ids)), counts)
+    count = len(parents)
+    # Change order numbers restart at 1 for every contract
+    numbers = np.arange(count) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+
+    estimated = contracts['values'][parents] * rng.lognormal(-3.5, 0.8, count)
+    proposed = estimated * rng.uniform(0.9, 1.1, count)
+    approved = proposed * rng.uniform(0.8, 1.0, count)
+    # Only some change orders have been approved and committed so far
+    not_approved = pa.array(rng.random(count) < 0.3)
+    not_committed = pc.or_(not_approved, pa.array(rng.random(count) < 0.2))
+    empty = pa.nulls(count, pa.string())
+
+    created = contracts['start_days'][parents] + (rng.random(count) * contracts['durations'][parents]).astype('int64')
+    updated = created + rng.integers(0, 60, count)
+    status_changed = updated + rng.integers(0, 30, count)
+
+    return {
+        'id': _prefixed_ids('CO', start, count),
+        'number': pc.utf8_lpad(pc.cast(pa.array(numbers), pa.string()), 4, '0'),
+        'name': pc.binary_join_element_wise('Change Order ', pc.cast(pa.array(numbers), pa.string()), ''),
+        'scope': pa.array(rng.choice(['in', 'out'], count, p=[0.7, 0.3])),
+        'type': pa.array(rng.choice(CHANGE_ORDER_TYPES, count)),
+        'contractId': pc.take(contract_ids, pa.array(parents)),
+        'estimated': _dirty(_amounts(estimated), 'amount', dirty_rate, rng),
+        'proposed': _dirty(_amounts(proposed), 'amount', dirty_rate, rng),
+        'submitted': _dirty(_amounts(proposed), 'amount', dirty_rate, rng),
+        'approved': _dirty(pc.if_else(not_approved, empty, _amounts(approved)), 'amount', dirty_rate, rng),
+        'committed': _dirty(pc.if_else(not_committed, empty, _amounts(approved)), 'amount', dirty_rate, rng),
+        'createdAt': _dirty(_timestamps(created, rng), 'timestamp', dirty_rate, rng),
+        'updatedAt': _dirty(_timestamps(updated, rng), 'timestamp', dirty_rate, rng),
+        'statusChangedAt': _dirty(_timestamps(status_changed, rng), 'timestamp', dirty_rate, rng),
+    }
+
+def contracts_for_rows(rows, budgets_per_contract=BUDGETS_PER_CONTRACT, change_orders_per_contract=CHANGE_ORDERS_PER_CONTRACT):
+    """Return the number of contracts that gives about `rows` rows over the three tables."""
+    return max(1, int(round(rows / (1 + budgets_per_contract + change_orders_per_contract))))
+
+def _open_writers(out_dir, table, schema, formats):
+    """Open one streaming writer per output format for a table."""
+    writers = {}
+    if 'csv' in formats:
+        writers['csv'] = pacsv.CSVWriter(os.path.join(out_dir, f'{table}.csv'), schema)
+    if 'parquet' in formats:
+        writers['parquet'] = pq.ParquetWriter(os.path.join(out_dir, f'{table}.parquet'), schema, compression=PARQUET_COMPRESSION)
+    return writers
+
+def generate_bronze(out_dir, contracts, seed=0, formats=FORMATS, dirty_rate=DIRTY_RATE, chunk_contracts=CHUNK_CONTRACTS,
+                    budgets_per_contract=BUDGETS_PER_CONTRACT, change_orders_per_contract=CHANGE_ORDERS_PER_CONTRACT,
+                    client_count=CLIENT_COUNT, client_skew=CLIENT_SKEW):
+    """Generate `contracts` contracts with their budgets and change orders into out_dir.
+
+    Each bronze table is written as <table>.csv and/or <table>.parquet with its bronze schema,
+    which is the layout the local DuckDB backend reads with --bronze-dir. Returns a dict of
+    generation statistics.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown output formats: {', '.join(sorted(unknown))}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    schemas = {table: arrow_schema(config['schema_fields']) for table, config in BRONZE_TABLES.items()}
+    writers = {table: _open_writers(out_dir, table, schema, formats) for table, schema in schemas.items()}
+    client_weights = _client_weights(client_count, client_skew)
+    rows = {table: 0 for table in BRONZE_TABLES}
+    started = time.monotonic()
+
+    try:
+        for chunk, chunk_start in enumerate(range(0, contracts, chunk_contracts)):
+            rng = _rng(seed, chunk)
+            count = min(chunk_contracts, contracts - chunk_start)
+            contract_columns, contract_values = generate_contracts(rng, chunk_start, count, client_weights)
+            tables = {
+                'contracts': contract_columns,
+                'budgets': generate_budgets(rng, rows['budgets'], contract_columns['contract_id'], contract_values,
+                                            dirty_rate, budgets_per_contract),
+                'co': generate_change_orders(rng, rows['co'], contract_columns['contract_id'], contract_values,
+                                             dirty_rate, change_orders_per_contract),
+            }
+            for table, columns in tables.items():
+                batch = pa.Table.from_pydict(columns, schema=schemas[table])
+                for writer in writers[table].values():
+                    if isinstance(writer, pq.ParquetWriter):
+                        writer.write_table(batch, row_group_size=ROW_GROUP_SIZE)
+                    else:
+                        writer.write_table(batch)
+                rows[table] += batch.num_rows
+            logger.info(f"Generated chunk {chunk + 1}: {rows}")
+    finally:
+        for table_writers in writers.values():
+            for writer in table_writers.values():
+                writer.close()
+
+    stats = {
+        'out_dir': out_dir,
+        'seed': seed,
+        'rows': rows,
+        'total_rows': sum(rows.values()),
+        'files': {
+            table: {fmt: os.path.join(out_dir, f'{table}.{fmt}') for fmt in formats}
+            for table in BRONZE_TABLES
+        },
+        'seconds': time.monotonic() - started,
+    }
+    logger.info(f"Generated synthetic bronze data: {stats}")
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic bronze data for benchmarking')
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('--rows', type=int, help='Approximate total rows over the three tables')
+    size.add_argument('--contracts', type=int, help='Number of contracts')
+    parser.add_argument('--out-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'synthetic'))
+    parser.add_argument('--format', choices=FORMATS + ('both',), default='both')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dirty-rate', type=float, default=DIRTY_RATE, help='Share of dirty budget and change order values')
+    parser.add_argument('--chunk-contracts', type=int, default=CHUNK_CONTRACTS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    stats = generate_bronze(
+        args.out_dir,
+        args.contracts or contracts_for_rows(args.rows),
+        seed=args.seed,
+        formats=FORMATS if args.format == 'both' else (args.format,),
+        dirty_rate=args.dirty_rate,
+        chunk_contracts=args.chunk_contracts,
+    )
+    print(json.dumps(stats, indent=2))
+
+if __name__ == '__main__':
+    main()
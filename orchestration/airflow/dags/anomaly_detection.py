@@ -0,0 +1,166 @@
+"""
+Vectorized anomaly detection over the monitoring metrics history.
+
+The long history frame (table_name, process_date, value) is pivoted into one date x table matrix,
+so every table is scored in the same NumPy pass. Each day is compared with baselines built only
+from earlier days of the same table:
+
+- rolling: mean and standard deviation of the previous `window` days
+- seasonal: mean and standard deviation of the same weekday over the previous `seasonal_weeks` weeks
+- robust: median and median absolute deviation (MAD) of the previous `window` days
+
+The default `combined` method only flags a day that is unusual both against the recent robust
+baseline and against its weekday baseline (when one exists), which keeps regular weekly
+cycles from raising alerts.
+
+A day is an anomaly when the z-score of the chosen method exceeds the threshold. Days without
+enough earlier observations are never flagged, and baselines are never treated as tighter than
+1% of their level (or one row), so tiny changes to flat series are not flagged.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOW = 14
+SEASONAL_WEEKS = 4
+MIN_PERIODS = 5
+SEASONAL_MIN_PERIODS = 2
+Z_THRESHOLD = 3.5
+MIN_RELATIVE_SCALE = 0.01
+METHODS = ('rolling', 'seasonal', 'robust', 'combined')
+
+# Scale factors making MAD and mean absolute deviation consistent with the standard deviation
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+SCORE_COLUMNS = ['previous_value', 'change_pct', 'baseline', 'z_score', 'rolling_z', 'seasonal_z', 'robust_z']
+
+
+def _lagged(values, lags):
+    """
+    Stack of the date x table matrix shifted down by each lag, shape (lags, dates, tables)
+    """
+    lags = list(lags)
+    stacked = np.full((len(lags),) + values.shape, np.nan)
+    for i, lag in enumerate(lags):
+        if lag < values.shape[0]:
+            stacked[i, lag:] = values[:values.shape[0] - lag]
+    return stacked
+
+
+def _z_score(values, center, scale):
+    floor = np.maximum(np.abs(center) * MIN_RELATIVE_SCALE, 1.0)
+    return (values - center) / np.maximum(np.nan_to_num(scale), floor)
+
+
+def score_history(daily, value_column='daily_count', window=ROLLING_WINDOW, seasonal_weeks=SEASONAL_WEEKS,
+                  min_periods=MIN_PERIODS, threshold=Z_THRESHOLD, method='combined'):
+    """
+    Score a long (table_name, process_date, value) frame and flag anomalies.
+    Returns the frame sorted by table and date with previous_value, change_pct, baseline,
+    z_score (of the chosen method), rolling_z, seasonal_z, robust_z and is_anomaly columns.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown anomaly detection method: {method}")
+    if daily.empty:
+        return daily.assign(**{column: pd.Series(dtype='float64') for column in SCORE_COLUMNS}, is_anomaly=False)
+
+    frame = daily.assign(process_date=pd.to_datetime(daily['process_date']).dt.normalize())
+    wide = frame.pivot_table(index='process_date', columns='table_name', values=value_column, aggfunc='last')
+    wide = wide.reindex(pd.date_range(wide.index.min(), wide.index.max(), freq='D'))
+    values = wide.to_numpy(dtype='float64', na_value=np.nan)
+
+    rolling = _lagged(values, range(1, window + 1))
+    seasonal = _lagged(values, range(7, 7 * seasonal_weeks + 1, 7))
+
+    # All-NaN windows (not enough history yet) are expected and end up unscored
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        rolling_mean = np.nanmean(rolling, axis=0)
+        rolling_std = np.nanstd(rolling, axis=0, ddof=1)
+        rolling_median = np.nanmedian(rolling, axis=0)
+        deviation = np.abs(rolling - rolling_median)
+        mad = np.nanmedian(deviation, axis=0) * MAD_SCALE
+        mean_ad = np.nanmean(deviation, axis=0) * MEAN_AD_SCALE
+        seasonal_mean = np.nanmean(seasonal, axis=0)
+        seasonal_std = np.nanstd(seasonal, axis=0, ddof=1)
+
+    enough_history = (~np.isnan(rolling)).sum(axis=0) >= min_periods
+    enough_seasons = (~np.isnan(seasonal)).sum(axis=0) >= SEASONAL_MIN_PERIODS
+    baselines = {
+        'rolling': (rolling_mean, rolling_std, enough_history),
+        'seasonal': (seasonal_mean, seasonal_std, enough_seasons),
+        'robust': (rolling_median, np.where(mad > 0, mad, mean_ad), enough_history),
+    }
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = {
+            'previous_value': rolling[0],
+            'change_pct': (values - rolling[0]) / rolling[0] * 100,
+        }
+    for name, (center, scale, valid) in baselines.items():
+        scores[f'{name}_baseline'] = np.where(valid, center, np.nan)
+        scores[f'{name}_z'] = np.where(valid, _z_score(values, center, scale), np.nan)
+
+    if method == 'combined':
+        # The weaker of the robust and weekday scores, so both baselines have to agree
+        use_seasonal = enough_seasons & (np.abs(scores['seasonal_z']) < np.abs(scores['robust_z']))
+        scores['baseline'] = np.where(use_seasonal, scores['seasonal_baseline'], scores['robust_baseline'])
+        scores['z_score'] = np.where(use_seasonal, scores['seasonal_z'], scores['robust_z'])
+    else:
+        scores['baseline'] = scores[f'{method}_baseline']
+        scores['z_score'] = scores[f'{method}_z']
+
+    # Back to one row per recorded (table, day)
+    long_scores = pd.DataFrame({
+        column: pd.DataFrame(array, index=wide.index, columns=wide.columns).stack(dropna=False)
+        for column, array in scores.items()
+    })
+    long_scores.index.names = ['process_date', 'table_name']
+    scored = frame.merge(long_scores[SCORE_COLUMNS].reset_index(), on=['process_date', 'table_name'], how='left')
+    scored['is_anomaly'] = scored['z_score'].abs() > threshold
+    return scored.sort_values(['table_name', 'process_date']).reset_index(drop=True)
+
+
+def volume_trends(scored, since=None, value_column='daily_count'):
+    """
+    JSON-friendly scored records per table, optionally only days on or after `since`
+    """
+    if since is not None:
+        scored = scored[scored['process_date'] >= pd.Timestamp(since)]
+    records = scored.assign(process_date=scored['process_date'].dt.strftime('%Y-%m-%d'))
+    records[value_column] = records[value_column].astype('int64')
+    # NaN is not valid JSON, so scores without enough history become None
+    records = records.astype(object).where(records.notnull(), None)
+    return {
+        table: group.drop(columns='table_name').to_dict(orient='records')
+        for table, group in records.groupby('table_name')
+    }
+
+
+def anomaly_alerts(scored, since=None, value_column='daily_count'):
+    """
+    Alert dicts for the flagged days, optionally only days on or after `since`
+    """
+    flagged = scored[scored['is_anomaly']]
+    if since is not None:
+        flagged = flagged[flagged['process_date'] >= pd.Timestamp(since)]
+
+    alerts = []
+    for row in flagged.to_dict(orient='records'):
+        date = row['process_date'].strftime('%Y-%m-%d')
+        alerts.append({
+            'type': 'volume_anomaly',
+            'table': row['table_name'],
+            'date': date,
+            'value': int(row[value_column]),
+            'baseline': float(row['baseline']),
+            'z_score': float(row['z_score']),
+            'message': (
+                f"Volume anomaly in {row['table_name']} on {date}: {int(row[value_column])} rows "
+                f"against a baseline of {row['baseline']:.0f} (z-score {row['z_score']:.1f})"
+            ),
+        })
+    return alerts
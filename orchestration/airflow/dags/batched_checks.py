@@ -0,0 +1,101 @@
+"""
+Batched data quality checks for BigQuery.
+
+Each assertion names a table and a condition that flags bad rows. All assertions are compiled
+into a single query that scans each table once and returns one row per assertion:
+
+    assertion_name | table_name | failing_rows
+
+An assertion passes when no row matches its condition.
+"""
+
+from collections import OrderedDict
+
+# Silver and gold assertions of the pipeline. Tables are '<layer>.<table>' and are qualified
+# with the datasets of the environment they run in (see qualify_assertions).
+PIPELINE_ASSERTIONS = [
+    {'name': 'silver_contracts_contract_id_not_null', 'table': 'silver.contracts_silver', 'condition': 'contract_id IS NULL'},
+    {'name': 'silver_budgets_budget_id_not_null', 'table': 'silver.budgets_silver', 'condition': 'budget_id IS NULL'},
+    {'name': 'silver_change_orders_change_order_id_not_null', 'table': 'silver.change_orders_silver', 'condition': 'change_order_id IS NULL'},
+    {'name': 'gold_project_analytics_contract_id_not_null', 'table': 'gold.project_analytics', 'condition': 'contract_id IS NULL'},
+    {'name': 'gold_client_analytics_client_name_not_null', 'table': 'gold.client_analytics', 'condition': 'client_name IS NULL'},
+    {'name': 'gold_time_analytics_period_not_null', 'table': 'gold.time_analytics', 'condition': 'year IS NULL OR month IS NULL'},
+    {'name': 'gold_contract_summary_client_name_not_null', 'table': 'gold.contract_summary', 'condition': 'client_name IS NULL'},
+]
+
+
+def qualify_assertions(assertions, datasets):
+    """
+    Copies of the assertions with each '<layer>.<table>' replaced by '<datasets[layer]>.<table>'
+    """
+    qualified = []
+    for assertion in assertions:
+        layer, table = assertion['table'].split('.', 1)
+        qualified.append(dict(assertion, table=f"{datasets[layer]}.{table}"))
+    return qualified
+
+
+def compile_batched_check_sql(assertions):
+    """
+    Compile assertions ({'name', 'table', 'condition'}) into one UNION ALL query,
+    with every assertion on the same table counted in the same scan
+    """
+    if not assertions:
+        raise ValueError("At least one assertion is required")
+
+    by_table = OrderedDict()
+    for assertion in assertions:
+        by_table.setdefault(assertion['table'], []).append(assertion)
+
+    selects = []
+    for table, table_assertions in by_table.items():
+        results = ',\n        '.join(
+            f"STRUCT('{assertion['name']}' AS assertion_name, COUNTIF({assertion['condition']}) AS failing_rows)"
+            for assertion in table_assertions
+        )
+        selects.append(
+            f"SELECT result.assertion_name, '{table}' AS table_name, result.failing_rows\n"
+            f"FROM (\n"
+            f"    SELECT [\n"
+            f"        {results}\n"
+            f"    ] AS results\n"
+            f"    FROM `{table}`\n"
+            f"), UNNEST(results) AS result"
+        )
+    return '\nUNION ALL\n'.join(selects)
+
+
+def evaluate_check_results(assertions, rows):
+    """
+    Match query rows (assertion_name, table_name, failing_rows) back to the assertions.
+    Returns one result dict per assertion, in assertion order.
+    """
+    failing_rows = {row[0]: int(row[2]) for row in rows}
+    results = []
+    for assertion in assertions:
+        # A missing row means the assertion never ran, which counts as a failure
+        count = failing_rows.get(assertion['name'])
+        results.append({
+            'name': assertion['name'],
+            'table': assertion['table'],
+            'condition': assertion['condition'],
+            'failing_rows': count,
+            'success': count == 0,
+        })
+    return results
+
+
+def format_failed_assertions(results):
+    """
+    One line per failed assertion, naming the table, the condition and the failing row count
+    """
+    lines = []
+    for result in results:
+        if result['success']:
+            continue
+        if result['failing_rows'] is None:
+            detail = "no result returned"
+        else:
+            detail = f"{result['failing_rows']} rows where {result['condition']}"
+        lines.append(f"{result['name']} on {result['table']}: {detail}")
+    return '\n'.join(lines)
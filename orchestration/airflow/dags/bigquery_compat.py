@@ -0,0 +1,207 @@
+"""
+BigQuery to DuckDB SQL translation for the local execution backend.
+
+The dbt models, the batched data quality checks and the monitoring queries are written in
+BigQuery Standard SQL. translate_sql rewrites the BigQuery-only constructs they use into their
+DuckDB equivalents and leaves everything else as it is:
+
+- SAFE_CAST(x AS T)                   -> TRY_CAST(x AS T), with BigQuery type names mapped
+- DATE_DIFF(a, b, DAY)                -> date_diff('day', b, a) (also TIMESTAMP_DIFF, DATETIME_DIFF)
+- DATE_SUB(d, INTERVAL n YEAR)        -> (d - INTERVAL n YEAR) (also DATE_ADD, TIMESTAMP_ADD/SUB)
+- GENERATE_ARRAY(a, b)                -> generate_series(a, b)
+- UNNEST(array) AS x                  -> UNNEST(array) AS x(x), so x names the element column
+- DATE(y, m, d)                       -> make_date(y, m, d)
+- STRUCT(v AS name, ...)              -> struct_pack(name := v, ...)
+- COUNTIF, TIMESTAMP_MILLIS, SAFE_DIVIDE, CURRENT_DATE(), CURRENT_TIMESTAMP()
+- `project.dataset.table`             -> "dataset"."table"
+
+Calls are matched with their parentheses, so nested calls and commas inside arguments are
+translated correctly. String literals and comments are never rewritten.
+"""
+
+import re
+
+BIGQUERY_TO_DUCKDB_TYPES = {
+    'STRING': 'VARCHAR',
+    'BYTES': 'BLOB',
+    'INT64': 'BIGINT',
+    'INTEGER': 'BIGINT',
+    'FLOAT64': 'DOUBLE',
+    'FLOAT': 'DOUBLE',
+    'NUMERIC': 'DECIMAL(38, 9)',
+    'BIGNUMERIC': 'DOUBLE',
+    'BOOL': 'BOOLEAN',
+    'BOOLEAN': 'BOOLEAN',
+    'DATE': 'DATE',
+    'DATETIME': 'TIMESTAMP',
+    'TIMESTAMP': 'TIMESTAMP',
+    'TIME': 'TIME',
+}
+
+# String literals and comments, which are masked out before matching calls
+LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|--[^\n]*|/\*.*?\*/", re.S)
+
+FUNCTIONS = (
+    'SAFE_CAST', 'CAST', 'DATE_DIFF', 'DATETIME_DIFF', 'TIMESTAMP_DIFF', 'DATE_ADD', 'DATE_SUB',
+    'DATETIME_ADD', 'DATETIME_SUB', 'TIMESTAMP_ADD', 'TIMESTAMP_SUB', 'GENERATE_ARRAY', 'UNNEST',
+    'DATE', 'STRUCT', 'COUNTIF', 'TIMESTAMP_MILLIS', 'SAFE_DIVIDE', 'CURRENT_DATE',
+    'CURRENT_TIMESTAMP', 'CURRENT_DATETIME',
+)
+# A function call (not a column or function whose name merely ends with one of these) or a backtick identifier
+TOKEN_PATTERN = re.compile(
+    r"(?<![\w.])(" + '|'.join(FUNCTIONS) + r")\s*\(|`([^`]*)`",
+    re.I,
+)
+AS_PATTERN = re.compile(r"(?<=\s)AS\s+", re.I)
+UNNEST_ALIAS_PATTERN = re.compile(r"\s+AS\s+(\w+)\b(?!\s*\()", re.I)
+
+
+def _mask_literals(sql):
+    """
+    The SQL with string literals and comments blanked out, keeping every offset unchanged
+    """
+    return LITERAL_PATTERN.sub(lambda match: ' ' * len(match.group(0)), sql)
+
+
+def _closing_paren(masked, open_index):
+    depth = 0
+    for index in range(open_index, len(masked)):
+        if masked[index] == '(':
+            depth += 1
+        elif masked[index] == ')':
+            depth -= 1
+            if depth == 0:
+                return index
+    raise ValueError(f"Unbalanced parentheses in SQL: {masked[open_index:open_index + 80]}")
+
+
+def _split_arguments(sql, masked):
+    """
+    Split a call's argument list on its top-level commas
+    """
+    arguments = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(masked):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            arguments.append(sql[start:index].strip())
+            start = index + 1
+    if sql[start:].strip():
+        arguments.append(sql[start:].strip())
+    return arguments
+
+
+def _split_alias(argument):
+    """
+    Split 'expression AS name' on its last top-level AS, or return (argument, None)
+    """
+    masked = _mask_literals(argument)
+    depth_at = []
+    depth = 0
+    for char in masked:
+        depth += (char in '([') - (char in ')]')
+        depth_at.append(depth)
+    matches = [match for match in AS_PATTERN.finditer(masked) if depth_at[match.start()] == 0]
+    if not matches:
+        return argument, None
+    last = matches[-1]
+    return argument[:last.start()].strip(), argument[last.end():].strip()
+
+
+def duckdb_type(bigquery_type):
+    """
+    DuckDB type for a BigQuery type name, or the name itself if it needs no mapping
+    """
+    return BIGQUERY_TO_DUCKDB_TYPES.get(bigquery_type.strip().upper(), bigquery_type.strip())
+
+
+def _translate_identifier(identifier):
+    parts = identifier.split('.')
+    # Drop the project: locally every dataset is a schema of the same database
+    if len(parts) == 3:
+        parts = parts[1:]
+    return '.'.join(f'"{part}"' for part in parts)
+
+
+def _translate_interval_arithmetic(function, arguments):
+    operator = '-' if function.endswith('_SUB') else '+'
+    return f"({arguments[0]} {operator} {arguments[1]})"
+
+
+def _translate_call(function, arguments):
+    if function in ('SAFE_CAST', 'CAST'):
+        expression, target_type = _split_alias(arguments[0])
+        cast = 'TRY_CAST' if function == 'SAFE_CAST' else 'CAST'
+        return f"{cast}({expression} AS {duckdb_type(target_type)})"
+    if function in ('DATE_DIFF', 'DATETIME_DIFF', 'TIMESTAMP_DIFF'):
+        end, start, part = arguments
+        return f"date_diff('{part.lower()}', {start}, {end})"
+    if function in ('DATE_ADD', 'DATE_SUB', 'DATETIME_ADD', 'DATETIME_SUB', 'TIMESTAMP_ADD', 'TIMESTAMP_SUB'):
+        return _translate_interval_arithmetic(function, arguments)
+    if function == 'GENERATE_ARRAY':
+        return f"generate_series({', '.join(arguments)})"
+    if function == 'DATE':
+        if len(arguments) == 3:
+            return f"make_date({', '.join(arguments)})"
+        return f"CAST({arguments[0]} AS DATE)"
+    if function == 'STRUCT':
+        fields = []
+        for index, argument in enumerate(arguments):
+            expression, name = _split_alias(argument)
+            fields.append(f"{name or f'_field_{index + 1}'} := {expression}")
+        return f"struct_pack({', '.join(fields)})"
+    if function == 'COUNTIF':
+        return f"count_if({arguments[0]})"
+    if function == 'TIMESTAMP_MILLIS':
+        return f"epoch_ms({arguments[0]})"
+    if function == 'SAFE_DIVIDE':
+        return f"({arguments[0]}) / NULLIF({arguments[1]}, 0)"
+    if function in ('CURRENT_DATE', 'CURRENT_TIMESTAMP', 'CURRENT_DATETIME'):
+        if arguments:
+            raise ValueError(f"{function} with a time zone is not supported locally")
+        return 'CURRENT_DATE' if function == 'CURRENT_DATE' else 'CURRENT_TIMESTAMP'
+    # UNNEST only needs its argument translated; its alias is handled by the caller
+    return f"{function}({', '.join(arguments)})"
+
+
+def translate_sql(sql):
+    """
+    Translate BigQuery Standard SQL into DuckDB SQL
+    """
+    masked = _mask_literals(sql)
+    output = []
+    position = 0
+    while True:
+        match = TOKEN_PATTERN.search(masked, position)
+        if match is None:
+            break
+        output.append(sql[position:match.start()])
+
+        if match.group(2) is not None:
+            output.append(_translate_identifier(match.group(2)))
+            position = match.end()
+            continue
+
+        function = match.group(1).upper()
+        open_index = match.end() - 1
+        close_index = _closing_paren(masked, open_index)
+        arguments = [
+            translate_sql(argument)
+            for argument in _split_arguments(sql[open_index + 1:close_index], masked[open_index + 1:close_index])
+        ]
+        output.append(_translate_call(function, arguments))
+        position = close_index + 1
+
+        if function == 'UNNEST':
+            # BigQuery's UNNEST alias names the element; DuckDB needs it as a column alias too
+            alias = UNNEST_ALIAS_PATTERN.match(masked, position)
+            if alias:
+                output.append(f" AS {alias.group(1)}({alias.group(1)})")
+                position = alias.end()
+
+    output.append(sql[position:])
+    return ''.join(output)
@@ -0,0 +1,128 @@
+"""
+dbt model lineage for the medallion pipeline DAG.
+
+Models and their ref()/source() dependencies are read from the dbt manifest
+(target/manifest.json). When the manifest has not been generated yet, or is older
+than the model files, the model SQL is scanned instead so new or edited models
+show up without running dbt first.
+"""
+
+import json
+import os
+import re
+
+MANIFEST_FILE = os.path.join('target', 'manifest.json')
+
+REF_PATTERN = re.compile(r"""\bref\(\s*['"](\w+)['"]\s*\)""")
+SOURCE_PATTERN = re.compile(r"""\bsource\(\s*['"](\w+)['"]\s*,\s*['"](\w+)['"]\s*\)""")
+# Project macros that select from a source table passed as their first argument
+SOURCE_MACRO_PATTERNS = {
+    'bronze': re.compile(r"""\blatest_bronze_snapshot\(\s*['"](\w+)['"]"""),
+}
+
+
+def model_files(dbt_dir):
+    """
+    Map each model name to its SQL file under models/
+    """
+    files = {}
+    for root, dirs, filenames in os.walk(os.path.join(dbt_dir, 'models')):
+        dirs.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.sql'):
+                files[filename[:-len('.sql')]] = os.path.join(root, filename)
+    return files
+
+
+def scan_model_lineage(dbt_dir):
+    """
+    Build the lineage by scanning the model SQL for ref(), source() and source macro calls
+    """
+    files = model_files(dbt_dir)
+    lineage = {}
+    for model, path in files.items():
+        with open(path, 'r') as f:
+            sql = f.read()
+        sources = {f'{name}.{table}' for name, table in SOURCE_PATTERN.findall(sql)}
+        for source_name, pattern in SOURCE_MACRO_PATTERNS.items():
+            sources.update(f'{source_name}.{table}' for table in pattern.findall(sql))
+        lineage[model] = {
+            'refs': sorted(ref for ref in set(REF_PATTERN.findall(sql)) if ref in files),
+            'sources': sorted(sources),
+        }
+    return lineage
+
+
+def manifest_lineage(manifest_path):
+    """
+    Build the lineage from the depends_on nodes of a dbt manifest
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    models = {
+        unique_id: node['name']
+        for unique_id, node in manifest.get('nodes', {}).items()
+        if node.get('resource_type') == 'model'
+    }
+    sources = {
+        unique_id: f"{source['source_name']}.{source['name']}"
+        for unique_id, source in manifest.get('sources', {}).items()
+    }
+
+    lineage = {}
+    for unique_id, name in models.items():
+        depends_on = manifest['nodes'][unique_id].get('depends_on', {}).get('nodes', [])
+        lineage[name] = {
+            'refs': sorted({models[node] for node in depends_on if node in models}),
+            'sources': sorted({sources[node] for node in depends_on if node in sources}),
+        }
+    return lineage
+
+
+def load_dbt_lineage(dbt_dir):
+    """
+    Return {model: {'refs': [...], 'sources': ['bronze.contracts', ...]}} for the dbt project,
+    or {} if the project is not available
+    """
+    files = model_files(dbt_dir)
+    if not files:
+        return {}
+
+    manifest_path = os.path.join(dbt_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        newest_model = max(os.path.getmtime(path) for path in files.values())
+        if os.path.getmtime(manifest_path) >= newest_model:
+            lineage = manifest_lineage(manifest_path)
+            if set(lineage) == set(files):
+                return lineage
+
+    return scan_model_lineage(dbt_dir)
+
+
+def upstream_sources(lineage, model):
+    """
+    All sources a model reads, directly or through the models it refs
+    """
+    sources = set()
+    pending = [model]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        sources.update(lineage[current]['sources'])
+        pending.extend(lineage[current]['refs'])
+    return sources
+
+
+def affected_models(lineage, changed_sources):
+    """
+    Models downstream of any of the changed sources (e.g. {'bronze.budgets'})
+    """
+    changed_sources = set(changed_sources)
+    return sorted(
+        model for model in lineage
+        if upstream_sources(lineage, model) & changed_sources
+    )
@@ -0,0 +1,279 @@
+"""
+Per-model performance history for the dbt models.
+
+After each dbt run the artifacts in its target path are collected into one record per model:
+
+    run_at | invocation_id | model | materialized | partition_by | status | execution_seconds |
+    compile_seconds | execute_seconds | rows_affected | bytes_processed | bytes_billed | slot_ms
+
+run_results.json holds the timings and BigQuery adapter response; manifest.json holds each
+model's materialization and partitioning. The records are appended to a history store, a local
+SQLite file by default (DBT_PERFORMANCE_BACKEND=local) or a day-partitioned BigQuery table
+(DBT_PERFORMANCE_BACKEND=bigquery), and the reports below are computed from that history:
+
+- slowest_models: median and latest execution time over the recent runs of each model
+- growth_trends: daily growth of execution time, rows and bytes processed per model
+- cost_per_model: bytes billed, slot time and estimated on-demand cost per model
+- optimization_candidates: the costliest models that are not yet incremental or partitioned
+
+Usage:
+
+    python dbt_performance.py collect --target-path silver_layer/transformations/target
+    python dbt_performance.py report --days 30
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from history_store import append_bigquery, append_local, history_frame, read_bigquery, read_local
+from task_instrumentation import dbt_run_results_metrics
+
+PERFORMANCE_BACKEND = os.environ.get('DBT_PERFORMANCE_BACKEND', 'local')
+PERFORMANCE_PATH = os.environ.get(
+    'DBT_PERFORMANCE_PATH',
+    os.path.join(os.environ.get('AIRFLOW_HOME', '/opt/airflow'), 'monitoring', 'dbt_performance.sqlite')
+)
+# dataset.table in the monitoring project
+PERFORMANCE_TABLE = os.environ.get('DBT_PERFORMANCE_TABLE', 'medallion_monitoring.dbt_model_runs')
+# BigQuery on-demand price per TiB billed, used for the cost estimates
+PRICE_PER_TIB = float(os.environ.get('BIGQUERY_PRICE_PER_TIB', '6.25'))
+
+PERFORMANCE_COLUMNS = {
+    'run_at': 'TIMESTAMP',
+    'invocation_id': 'STRING',
+    'model': 'STRING',
+    'materialized': 'STRING',
+    'partition_by': 'STRING',
+    'status': 'STRING',
+    'execution_seconds': 'FLOAT',
+    'compile_seconds': 'FLOAT',
+    'execute_seconds': 'FLOAT',
+    'rows_affected': 'INTEGER',
+    'bytes_processed': 'INTEGER',
+    'bytes_billed': 'INTEGER',
+    'slot_ms': 'INTEGER',
+}
+# SQLite table and the column identifying a row within a run
+LOCAL_TABLE = 'dbt_model_runs'
+PERFORMANCE_KEY = 'model'
+
+
+def _partition_field(config):
+    partition_by = config.get('partition_by')
+    if isinstance(partition_by, dict):
+        return partition_by.get('field')
+    return partition_by
+
+
+def model_run_records(target_path, run_at=None):
+    """
+    One performance record per model in the run_results.json of a dbt target path, with its
+    materialization and partitioning from manifest.json. Returns [] if dbt wrote no results.
+    """
+    run_results = dbt_run_results_metrics(os.path.join(target_path, 'run_results.json'))
+    if run_results is None:
+        return []
+
+    manifest_path = os.path.join(target_path, 'manifest.json')
+    nodes = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            nodes = json.load(f).get('nodes', {})
+
+    run_at = run_at or run_results['generated_at'] or datetime.utcnow().isoformat()
+    records = []
+    for node in run_results['nodes']:
+        if node['resource_type'] != 'model':
+            continue
+        config = nodes.get(node['unique_id'], {}).get('config', {})
+        records.append({
+            'run_at': run_at,
+            'invocation_id': run_results['invocation_id'],
+            'model': node['name'],
+            'materialized': config.get('materialized'),
+            'partition_by': _partition_field(config),
+            'status': node['status'],
+            'execution_seconds': node['execution_seconds'],
+            'compile_seconds': node['compile_seconds'],
+            'execute_seconds': node['execute_seconds'],
+            'rows_affected': node['rows_affected'],
+            'bytes_processed': node['bytes_processed'],
+            'bytes_billed': node['bytes_billed'],
+            'slot_ms': node['slot_ms'],
+        })
+    return records
+
+
+def performance_frame(records):
+    """
+    Records as a DataFrame with the history's columns, naive UTC run_at and nullable integer counts
+    """
+    return history_frame(records, PERFORMANCE_COLUMNS)
+
+
+def append_local_runs(records, path=PERFORMANCE_PATH):
+    """
+    Append model run records to the SQLite history
+    """
+    return append_local(records, path, LOCAL_TABLE, PERFORMANCE_COLUMNS, PERFORMANCE_KEY)
+
+
+def read_local_runs(days, path=PERFORMANCE_PATH):
+    """
+    Model run records from the last `days` days in the SQLite history, oldest first
+    """
+    return read_local(days, path, LOCAL_TABLE, PERFORMANCE_COLUMNS, PERFORMANCE_KEY)
+
+
+def append_bigquery_runs(records, client, table=PERFORMANCE_TABLE):
+    """
+    Append model run records to the day-partitioned BigQuery history
+    """
+    return append_bigquery(records, client, table, PERFORMANCE_COLUMNS)
+
+
+def read_bigquery_runs(days, client, table=PERFORMANCE_TABLE):
+    """
+    Model run records from the last `days` days in the BigQuery history, oldest first
+    """
+    return read_bigquery(days, client, table, PERFORMANCE_COLUMNS, PERFORMANCE_KEY)
+
+
+def append_model_runs(records, client=None, backend=PERFORMANCE_BACKEND):
+    """
+    Append model run records to the configured history
+    """
+    if not records:
+        return 0
+    if backend == 'bigquery':
+        return append_bigquery_runs(records, client)
+    return append_local_runs(records)
+
+
+def read_model_runs(days, client=None, backend=PERFORMANCE_BACKEND):
+    """
+    Read the last `days` days of model runs from the configured history
+    """
+    if backend == 'bigquery':
+        return read_bigquery_runs(days, client)
+    return read_local_runs(days)
+
+
+def _latest(history, column):
+    return history.sort_values('run_at').groupby('model')[column].last()
+
+
+def slowest_models(history, runs=7, limit=10):
+    """
+    Models by median execution time over their last `runs` successful runs, slowest first
+    """
+    succeeded = history[history['status'] == 'success'].sort_values('run_at')
+    recent = succeeded.groupby('model').tail(runs)
+    report = recent.groupby('model').agg(
+        runs=('execution_seconds', 'size'),
+        median_seconds=('execution_seconds', 'median'),
+        max_seconds=('execution_seconds', 'max'),
+        latest_seconds=('execution_seconds', 'last'),
+    )
+    report['materialized'] = _latest(recent, 'materialized')
+    return report.sort_values('median_seconds', ascending=False).head(limit).reset_index()
+
+
+def _daily_slope(days, values):
+    mask = values.notna().to_numpy()
+    if mask.sum() < 2 or np.ptp(days[mask]) == 0:
+        return np.nan
+    return float(np.polyfit(days[mask], values.to_numpy(dtype=float, na_value=np.nan)[mask], 1)[0])
+
+
+def growth_trends(history, metrics=('execution_seconds', 'rows_affected', 'bytes_processed')):
+    """
+    Per-model linear growth per day of each metric over the history, with the first and
+    latest values, fastest growing execution time first
+    """
+    succeeded = history[history['status'] == 'success'].sort_values('run_at')
+    rows = []
+    for model, runs in succeeded.groupby('model'):
+        days = ((runs['run_at'] - runs['run_at'].min()).dt.total_seconds() / 86400).to_numpy()
+        row = {'model': model, 'runs': len(runs)}
+        for metric in metrics:
+            values = runs[metric].astype('float64')
+            row[f'{metric}_first'] = values.iloc[0]
+            row[f'{metric}_latest'] = values.iloc[-1]
+            row[f'{metric}_per_day'] = _daily_slope(days, values)
+        rows.append(row)
+    report = pd.DataFrame(rows)
+    if report.empty:
+        return report
+    return report.sort_values(f'{metrics[0]}_per_day', ascending=False, na_position='last').reset_index(drop=True)
+
+
+def cost_per_model(history, price_per_tib=PRICE_PER_TIB):
+    """
+    Total and per-run bytes billed, slot hours and estimated on-demand cost per model, costliest first
+    """
+    report = history.groupby('model').agg(
+        runs=('run_at', 'size'),
+        bytes_billed=('bytes_billed', 'sum'),
+        slot_ms=('slot_ms', 'sum'),
+        execution_seconds=('execution_seconds', 'sum'),
+    )
+    report['slot_hours'] = report['slot_ms'].astype('float64') / 3600000
+    report['estimated_cost'] = report['bytes_billed'].astype('float64') / 2 ** 40 * price_per_tib
+    report['cost_per_run'] = report['estimated_cost'] / report['runs']
+    report['materialized'] = _latest(history, 'materialized')
+    report['partition_by'] = _latest(history, 'partition_by')
+    return report.sort_values(['estimated_cost', 'execution_seconds'], ascending=False).reset_index()
+
+
+def optimization_candidates(history, price_per_tib=PRICE_PER_TIB):
+    """
+    Models that are not incremental or not partitioned, costliest first, with what they lack
+    """
+    report = cost_per_model(history, price_per_tib)
+    report = report[report['materialized'].isin(['table', 'view']) | report['partition_by'].isna()].copy()
+    report['suggestion'] = [
+        ', '.join(
+            ([] if materialized == 'incremental' else ['make incremental'])
+            + ([] if isinstance(partition_by, str) and partition_by else ['partition'])
+        )
+        for materialized, partition_by in zip(report['materialized'], report['partition_by'])
+    ]
+    return report.reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Collect and report dbt model performance history')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    collect = subparsers.add_parser('collect', help='Append the models of a dbt target path to the history')
+    collect.add_argument('--target-path', required=True, help='dbt target directory with run_results.json and manifest.json')
+    report = subparsers.add_parser('report', help='Print the performance reports')
+    report.add_argument('--days', type=int, default=30, help='History window in days')
+    report.add_argument('--limit', type=int, default=10, help='Models per report')
+    args = parser.parse_args(argv)
+
+    if args.command == 'collect':
+        count = append_model_runs(model_run_records(args.target_path), backend='local')
+        print(f"Recorded {count} model runs")
+        return 0
+
+    history = read_model_runs(args.days, backend='local')
+    if history.empty:
+        print(f"No dbt model runs recorded in the last {args.days} days")
+        return 0
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(f"Slowest models:\n{slowest_models(history, limit=args.limit).to_string(index=False)}\n")
+        print(f"Growth per day:\n{growth_trends(history).head(args.limit).to_string(index=False)}\n")
+        print(f"Cost per model:\n{cost_per_model(history).head(args.limit).to_string(index=False)}\n")
+        print(f"Optimization candidates:\n{optimization_candidates(history).head(args.limit).to_string(index=False)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
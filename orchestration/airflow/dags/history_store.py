@@ -0,0 +1,111 @@
+"""
+Append-only history tables shared by the monitoring stores.
+
+A history is described by its columns ({column: BigQuery type}, with a run_at TIMESTAMP) and the
+column that identifies an entity within a run (the table name, the model, ...). It is kept either
+in a local SQLite file or in a BigQuery table partitioned by day on run_at; both are appended to
+in batches and read back for the last N days, oldest first, as a typed DataFrame.
+
+monitoring_store (per-table metrics) and dbt_performance (per-model runs) are both built on it.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+SQLITE_TYPES = {'TIMESTAMP': 'TEXT', 'STRING': 'TEXT', 'INTEGER': 'INTEGER', 'FLOAT': 'REAL'}
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def history_frame(records, columns):
+    """
+    Records as a DataFrame with the history's columns, naive UTC run_at and nullable integer counts
+    """
+    frame = pd.DataFrame(records, columns=list(columns))
+    frame['run_at'] = pd.to_datetime(frame['run_at'], utc=True).dt.tz_localize(None)
+    for column, column_type in columns.items():
+        if column_type == 'INTEGER':
+            frame[column] = pd.to_numeric(frame[column]).astype('Int64')
+        elif column_type == 'FLOAT':
+            frame[column] = frame[column].astype('float64')
+    return frame
+
+
+def _history_cutoff(days):
+    return datetime.utcnow() - timedelta(days=days)
+
+
+def _connect_local(path, name, columns, key):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    definitions = ', '.join(f'{column} {SQLITE_TYPES[column_type]}' for column, column_type in columns.items())
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {name} ({definitions})')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {name}_run_at ON {name} (run_at, {key})')
+    return conn
+
+
+def append_local(records, path, name, columns, key):
+    """
+    Append records to the SQLite table `name`, creating it on first use
+    """
+    frame = history_frame(records, columns)
+    frame['run_at'] = frame['run_at'].dt.strftime(TIMESTAMP_FORMAT)
+    conn = _connect_local(path, name, columns, key)
+    try:
+        with conn:
+            frame.to_sql(name, conn, if_exists='append', index=False)
+    finally:
+        conn.close()
+    return len(frame)
+
+
+def read_local(days, path, name, columns, key):
+    """
+    Records from the last `days` days in the SQLite table `name`, oldest first
+    """
+    conn = _connect_local(path, name, columns, key)
+    try:
+        frame = pd.read_sql_query(
+            f'SELECT * FROM {name} WHERE run_at >= ? ORDER BY run_at, {key}',
+            conn,
+            params=[_history_cutoff(days).strftime(TIMESTAMP_FORMAT)],
+        )
+    finally:
+        conn.close()
+    return history_frame(frame.to_dict(orient='records'), columns)
+
+
+def append_bigquery(records, client, table, columns):
+    """
+    Append records to the BigQuery table (dataset.table) with a load job, creating the
+    day-partitioned table on first use
+    """
+    from google.cloud import bigquery
+
+    dataset_id, table_id = table.split('.')
+    client.create_dataset(dataset_id, exists_ok=True)
+    job_config = bigquery.LoadJobConfig(
+        schema=[bigquery.SchemaField(column, column_type) for column, column_type in columns.items()],
+        write_disposition='WRITE_APPEND',
+        time_partitioning=bigquery.TimePartitioning(type_='DAY', field='run_at'),
+    )
+    frame = history_frame(records, columns)
+    client.load_table_from_dataframe(frame, f'{client.project}.{table}', job_config=job_config).result()
+    return len(frame)
+
+
+def read_bigquery(days, client, table, columns, key):
+    """
+    Records from the last `days` days in the BigQuery table (dataset.table), oldest first.
+    The run_at filter prunes the scan to the matching daily partitions.
+    """
+    query = f"""
+        SELECT *
+        FROM `{client.project}.{table}`
+        WHERE run_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {int(days)} DAY)
+        ORDER BY run_at, {key}
+    """
+    frame = client.query(query).to_dataframe()
+    return history_frame(frame.to_dict(orient='records'), columns)
@@ -0,0 +1,293 @@
+"""
+Local DuckDB execution backend for the dbt models and data quality checks.
+
+Runs the silver and gold dbt models and the batched data quality assertions against local
+bronze files in an embedded DuckDB database, without BigQuery or dbt:
+
+- bronze tables are loaded from their Parquet landing files (or raw CSV exports) into the
+  `bronze` schema, with a _PARTITIONTIME column so latest_bronze_snapshot works unchanged
+- each model is rendered with Jinja: config(), ref(), source(), var(), env_var(),
+  is_incremental(), {{ this }} and the project macros behave as they do in dbt
+- the rendered BigQuery SQL goes through bigquery_compat.translate_sql and is materialized
+  in the schema from its config, in ref() dependency order; incremental models are merged
+  on their unique_key
+- PIPELINE_ASSERTIONS are compiled with compile_batched_check_sql and run the same way
+
+Usage (from the repository root):
+
+    PYTHONPATH=. python orchestration/airflow/dags/local_backend.py [--database local.duckdb] [--bronze-dir DIR]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+from batched_checks import PIPELINE_ASSERTIONS, compile_batched_check_sql, evaluate_check_results, format_failed_assertions
+from bigquery_compat import duckdb_type, translate_sql
+from dbt_lineage import model_files, scan_model_lineage
+
+logger = logging.getLogger(__name__)
+
+DBT_DIR = os.environ.get(
+    'LOCAL_DBT_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'silver_layer', 'transformations'))
+)
+LOCAL_DATABASE = os.environ.get('LOCAL_DUCKDB_DATABASE', ':memory:')
+DEFAULT_SCHEMA = 'main'
+
+
+def connect(database=LOCAL_DATABASE):
+    """
+    Open a DuckDB connection to the local database (in memory by default)
+    """
+    import duckdb
+
+    return duckdb.connect(database)
+
+
+def bronze_files(bronze_dir=None):
+    """
+    Local file per bronze table: <table>.parquet or <table>.csv in bronze_dir if given, otherwise
+    the Parquet landing file when it has been converted and the raw CSV export when not
+    """
+    from bronze.landing import landing_path, source_path
+    from bronze.schemas import BRONZE_TABLES
+
+    files = {}
+    for table in BRONZE_TABLES:
+        if bronze_dir:
+            candidates = [os.path.join(bronze_dir, f'{table}.parquet'), os.path.join(bronze_dir, f'{table}.csv')]
+        else:
+            candidates = [landing_path(table), source_path(table)]
+        existing = [path for path in candidates if os.path.exists(path)]
+        if existing:
+            files[table] = existing[0]
+    return files
+
+
+def _read_bronze_sql(path, schema_fields):
+    if path.endswith('.parquet'):
+        return f"read_parquet('{path}')"
+    # CSV columns are typed from the BigQuery schema; short rows are padded with NULLs like allow_jagged_rows
+    columns = ', '.join(f"'{field['name']}': '{duckdb_type(field['type'])}'" for field in schema_fields)
+    return f"read_csv('{path}', header=true, columns={{{columns}}}, nullstr='', null_padding=true)"
+
+
+def load_bronze(conn, files, loaded_at=None):
+    """
+    Load {table: path} bronze files into the bronze schema as one ingestion-time snapshot each.
+    Returns {table: row_count}.
+    """
+    from bronze.schemas import BRONZE_TABLES
+
+    loaded_at = (loaded_at or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+    conn.execute('CREATE SCHEMA IF NOT EXISTS bronze')
+    row_counts = {}
+    for table, path in files.items():
+        source = _read_bronze_sql(path, BRONZE_TABLES[table]['schema_fields'])
+        conn.execute(
+            f"CREATE OR REPLACE TABLE bronze.{table} AS "
+            f"SELECT *, TIMESTAMP '{loaded_at}' AS _PARTITIONTIME FROM {source}"
+        )
+        row_counts[table] = conn.execute(f'SELECT COUNT(*) FROM bronze.{table}').fetchone()[0]
+    return row_counts
+
+
+def _macros(dbt_dir):
+    macros = []
+    macro_dir = os.path.join(dbt_dir, 'macros')
+    if os.path.isdir(macro_dir):
+        for filename in sorted(os.listdir(macro_dir)):
+            if filename.endswith('.sql'):
+                with open(os.path.join(macro_dir, filename), 'r') as f:
+                    macros.append(f.read())
+    return '\n'.join(macros)
+
+
+def render_model(dbt_dir, model, relations=None, incremental=False, dbt_vars=None):
+    """
+    Render a model's SQL as dbt would. relations maps model names to the relations ref() points
+    to. Returns (sql, config) where config holds the model's config() arguments.
+    """
+    from jinja2 import Environment
+
+    relations = relations or {}
+    config = {}
+
+    def capture_config(**kwargs):
+        config.update(kwargs)
+        return ''
+
+    def relation(name):
+        return relations.get(name, f'{DEFAULT_SCHEMA}.{name}')
+
+    environment = Environment()
+    environment.globals.update({
+        'config': capture_config,
+        'ref': relation,
+        'source': lambda source_name, table: f'{source_name}.{table}',
+        'var': lambda name, default=None: (dbt_vars or {}).get(name, default),
+        'env_var': lambda name, default='': os.environ.get(name, default),
+        'is_incremental': lambda: incremental,
+        'this': relation(model),
+    })
+
+    with open(model_files(dbt_dir)[model], 'r') as f:
+        template = f.read()
+    # Macros are prepended so the model can call them like dbt's project macros
+    sql = environment.from_string(_macros(dbt_dir) + '\n' + template).render()
+    return sql.strip(), config
+
+
+def model_relations(dbt_dir, models):
+    """
+    Map each model to its local relation, '<config schema>.<model>'
+    """
+    relations = {}
+    for model in models:
+        _, config = render_model(dbt_dir, model)
+        relations[model] = f"{config.get('schema', DEFAULT_SCHEMA)}.{model}"
+    return relations
+
+
+def build_order(lineage, models=None):
+    """
+    The given models (all by default) in ref() dependency order
+    """
+    selected = set(lineage if models is None else models)
+    ordered = []
+    visited = set()
+
+    def visit(model, path):
+        if model in visited:
+            return
+        if model in path:
+            raise ValueError(f"Circular ref() dependency: {' -> '.join(path + [model])}")
+        for ref in lineage[model]['refs']:
+            visit(ref, path + [model])
+        visited.add(model)
+        if model in selected:
+            ordered.append(model)
+
+    for model in sorted(selected):
+        visit(model, [])
+    return ordered
+
+
+def _relation_exists(conn, relation):
+    schema, table = relation.split('.')
+    return conn.execute(
+        'SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = ? AND table_name = ?',
+        [schema, table],
+    ).fetchone()[0] > 0
+
+
+def materialize(conn, relation, sql, config, full_refresh=False):
+    """
+    Materialize translated model SQL as a view, a table or an incremental table merged on its unique_key
+    """
+    schema = relation.split('.')[0]
+    conn.execute(f'CREATE SCHEMA IF NOT EXISTS {schema}')
+    materialized = config.get('materialized', 'view')
+
+    if materialized == 'view':
+        conn.execute(f'CREATE OR REPLACE VIEW {relation} AS {sql}')
+        return
+    if materialized != 'incremental' or full_refresh or not _relation_exists(conn, relation):
+        conn.execute(f'CREATE OR REPLACE TABLE {relation} AS {sql}')
+        return
+
+    conn.execute(f'CREATE OR REPLACE TEMP TABLE incoming AS {sql}')
+    unique_key = config.get('unique_key')
+    if unique_key:
+        keys = [unique_key] if isinstance(unique_key, str) else unique_key
+        matches = ' AND '.join(f'target.{key} = incoming.{key}' for key in keys)
+        conn.execute(f'DELETE FROM {relation} AS target USING incoming WHERE {matches}')
+    conn.execute(f'INSERT INTO {relation} SELECT * FROM incoming')
+    conn.execute('DROP TABLE incoming')
+
+
+def run_models(conn, dbt_dir=DBT_DIR, models=None, full_refresh=False, dbt_vars=None):
+    """
+    Render, translate and materialize the models in dependency order.
+    Returns {model: {'relation', 'rows', 'seconds'}}.
+    """
+    lineage = scan_model_lineage(dbt_dir)
+    relations = model_relations(dbt_dir, lineage)
+    results = {}
+    for model in build_order(lineage, models):
+        started = time.monotonic()
+        incremental = not full_refresh and _relation_exists(conn, relations[model])
+        sql, config = render_model(dbt_dir, model, relations, incremental=incremental, dbt_vars=dbt_vars)
+        materialize(conn, relations[model], translate_sql(sql), config, full_refresh=full_refresh)
+        results[model] = {
+            'relation': relations[model],
+            'rows': conn.execute(f'SELECT COUNT(*) FROM {relations[model]}').fetchone()[0],
+            'seconds': time.monotonic() - started,
+        }
+        logger.info(f"Built {model} in {results[model]['seconds']:.2f}s ({results[model]['rows']} rows)")
+    return results
+
+
+def run_checks(conn, assertions=PIPELINE_ASSERTIONS):
+    """
+    Run the batched data quality assertions ('<schema>.<table>' tables) as one local query
+    """
+    rows = conn.execute(translate_sql(compile_batched_check_sql(assertions))).fetchall()
+    return evaluate_check_results(assertions, rows)
+
+
+def run_pipeline(conn, dbt_dir=DBT_DIR, bronze_dir=None, full_refresh=False, assertions=PIPELINE_ASSERTIONS):
+    """
+    Load the bronze files, build every model and run the checks.
+    Returns a summary with row counts and timings per step.
+    """
+    started = time.monotonic()
+    files = bronze_files(bronze_dir)
+    bronze_rows = load_bronze(conn, files)
+    loaded = time.monotonic()
+    models = run_models(conn, dbt_dir, full_refresh=full_refresh)
+    built = time.monotonic()
+    checks = run_checks(conn, assertions)
+    return {
+        'bronze': {table: {'path': files[table], 'rows': rows} for table, rows in bronze_rows.items()},
+        'models': models,
+        'checks': checks,
+        'seconds': {
+            'load_bronze': loaded - started,
+            'run_models': built - loaded,
+            'run_checks': time.monotonic() - built,
+            'total': time.monotonic() - started,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the dbt models and data quality checks locally on DuckDB')
+    parser.add_argument('--database', default=LOCAL_DATABASE, help='DuckDB database file (default: in memory)')
+    parser.add_argument('--dbt-dir', default=DBT_DIR, help='dbt project directory')
+    parser.add_argument('--bronze-dir', help='Directory of <table>.parquet or <table>.csv bronze files')
+    parser.add_argument('--full-refresh', action='store_true', help='Rebuild incremental models from scratch')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    conn = connect(args.database)
+    try:
+        summary = run_pipeline(conn, args.dbt_dir, args.bronze_dir, args.full_refresh)
+    finally:
+        conn.close()
+
+    print(json.dumps(summary, indent=2, default=str))
+    failures = format_failed_assertions(summary['checks'])
+    if failures:
+        logger.error(f"Data quality assertions failed:\n{failures}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
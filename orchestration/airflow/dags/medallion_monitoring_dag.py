@@ -1,11 +1,28 @@
 from datetime import datetime, timedelta
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from airflow.providers.google.cloud.operators.bigquery import BigQueryCheckOperator
 from airflow.providers.google.cloud.hooks.bigquery import BigQueryHook
-import pandas as pd
 import json
 import os
+import time
+from bronze.schemas import BRONZE_TABLES
+from monitoring_metadata import (
+    STALE_AFTER_HOURS,
+    compile_null_count_sql,
+    compile_table_metadata_queries,
+    summarize_freshness,
+    summarize_null_counts,
+    table_name
+)
+from anomaly_detection import ROLLING_WINDOW, SEASONAL_WEEKS, anomaly_alerts, score_history, volume_trends
+from monitoring_executor import run_queries
+from monitoring_store import (
+    METRICS_BACKEND,
+    append_metrics,
+    daily_row_counts,
+    metrics_records,
+    read_metrics_history
+)
 
 # Environment variables
 PROJECT_ID = os.environ.get('GCP_PROJECT_ID', 'medallion-dev')
@@ -32,97 +49,120 @@ dag = DAG(
     tags=['medallion', 'monitoring', 'data_quality'],
 )
 
-# Function to check data freshness
+# Critical contracts_silver columns that must never be null
+CRITICAL_CONTRACT_COLUMNS = ['contract_id', 'contract_name', 'start_date', 'end_date', 'contract_value', 'contract_status']
+
+# Tables to monitor; null_columns are counted on every run (the only row-level scan), and
+# check_null_values checks the recorded counts instead of scanning them again
+MONITORED_TABLES = [
+    {'dataset': BRONZE_DATASET, 'table': table} for table in BRONZE_TABLES
+] + [
+    {'dataset': f"{SILVER_DATASET}_silver", 'table': 'contracts_silver', 'null_columns': CRITICAL_CONTRACT_COLUMNS},
+    {'dataset': f"{SILVER_DATASET}_silver", 'table': 'budgets_silver'},
+    {'dataset': f"{SILVER_DATASET}_silver", 'table': 'change_orders_silver'},
+    {'dataset': f"{GOLD_DATASET}_gold", 'table': 'contract_analytics'},
+    {'dataset': f"{GOLD_DATASET}_gold", 'table': 'project_analytics'},
+]
+
+# Days of volume trends and alerts reported, and days of metrics history scored to build
+# their rolling and same-weekday baselines
+VOLUME_TREND_DAYS = 7
+VOLUME_HISTORY_DAYS = VOLUME_TREND_DAYS + max(ROLLING_WINDOW, 7 * SEASONAL_WEEKS)
+
+def metrics_store_client():
+    """
+    BigQuery client for the metrics store, when it is kept in BigQuery
+    """
+    if METRICS_BACKEND != 'bigquery':
+        return None
+    return BigQueryHook(use_legacy_sql=False).get_client(project_id=PROJECT_ID)
+
+# Function to check data freshness and record this run's table metrics
 def check_data_freshness(**kwargs):
-    bq_hook = BigQueryHook(use_legacy_sql=False)
-    
-    # Check freshness for each layer
-    tables = [
-        f"{PROJECT_ID}.{BRONZE_DATASET}.contracts",
-        f"{PROJECT_ID}.{BRONZE_DATASET}.budgets",
-        f"{PROJECT_ID}.{BRONZE_DATASET}.change_orders",
-        f"{PROJECT_ID}.{SILVER_DATASET}_silver.contracts_silver",
-        f"{PROJECT_ID}.{SILVER_DATASET}_silver.budgets_silver",
-        f"{PROJECT_ID}.{SILVER_DATASET}_silver.change_orders_silver",
-        f"{PROJECT_ID}.{GOLD_DATASET}_gold.contract_analytics",
-        f"{PROJECT_ID}.{GOLD_DATASET}_gold.project_analytics",
-    ]
-    
-    results = {}
-    for table in tables:
-        query = f"""
-        SELECT 
-            TIMESTAMP_DIFF(CURRENT_TIMESTAMP(), MAX(CAST(processed_at AS TIMESTAMP)), HOUR) as hours_since_update,
-            COUNT(*) as row_count
-        FROM `{table}`
-        """
-        try:
-            result = bq_hook.get_pandas_df(query)
-            results[table] = {
-                'hours_since_update': result['hours_since_update'].iloc[0] if not result.empty else None,
-                'row_count': result['row_count'].iloc[0] if not result.empty else 0
-            }
-            
-            # Alert if data is stale (more than 24 hours old)
-            if results[table]['hours_since_update'] and results[table]['hours_since_update'] > 24:
-                print(f"ALERT: Data in {table} is stale! Last update was {results[table]['hours_since_update']} hours ago.")
-        except Exception as e:
-            results[table] = {'error': str(e)}
-            print(f"Error checking freshness for {table}: {e}")
+    client = BigQueryHook(use_legacy_sql=False).get_client(project_id=PROJECT_ID)
+    started = time.monotonic()
+    
+    # Table metadata (one query per dataset) and null counts run as concurrent BigQuery jobs
+    queries = {
+        f"metadata:{dataset}": sql
+        for dataset, sql in compile_table_metadata_queries(PROJECT_ID, MONITORED_TABLES).items()
+    }
+    null_count_sql = compile_null_count_sql(PROJECT_ID, MONITORED_TABLES)
+    if null_count_sql:
+        queries['null_counts'] = null_count_sql
+    query_results = run_queries(client, queries)
+    
+    for name, result in query_results.items():
+        status = f"failed: {result['error']}" if 'error' in result else "succeeded"
+        print(f"Query {name} {status} in {result['seconds']:.1f}s")
+    
+    # Tables in a dataset whose metadata query failed are reported with that error
+    metadata = [result['result'] for name, result in query_results.items()
+                if name.startswith('metadata:') and 'result' in result]
+    dataset_errors = {name.split(':', 1)[1]: result['error'] for name, result in query_results.items()
+                      if name.startswith('metadata:') and 'error' in result}
+    results = summarize_freshness(PROJECT_ID, MONITORED_TABLES, metadata, dataset_errors)
+    
+    null_counts = {}
+    if 'result' in query_results.get('null_counts', {}):
+        null_counts = summarize_null_counts(PROJECT_ID, query_results['null_counts']['result'])
+    
+    for table, data in results.items():
+        if 'error' in data:
+            print(f"Error checking freshness for {table}: {data['error']}")
+        # Alert if data is stale (more than 24 hours old)
+        elif data['hours_since_update'] > STALE_AFTER_HOURS:
+            print(f"ALERT: Data in {table} is stale! Last update was {data['hours_since_update']} hours ago.")
+    
+    # Append this run's metrics to the metrics history
+    records = metrics_records(
+        kwargs['data_interval_end'],
+        results,
+        null_counts,
+        collection_seconds=time.monotonic() - started,
+    )
+    if records:
+        append_metrics(records, client=metrics_store_client())
     
     # Store results as XCom for downstream tasks
     kwargs['ti'].xcom_push(key='data_freshness', value=json.dumps(results))
+    kwargs['ti'].xcom_push(key='null_counts', value=json.dumps(null_counts))
     return results
 
+# Function to check for null values in critical columns, from the counts recorded by check_data_freshness
+def check_null_values(**kwargs):
+    null_counts = json.loads(kwargs['ti'].xcom_pull(task_ids='check_data_freshness', key='null_counts'))
+    failures = []
+    for table in MONITORED_TABLES:
+        if not table.get('null_columns'):
+            continue
+        name = table_name(PROJECT_ID, table)
+        if name not in null_counts:
+            failures.append(f"Null counts for {name} were not collected")
+        elif null_counts[name] > 0:
+            failures.append(f"{name} has {null_counts[name]} nulls in {', '.join(table['null_columns'])}")
+    
+    if failures:
+        raise ValueError('; '.join(failures))
+    return null_counts
+
 # Function to check data volume trends
 def check_data_volume_trends(**kwargs):
-    bq_hook = BigQueryHook(use_legacy_sql=False)
-    
-    # Check volume trends for each layer
-    tables = [
-        f"{PROJECT_ID}.{BRONZE_DATASET}.contracts",
-        f"{PROJECT_ID}.{BRONZE_DATASET}.budgets",
-        f"{PROJECT_ID}.{BRONZE_DATASET}.change_orders",
-        f"{PROJECT_ID}.{SILVER_DATASET}_silver.contracts_silver",
-        f"{PROJECT_ID}.{SILVER_DATASET}_silver.budgets_silver",
-        f"{PROJECT_ID}.{SILVER_DATASET}_silver.change_orders_silver",
-        f"{PROJECT_ID}.{GOLD_DATASET}_gold.contract_analytics",
-        f"{PROJECT_ID}.{GOLD_DATASET}_gold.project_analytics",
-    ]
-    
-    results = {}
-    for table in tables:
-        query = f"""
-        SELECT 
-            DATE(CAST(processed_at AS TIMESTAMP)) as process_date,
-            COUNT(*) as daily_count
-        FROM `{table}`
-        WHERE CAST(processed_at AS TIMESTAMP) > TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 7 DAY)
-        GROUP BY process_date
-        ORDER BY process_date
-        """
-        try:
-            result = bq_hook.get_pandas_df(query)
-            if not result.empty:
-                # Calculate day-over-day change
-                result['previous_count'] = result['daily_count'].shift(1)
-                result['day_over_day_change_pct'] = (result['daily_count'] - result['previous_count']) / result['previous_count'] * 100
-                
-                # Alert on significant changes (more than 20% change)
-                significant_changes = result[abs(result['day_over_day_change_pct']) > 20].dropna()
-                if not significant_changes.empty:
-                    for _, row in significant_changes.iterrows():
-                        print(f"ALERT: Significant volume change in {table} on {row['process_date']}: {row['day_over_day_change_pct']:.2f}% change")
-                
-                results[table] = result.to_dict(orient='records')
-            else:
-                results[table] = []
-        except Exception as e:
-            results[table] = {'error': str(e)}
-            print(f"Error checking volume trends for {table}: {e}")
+    # Trends come from the recorded metrics history, not from the monitored tables
+    history = read_metrics_history(VOLUME_HISTORY_DAYS, client=metrics_store_client())
+    
+    # Every table is scored against its rolling and same-weekday baselines in one pass
+    scored = score_history(daily_row_counts(history))
+    since = kwargs['data_interval_end'].date() - timedelta(days=VOLUME_TREND_DAYS)
+    results = volume_trends(scored, since=since)
+    alerts = anomaly_alerts(scored, since=since)
+    
+    for alert in alerts:
+        print(f"ALERT: {alert['message']}")
     
     # Store results as XCom for downstream tasks
     kwargs['ti'].xcom_push(key='volume_trends', value=json.dumps(results))
+    kwargs['ti'].xcom_push(key='volume_alerts', value=json.dumps(alerts))
     return results
 
 # Function to generate monitoring report
@@ -140,7 +180,7 @@ def generate_monitoring_report(**kwargs):
     
     # Check for stale data
     for table, data in freshness_data.items():
-        if 'hours_since_update' in data and data['hours_since_update'] and data['hours_since_update'] > 24:
+        if 'hours_since_update' in data and data['hours_since_update'] > STALE_AFTER_HOURS:
             report['alerts'].append({
                 'type': 'stale_data',
                 'table': table,
@@ -148,18 +188,8 @@ def generate_monitoring_report(**kwargs):
                 'message': f"Data in {table} is stale! Last update was {data['hours_since_update']} hours ago."
             })
     
-    # Check for volume anomalies
-    for table, data in volume_data.items():
-        if isinstance(data, list):
-            for day_data in data:
-                if 'day_over_day_change_pct' in day_data and abs(day_data['day_over_day_change_pct']) > 20:
-                    report['alerts'].append({
-                        'type': 'volume_anomaly',
-                        'table': table,
-                        'date': day_data['process_date'],
-                        'change_pct': day_data['day_over_day_change_pct'],
-                        'message': f"Significant volume change in {table} on {day_data['process_date']}: {day_data['day_over_day_change_pct']:.2f}% change"
-                    })
+    # Volume anomalies were already detected by check_data_volume_trends
+    report['alerts'].extend(json.loads(ti.xcom_pull(task_ids='check_data_volume_trends', key='volume_alerts')))
     
     # Print report summary
     print(f"Monitoring Report Generated: {datetime.now().isoformat()}")
@@ -193,23 +223,16 @@ generate_monitoring_report_task = PythonOperator(
 )
 
 # Check for null values in critical columns
-check_null_values_task = BigQueryCheckOperator(
+check_null_values_task = PythonOperator(
     task_id='check_null_values',
-    sql=f"""
-    SELECT 
-        COUNTIF(contract_id IS NULL) +
-        COUNTIF(contract_name IS NULL) +
-        COUNTIF(start_date IS NULL) +
-        COUNTIF(end_date IS NULL) +
-        COUNTIF(contract_value IS NULL) +
-        COUNTIF(contract_status IS NULL) as total_nulls
-    FROM `{PROJECT_ID}.{SILVER_DATASET}_silver.contracts_silver`
-    HAVING total_nulls > 0
-    """,
-    use_legacy_sql=False,
+    python_callable=check_null_values,
+    provide_context=True,
     dag=dag,
 )
 
 # Set task dependencies
+# Volume trends read the metrics history, including the metrics recorded by this run
+check_data_freshness_task >> check_data_volume_trends_task
 [check_data_freshness_task, check_data_volume_trends_task] >> generate_monitoring_report_task
-check_null_values_task 
\ No newline at end of file
+# The null check reads the null counts recorded by check_data_freshness
+check_data_freshness_task >> check_null_values_task 
\ No newline at end of file
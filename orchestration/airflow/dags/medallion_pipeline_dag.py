@@ -7,16 +7,43 @@ from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, BranchPythonOperator
+from airflow.exceptions import AirflowSkipException
+from airflow.utils.task_group import TaskGroup
 from airflow.operators.bash import BashOperator
 from airflow.providers.google.cloud.transfers.local_to_gcs import LocalFilesystemToGCSOperator
 from airflow.providers.google.cloud.operators.bigquery import BigQueryCreateEmptyDatasetOperator
 from airflow.providers.google.cloud.transfers.gcs_to_bigquery import GCSToBigQueryOperator
-from airflow.providers.google.cloud.operators.bigquery import BigQueryCheckOperator
+from airflow.providers.google.cloud.hooks.bigquery import BigQueryHook
 import subprocess
 import logging
 import sys
 import time
+import hashlib
+import json
+from bronze.schemas import BRONZE_TABLES
+from bronze.landing import convert_bronze_table, landing_path
+from bronze.manifest import detect_changed_tables, record_loaded_tables
+from bronze.partitioning import time_partitioning
+from dbt_lineage import load_dbt_lineage, affected_models
+from batched_checks import (
+    PIPELINE_ASSERTIONS,
+    compile_batched_check_sql,
+    evaluate_check_results,
+    format_failed_assertions,
+    qualify_assertions
+)
+from dbt_performance import append_model_runs, model_run_records, PERFORMANCE_BACKEND
+from task_instrumentation import (
+    bigquery_job_metrics,
+    child_peak_rss_mb,
+    dbt_run_results_metrics,
+    emit_task_event,
+    local_file_bytes,
+    record_task_metrics,
+    task_event,
+    TASK_METRICS_KEY
+)
 
 # Load environment variables
 load_dotenv()
@@ -57,6 +84,27 @@ def sla_miss_slack_alert(dag, task_list, blocking_task_list, slas, blocking_tis)
     # In a real environment, you would send this to Slack
     print(f"SLA MISS: {message}")
 
+def emit_task_metrics(context):
+    """
+    Callback emitting one instrumentation event per finished task try: wall time plus the
+    metrics the task recorded, GCS bytes uploaded and BigQuery load job statistics
+    """
+    logger = logging.getLogger(__name__)
+    task_instance = context['task_instance']
+    task = context['task']
+    
+    # Instrumentation must never fail or retry the task itself
+    try:
+        metrics = dict(task_instance.xcom_pull(task_ids=task_instance.task_id, key=TASK_METRICS_KEY) or {})
+        if isinstance(task, LocalFilesystemToGCSOperator):
+            metrics['gcs_bytes_uploaded'] = local_file_bytes(task.src)
+        if isinstance(task, GCSToBigQueryOperator) and getattr(task, 'job_id', None):
+            job = BigQueryHook(location=task.location).get_job(job_id=task.job_id, project_id=PROJECT_ID)
+            metrics['bigquery'] = bigquery_job_metrics(job.to_api_repr())
+        emit_task_event(task_event(task_instance, metrics))
+    except Exception as e:
+        logger.warning(f"Failed to emit instrumentation for {task_instance.task_id}: {e}")
+
 # Default arguments for the DAG
 default_args = {
     'owner': 'airflow',
@@ -67,6 +115,10 @@ default_args = {
     'retries': 1,
     'retry_delay': timedelta(minutes=5),
     'sla': timedelta(hours=2),  # SLA for the entire DAG
+    # One instrumentation event per task try, see task_instrumentation
+    'on_success_callback': emit_task_metrics,
+    'on_failure_callback': emit_task_metrics,
+    'on_retry_callback': emit_task_metrics,
 }
 
 # Define the DAG
@@ -98,48 +150,117 @@ create_bronze_dataset = BigQueryCreateEmptyDatasetOperator(
     dag=dag,
 )
 
-# 2. Upload CSV files to GCS (Bronze Layer)
+# Function to decide which bronze sources need to be ingested
+def detect_bronze_changes(**kwargs):
+    """
+    Branch on the bronze manifest: only changed source files are converted, uploaded
+    and loaded, and dbt is skipped entirely when no source has changed
+    """
+    logger = logging.getLogger(__name__)
+    
+    changed_tables = detect_changed_tables()
+    kwargs['ti'].xcom_push(key='changed_tables', value=changed_tables)
+    
+    if not changed_tables:
+        logger.info("No bronze source files changed since the last load, skipping ingestion and dbt")
+        return []
+    
+    logger.info(f"Changed bronze sources: {', '.join(changed_tables)}")
+    return [f'convert_{table}_to_parquet' for table in changed_tables] + ['run_dbt_models.plan_dbt_run']
+
+# Function to convert a bronze source to its Parquet landing file
+def convert_bronze_source(table, **kwargs):
+    """
+    Convert one bronze table and record its row and byte counts as task metrics
+    """
+    stats = convert_bronze_table(table)
+    record_task_metrics(kwargs['ti'], {
+        'rows': stats['rows'],
+        'source_bytes': stats['source_bytes'],
+        'parquet_bytes': stats['parquet_bytes'],
+    })
+    return stats
+
+# Function to record the fingerprints of the loaded bronze sources
+def update_bronze_manifest(**kwargs):
+    """
+    Record loaded source fingerprints once dbt has succeeded, so a failed run is retried in full
+    """
+    changed_tables = kwargs['ti'].xcom_pull(task_ids='detect_bronze_changes', key='changed_tables')
+    record_loaded_tables(changed_tables)
+
+# 2. Detect changed bronze source files
+detect_bronze_changes_task = BranchPythonOperator(
+    task_id='detect_bronze_changes',
+    python_callable=detect_bronze_changes,
+    dag=dag,
+)
+
+# 3. Convert raw CSV exports to typed Parquet (Bronze Layer)
+convert_contracts_to_parquet = PythonOperator(
+    task_id='convert_contracts_to_parquet',
+    python_callable=convert_bronze_source,
+    op_kwargs={'table': 'contracts'},
+    dag=dag,
+)
+
+convert_budgets_to_parquet = PythonOperator(
+    task_id='convert_budgets_to_parquet',
+    python_callable=convert_bronze_source,
+    op_kwargs={'table': 'budgets'},
+    dag=dag,
+)
+
+convert_co_to_parquet = PythonOperator(
+    task_id='convert_co_to_parquet',
+    python_callable=convert_bronze_source,
+    op_kwargs={'table': 'co'},
+    dag=dag,
+)
+
+# 4. Upload Parquet files to GCS (Bronze Layer)
 upload_contracts_to_gcs = LocalFilesystemToGCSOperator(
     task_id='upload_contracts_to_gcs',
-    src='bronze/data/contracts_simple.csv',
-    dst='bronze/contracts/contracts.csv',
+    src=landing_path('contracts'),
+    dst='bronze/contracts/contracts.parquet',
     bucket=BUCKET_NAME,
+    mime_type='application/vnd.apache.parquet',
     dag=dag,
 )
 
 upload_budgets_to_gcs = LocalFilesystemToGCSOperator(
     task_id='upload_budgets_to_gcs',
-    src='bronze/data/budgets_simple.csv',
-    dst='bronze/budgets/budgets.csv',
+    src=landing_path('budgets'),
+    dst='bronze/budgets/budgets.parquet',
     bucket=BUCKET_NAME,
+    mime_type='application/vnd.apache.parquet',
     dag=dag,
 )
 
 upload_co_to_gcs = LocalFilesystemToGCSOperator(
     task_id='upload_co_to_gcs',
-    src='bronze/data/co_simple.csv',
-    dst='bronze/co/co.csv',
+    src=landing_path('co'),
+    dst='bronze/co/co.parquet',
     bucket=BUCKET_NAME,
+    mime_type='application/vnd.apache.parquet',
     dag=dag,
 )
 
-# 3. Load data from GCS to BigQuery (Bronze Layer)
+# 5. Load data from GCS to BigQuery (Bronze Layer)
+# Each changed source is loaded as a snapshot into its own ingestion-time day partition.
+# Writing through the partition decorator replaces only that day's partition, so a retried
+# load does not duplicate rows; silver models read the latest snapshot. Partitions expire after
+# BRONZE_PARTITION_EXPIRATION_DAYS, and unchanged sources are reloaded before their snapshot does.
+# Tables created unpartitioned must be migrated once first (python -m bronze.partitioning).
 load_contracts_to_bq = GCSToBigQueryOperator(
     task_id='load_contracts_to_bq',
     bucket=BUCKET_NAME,
-    source_objects=['bronze/contracts/contracts.csv'],
-    destination_project_dataset_table=f'{PROJECT_ID}.{BRONZE_DATASET}.contracts',
-    schema_fields=[
-        {'name': 'contract_id', 'type': 'STRING', 'mode': 'REQUIRED'},
-        {'name': 'contract_name', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'client_name', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'start_date', 'type': 'DATE', 'mode': 'NULLABLE'},
-        {'name': 'end_date', 'type': 'DATE', 'mode': 'NULLABLE'},
-        {'name': 'contract_value', 'type': 'NUMERIC', 'mode': 'NULLABLE'},
-        {'name': 'contract_status', 'type': 'STRING', 'mode': 'NULLABLE'},
-    ],
+    source_objects=['bronze/contracts/contracts.parquet'],
+    destination_project_dataset_table=f'{PROJECT_ID}.{BRONZE_DATASET}.contracts${{{{ ds_nodash }}}}',
+    schema_fields=BRONZE_TABLES['contracts']['schema_fields'],
+    source_format='PARQUET',
+    time_partitioning=time_partitioning(),
     write_disposition='WRITE_TRUNCATE',
-    skip_leading_rows=1,
     autodetect=False,
     dag=dag,
 )
@@ -148,27 +269,12 @@ load_contracts_to_bq = GCSToBigQueryOperator(
 load_budgets_to_bq = GCSToBigQueryOperator(
     task_id='load_budgets_to_bq',
     bucket=BUCKET_NAME,
-    source_objects=['bronze/budgets/budgets.csv'],
-    destination_project_dataset_table=f'{PROJECT_ID}.{BRONZE_DATASET}.budgets',
-    schema_fields=[
-        {'name': 'id', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'contractId', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'name', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'code', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'scope', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'plannedStartDate', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'plannedEndDate', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'actualStartDate', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'actualEndDate', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'originalAmount', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'actualCost', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'createdAt', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'updatedAt', 'type': 'STRING', 'mode': 'NULLABLE'}
-    ],
+    source_objects=['bronze/budgets/budgets.parquet'],
+    destination_project_dataset_table=f'{PROJECT_ID}.{BRONZE_DATASET}.budgets${{{{ ds_nodash }}}}',
+    schema_fields=BRONZE_TABLES['budgets']['schema_fields'],
+    source_format='PARQUET',
+    time_partitioning=time_partitioning(),
     write_disposition='WRITE_TRUNCATE',
-    skip_leading_rows=1,
-    allow_quoted_newlines=True,
-    allow_jagged_rows=True,
     autodetect=False,
     dag=dag,
 )
@@ -177,33 +283,17 @@ load_budgets_to_bq = GCSToBigQueryOperator(
 load_co_to_bq = GCSToBigQueryOperator(
     task_id='load_co_to_bq',
     bucket=BUCKET_NAME,
-    source_objects=['bronze/co/co.csv'],
-    destination_project_dataset_table=f'{PROJECT_ID}.{BRONZE_DATASET}.co',
-    schema_fields=[
-        {'name': 'id', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'number', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'name', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'scope', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'type', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'contractId', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'estimated', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'proposed', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'submitted', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'approved', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'committed', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'createdAt', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'updatedAt', 'type': 'STRING', 'mode': 'NULLABLE'},
-        {'name': 'statusChangedAt', 'type': 'STRING', 'mode': 'NULLABLE'}
-    ],
+    source_objects=['bronze/co/co.parquet'],
+    destination_project_dataset_table=f'{PROJECT_ID}.{BRONZE_DATASET}.co${{{{ ds_nodash }}}}',
+    schema_fields=BRONZE_TABLES['co']['schema_fields'],
+    source_format='PARQUET',
+    time_partitioning=time_partitioning(),
     write_disposition='WRITE_TRUNCATE',
-    skip_leading_rows=1,
-    allow_quoted_newlines=True,
-    allow_jagged_rows=True,
     autodetect=False,
     dag=dag,
 )
 
-# 4. Create Silver Dataset if it doesn't exist
+# 6. Create Silver Dataset if it doesn't exist
 create_silver_dataset = BigQueryCreateEmptyDatasetOperator(
     task_id='create_silver_dataset',
     dataset_id=SILVER_DATASET,
@@ -212,7 +302,7 @@ create_silver_dataset = BigQueryCreateEmptyDatasetOperator(
     dag=dag,
 )
 
-# 5. Create Gold Dataset if it doesn't exist
+# 7. Create Gold Dataset if it doesn't exist
 create_gold_dataset = BigQueryCreateEmptyDatasetOperator(
     task_id='create_gold_dataset',
     dataset_id=GOLD_DATASET,
@@ -221,10 +311,63 @@ create_gold_dataset = BigQueryCreateEmptyDatasetOperator(
     dag=dag,
 )
 
-# Function to run dbt commands
-def run_dbt_commands(**kwargs):
+# File (relative to the dbt project) recording the project fingerprint of the last full refresh
+DBT_FULL_REFRESH_STATE = os.path.join('target', 'full_refresh_state.json')
+
+def dbt_project_fingerprint(dbt_dir):
+    """
+    Hash the dbt model and macro sources, so changes to model logic can be detected
+    """
+    digest = hashlib.sha256()
+    for folder in ('models', 'macros'):
+        for root, dirs, files in os.walk(os.path.join(dbt_dir, folder)):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                digest.update(os.path.relpath(path, dbt_dir).encode('utf-8'))
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+def select_dbt_run_mode(dbt_dir, conf=None):
+    """
+    Pick 'full-refresh' or 'incremental' for the incremental silver models.
+    A full refresh runs when requested with {"full_refresh": true} in the DAG run conf,
+    when no full refresh has been recorded yet, or when the models or macros changed since.
+    """
+    if (conf or {}).get('full_refresh'):
+        return 'full-refresh'
+    
+    state_path = os.path.join(dbt_dir, DBT_FULL_REFRESH_STATE)
+    if not os.path.exists(state_path):
+        return 'full-refresh'
+    
+    with open(state_path, 'r') as f:
+        state = json.load(f)
+    if state.get('project_fingerprint') != dbt_project_fingerprint(dbt_dir):
+        return 'full-refresh'
+    
+    return 'incremental'
+
+def record_dbt_full_refresh(dbt_dir):
+    """
+    Record the project fingerprint after a successful full refresh
+    """
+    state_path = os.path.join(dbt_dir, DBT_FULL_REFRESH_STATE)
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    with open(state_path, 'w') as f:
+        json.dump({
+            'project_fingerprint': dbt_project_fingerprint(dbt_dir),
+            'refreshed_at': datetime.utcnow().isoformat(),
+        }, f)
+
+# dbt project run by the dbt tasks, and its model lineage (one Airflow task per model)
+DBT_DIR = '/opt/airflow/silver_layer/transformations'
+DBT_LINEAGE = load_dbt_lineage(DBT_DIR)
+
+def prepare_dbt_environment():
     """
-    Run dbt commands for the medallion architecture
+    Set the dbt environment variables and check the project, profiles and credentials exist
     """
     logger = logging.getLogger(__name__)
     
@@ -234,17 +377,14 @@ def run_dbt_commands(**kwargs):
     os.environ['BIGQUERY_DATASET_GOLD'] = 'medallion_pipeline_gold'
     os.environ['GCP_CREDENTIALS_PATH'] = '/opt/airflow/medallion-dev-6a948fd7a82c.json'
     
-    # Change to the dbt directory
-    dbt_dir = '/opt/airflow/silver_layer/transformations'
-    
     # Check if directory exists
-    if not os.path.exists(dbt_dir):
-        error_msg = f"DBT directory does not exist: {dbt_dir}"
+    if not os.path.exists(DBT_DIR):
+        error_msg = f"DBT directory does not exist: {DBT_DIR}"
         logger.error(error_msg)
         raise Exception(error_msg)
     
     # Check if profiles directory exists
-    profiles_dir = os.path.join(dbt_dir, 'profiles')
+    profiles_dir = os.path.join(DBT_DIR, 'profiles')
     if not os.path.exists(profiles_dir):
         error_msg = f"Profiles directory does not exist: {profiles_dir}"
         logger.error(error_msg)
@@ -257,173 +397,270 @@ def run_dbt_commands(**kwargs):
         logger.error(error_msg)
         raise Exception(error_msg)
     
+    return DBT_DIR
+
+# Function to run a command with retries
+def run_with_retry(cmd, max_retries=3, retry_delay=5, ignore_errors=False):
+    logger = logging.getLogger(__name__)
+    retries = 0
+    while retries < max_retries:
+        try:
+            logger.info(f"Executing command: {' '.join(cmd)}")
+            process = subprocess.run(
+                cmd,
+                check=not ignore_errors,  # Only check for errors if ignore_errors is False
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            logger.info(f"Command output: {process.stdout}")
+            if process.returncode != 0 and ignore_errors:
+                logger.warning(f"Command exited with non-zero code {process.returncode}, but errors are being ignored. Error: {process.stderr}")
+            return process
+        except subprocess.CalledProcessError as e:
+            retries += 1
+            logger.warning(f"Command failed (attempt {retries}/{max_retries}): {e.stderr}")
+            if retries >= max_retries:
+                if ignore_errors:
+                    logger.warning(f"Command failed after {max_retries} attempts, but errors are being ignored.")
+                    return e
+                raise
+            logger.info(f"Retrying in {retry_delay} seconds...")
+            time.sleep(retry_delay)
+
+# Function to plan which dbt models to build
+def plan_dbt_run(**kwargs):
+    """
+    Pick the dbt run mode and the models to build: every model on a full refresh,
+    otherwise only the models downstream of the bronze sources that changed
+    """
+    logger = logging.getLogger(__name__)
+    
+    dag_run = kwargs.get('dag_run')
+    run_mode = select_dbt_run_mode(DBT_DIR, getattr(dag_run, 'conf', None))
+    
+    if run_mode == 'full-refresh':
+        models = sorted(DBT_LINEAGE)
+    else:
+        changed_tables = kwargs['ti'].xcom_pull(task_ids='detect_bronze_changes', key='changed_tables') or {}
+        models = affected_models(DBT_LINEAGE, {f'bronze.{table}' for table in changed_tables})
+    
+    logger.info(f"Building {len(models)} dbt models ({run_mode}): {', '.join(models)}")
+    return {'run_mode': run_mode, 'models': models}
+
+# Function to run and test a single dbt model
+def run_dbt_model(model, **kwargs):
+    """
+    Run and test one dbt model. Models outside the plan are skipped. Retries are left to
+    the Airflow task so a failing model is retried on its own.
+    """
+    logger = logging.getLogger(__name__)
+    
+    plan = kwargs['ti'].xcom_pull(task_ids='run_dbt_models.plan_dbt_run')
+    if not plan or model not in plan['models']:
+        raise AirflowSkipException(f"{model} is not downstream of a changed bronze source")
+    
+    dbt_dir = prepare_dbt_environment()
+    
     # Change to the dbt directory
     original_dir = os.getcwd()
     os.chdir(dbt_dir)
     
+    # Models run concurrently, so each one writes its own dbt artifacts
+    target_path = os.path.join('target', model)
+    dbt_args = ['--profiles-dir=./profiles', f'--target-path={target_path}', '--select', model]
+    run_results_path = os.path.join(dbt_dir, target_path, 'run_results.json')
+    metrics = {'run_mode': plan['run_mode']}
+    
     try:
-        # Function to run a command with retries
-        def run_with_retry(cmd, max_retries=3, retry_delay=5, ignore_errors=False):
-            retries = 0
-            while retries < max_retries:
-                try:
-                    logger.info(f"Executing command: {' '.join(cmd)}")
-                    process = subprocess.run(
-                        cmd,
-                        check=not ignore_errors,  # Only check for errors if ignore_errors is False
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True
-                    )
-                    logger.info(f"Command output: {process.stdout}")
-                    if process.returncode != 0 and ignore_errors:
-                        logger.warning(f"Command exited with non-zero code {process.returncode}, but errors are being ignored. Error: {process.stderr}")
-                    return process
-                except subprocess.CalledProcessError as e:
-                    retries += 1
-                    logger.warning(f"Command failed (attempt {retries}/{max_retries}): {e.stderr}")
-                    if retries >= max_retries:
-                        if ignore_errors:
-                            logger.warning(f"Command failed after {max_retries} attempts, but errors are being ignored.")
-                            return e
-                        raise
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-        
-        # Run dbt models
-        logger.info("Running dbt models...")
-        dbt_run_cmd = ['dbt', 'run', '--profiles-dir=./profiles']
-        run_with_retry(dbt_run_cmd)
+        logger.info(f"Running dbt model {model} ({plan['run_mode']})...")
+        dbt_run_cmd = ['dbt', 'run'] + dbt_args
+        if plan['run_mode'] == 'full-refresh':
+            dbt_run_cmd.append('--full-refresh')
+        try:
+            run_with_retry(dbt_run_cmd, max_retries=1)
+        finally:
+            # dbt test overwrites run_results.json, so the run's results are read first
+            metrics['dbt_run'] = dbt_run_results_metrics(run_results_path)
+            kwargs['ti'].xcom_push(key='dbt_model_runs', value=model_run_records(os.path.join(dbt_dir, target_path)))
         
         # Run dbt tests but don't fail the task if tests fail
-        logger.info("Running dbt tests...")
-        dbt_test_cmd = ['dbt', 'test', '--profiles-dir=./profiles']
+        logger.info(f"Running dbt tests for {model}...")
+        dbt_test_cmd = ['dbt', 'test'] + dbt_args
         try:
-            test_result = run_with_retry(dbt_test_cmd, ignore_errors=True)
+            test_result = run_with_retry(dbt_test_cmd, max_retries=1, ignore_errors=True)
             if hasattr(test_result, 'returncode') and test_result.returncode != 0:
                 logger.warning(f"DBT tests failed with exit code {test_result.returncode}, but continuing with the pipeline.")
                 logger.warning(f"Test errors: {test_result.stderr}")
         except Exception as e:
             logger.warning(f"DBT tests failed with error: {str(e)}, but continuing with the pipeline.")
+        metrics['dbt_test'] = dbt_run_results_metrics(run_results_path)
         
-        # Generate dbt docs
-        logger.info("Generating dbt docs...")
-        dbt_docs_cmd = ['dbt', 'docs', 'generate', '--profiles-dir=./profiles']
-        try:
-            run_with_retry(dbt_docs_cmd, ignore_errors=True)
-        except Exception as e:
-            logger.warning(f"DBT docs generation failed with error: {str(e)}, but continuing with the pipeline.")
-        
-        logger.info("All dbt commands completed successfully")
-        return "DBT commands completed successfully"
+        return f"DBT model {model} completed successfully"
     except subprocess.CalledProcessError as e:
         error_msg = f"Command failed with exit code {e.returncode}. Error: {e.stderr}"
         logger.error(error_msg)
         raise Exception(error_msg)
-    except Exception as e:
-        error_msg = f"Unexpected error: {str(e)}"
-        logger.error(error_msg)
-        raise Exception(error_msg)
     finally:
+        metrics['dbt_peak_rss_mb'] = child_peak_rss_mb()
+        record_task_metrics(kwargs['ti'], metrics)
         # Change back to the original directory
         os.chdir(original_dir)
 
-# 6. Run dbt Core locally for transformations (Silver and Gold layers)
-run_dbt_models = PythonOperator(
-    task_id='run_dbt_models',
-    python_callable=run_dbt_commands,
-    retries=3,
-    retry_delay=timedelta(seconds=30),
-    dag=dag,
-)
+# Function to record the dbt run once every planned model succeeded
+def record_dbt_run(**kwargs):
+    """
+    Append the models' run artifacts to the dbt performance history, and record the
+    project fingerprint after a successful full refresh
+    """
+    logger = logging.getLogger(__name__)
+    
+    plan = kwargs['ti'].xcom_pull(task_ids='run_dbt_models.plan_dbt_run')
+    if not plan:
+        raise AirflowSkipException("No dbt run was planned")
+    
+    model_runs = kwargs['ti'].xcom_pull(
+        task_ids=[f'run_dbt_models.{model}' for model in plan['models']], key='dbt_model_runs'
+    )
+    records = [record for runs in model_runs or [] if runs for record in runs]
+    try:
+        client = None
+        if PERFORMANCE_BACKEND == 'bigquery':
+            client = BigQueryHook(use_legacy_sql=False).get_client(project_id=PROJECT_ID)
+        count = append_model_runs(records, client)
+        logger.info(f"Recorded {count} dbt model runs in the performance history")
+    except Exception as e:
+        logger.warning(f"Failed to record the dbt performance history: {e}")
+    
+    if plan['run_mode'] == 'full-refresh':
+        record_dbt_full_refresh(DBT_DIR)
 
-# 7. Validate data quality in Silver layer
-validate_silver_contracts = BigQueryCheckOperator(
-    task_id='validate_silver_contracts',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_silver.contracts_silver` 
-    WHERE contract_id IS NULL
-    """,
-    use_legacy_sql=False,
-    dag=dag,
-)
+# Function to generate dbt docs
+def generate_dbt_docs(**kwargs):
+    """
+    Generate dbt docs once the models are built. Nothing downstream waits on the docs,
+    so failures are logged rather than raised.
+    """
+    logger = logging.getLogger(__name__)
+    
+    dbt_dir = prepare_dbt_environment()
+    original_dir = os.getcwd()
+    os.chdir(dbt_dir)
+    
+    try:
+        logger.info("Generating dbt docs...")
+        dbt_docs_cmd = ['dbt', 'docs', 'generate', '--profiles-dir=./profiles']
+        try:
+            run_with_retry(dbt_docs_cmd, ignore_errors=True)
+        except Exception as e:
+            logger.warning(f"DBT docs generation failed with error: {str(e)}, but continuing with the pipeline.")
+    finally:
+        os.chdir(original_dir)
 
-validate_silver_budgets = BigQueryCheckOperator(
-    task_id='validate_silver_budgets',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_silver.budgets_silver` 
-    WHERE budget_id IS NULL
-    """,
-    use_legacy_sql=False,
-    dag=dag,
-)
+# 8. Run dbt Core locally for transformations (Silver and Gold layers), one task per model
+with TaskGroup(group_id='run_dbt_models', dag=dag) as run_dbt_models:
+    plan_dbt_run_task = PythonOperator(
+        task_id='plan_dbt_run',
+        python_callable=plan_dbt_run,
+        # Loads of unchanged sources are skipped by detect_bronze_changes
+        trigger_rule='none_failed_min_one_success',
+        dag=dag,
+    )
+    
+    dbt_model_tasks = {
+        model: PythonOperator(
+            task_id=model,
+            python_callable=run_dbt_model,
+            op_kwargs={'model': model},
+            # Models outside the plan are skipped without skipping their dependents
+            trigger_rule='none_failed',
+            retries=3,
+            retry_delay=timedelta(seconds=30),
+            dag=dag,
+        )
+        for model in sorted(DBT_LINEAGE)
+    }
+    
+    record_dbt_run_task = PythonOperator(
+        task_id='record_dbt_run',
+        python_callable=record_dbt_run,
+        trigger_rule='none_failed',
+        dag=dag,
+    )
+    
+    # Model dependencies follow the dbt ref() lineage
+    for model, task in dbt_model_tasks.items():
+        refs = DBT_LINEAGE[model]['refs']
+        if refs:
+            [dbt_model_tasks[ref] for ref in refs] >> task
+        else:
+            plan_dbt_run_task >> task
+        task >> record_dbt_run_task
+    plan_dbt_run_task >> record_dbt_run_task
 
-validate_silver_change_orders = BigQueryCheckOperator(
-    task_id='validate_silver_change_orders',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_silver.change_orders_silver` 
-    WHERE change_order_id IS NULL
-    """,
-    use_legacy_sql=False,
+# Generate dbt docs off the critical path
+generate_dbt_docs_task = PythonOperator(
+    task_id='generate_dbt_docs',
+    python_callable=generate_dbt_docs,
     dag=dag,
 )
 
-# 8. Validate data quality in Gold layer
-validate_gold_project_analytics = BigQueryCheckOperator(
-    task_id='validate_gold_project_analytics',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_gold.project_analytics` 
-    WHERE contract_id IS NULL
-    """,
-    use_legacy_sql=False,
+# Record loaded bronze fingerprints once dbt has succeeded
+update_bronze_manifest_task = PythonOperator(
+    task_id='update_bronze_manifest',
+    python_callable=update_bronze_manifest,
     dag=dag,
 )
 
-validate_gold_client_analytics = BigQueryCheckOperator(
-    task_id='validate_gold_client_analytics',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_gold.client_analytics` 
-    WHERE client_name IS NULL
-    """,
-    use_legacy_sql=False,
-    dag=dag,
-)
+# 9. Validate data quality in the Silver and Gold layers with one batched BigQuery job
+SILVER_TABLES = f'{PROJECT_ID}.medallion_pipeline_silver_silver'
+GOLD_TABLES = f'{PROJECT_ID}.medallion_pipeline_silver_gold'
+DATA_QUALITY_ASSERTIONS = qualify_assertions(PIPELINE_ASSERTIONS, {'silver': SILVER_TABLES, 'gold': GOLD_TABLES})
 
-validate_gold_time_analytics = BigQueryCheckOperator(
-    task_id='validate_gold_time_analytics',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_gold.time_analytics` 
-    WHERE year IS NULL OR month IS NULL
-    """,
-    use_legacy_sql=False,
-    dag=dag,
-)
+# Function to run the batched data quality checks
+def run_batched_checks(assertions, **kwargs):
+    """
+    Run every assertion in a single BigQuery job and fail naming each broken assertion
+    """
+    logger = logging.getLogger(__name__)
+    
+    sql = compile_batched_check_sql(assertions)
+    logger.info(f"Running {len(assertions)} data quality assertions:\n{sql}")
+    client = BigQueryHook(use_legacy_sql=False).get_client(project_id=PROJECT_ID)
+    job = client.query(sql)
+    rows = list(job.result())
+    record_task_metrics(kwargs['ti'], {'bigquery': bigquery_job_metrics(job.to_api_repr())})
+    results = evaluate_check_results(assertions, rows)
+    
+    for result in results:
+        status = "passed" if result['success'] else "FAILED"
+        logger.info(f"{result['name']}: {status} ({result['failing_rows']} failing rows)")
+    
+    failures = format_failed_assertions(results)
+    if failures:
+        error_msg = f"Data quality assertions failed:\n{failures}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    
+    return results
 
-validate_gold_contract_summary = BigQueryCheckOperator(
-    task_id='validate_gold_contract_summary',
-    sql=f"""
-    SELECT COUNT(*) = 0
-    FROM `{PROJECT_ID}.medallion_pipeline_silver_gold.contract_summary` 
-    WHERE client_name IS NULL
-    """,
-    use_legacy_sql=False,
+validate_data_quality = PythonOperator(
+    task_id='validate_data_quality',
+    python_callable=run_batched_checks,
+    op_kwargs={'assertions': DATA_QUALITY_ASSERTIONS},
     dag=dag,
 )
 
 # Set task dependencies
 create_bronze_dataset >> [upload_contracts_to_gcs, upload_budgets_to_gcs, upload_co_to_gcs]
+detect_bronze_changes_task >> [convert_contracts_to_parquet, convert_budgets_to_parquet, convert_co_to_parquet, run_dbt_models]
+convert_contracts_to_parquet >> upload_contracts_to_gcs
+convert_budgets_to_parquet >> upload_budgets_to_gcs
+convert_co_to_parquet >> upload_co_to_gcs
 upload_contracts_to_gcs >> load_contracts_to_bq
 upload_budgets_to_gcs >> load_budgets_to_bq
 upload_co_to_gcs >> load_co_to_bq
 create_silver_dataset >> run_dbt_models
 create_gold_dataset >> run_dbt_models
 [load_contracts_to_bq, load_budgets_to_bq, load_co_to_bq] >> run_dbt_models
-run_dbt_models >> [validate_silver_contracts, validate_silver_budgets, validate_silver_change_orders, 
-                  validate_gold_project_analytics, validate_gold_client_analytics, validate_gold_time_analytics,
-                  validate_gold_contract_summary] 
\ No newline at end of file
+run_dbt_models >> [update_bronze_manifest_task, generate_dbt_docs_task, validate_data_quality]
@@ -0,0 +1,62 @@
+"""
+Concurrent BigQuery query execution for the monitoring DAG.
+
+Every query is submitted as a BigQuery job up front, so the jobs run side by side on BigQuery,
+and a bounded thread pool waits for and downloads the results as they complete. Each query has
+its own timeout, after which its job is cancelled; failures are reported per query, so one
+failed query does not lose the others' results. A run takes about as long as its slowest query.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+QUERY_TIMEOUT_SECONDS = float(os.environ.get('MONITORING_QUERY_TIMEOUT', '300'))
+MAX_CONCURRENT_QUERIES = int(os.environ.get('MONITORING_MAX_CONCURRENT_QUERIES', '8'))
+
+
+def _collect(job, timeout, submitted):
+    frame = job.result(timeout=timeout).to_dataframe()
+    return frame, time.monotonic() - submitted
+
+
+def run_queries(client, queries, timeout=QUERY_TIMEOUT_SECONDS, max_workers=MAX_CONCURRENT_QUERIES):
+    """
+    Run {name: sql} queries concurrently with a BigQuery client.
+    Returns {name: {'result': DataFrame, 'seconds': float}} for successful queries and
+    {name: {'error': str, 'seconds': float}} for failed or timed out ones.
+    """
+    results = {}
+    jobs = {}
+    for name, sql in queries.items():
+        submitted = time.monotonic()
+        try:
+            jobs[name] = (client.query(sql), submitted)
+        except Exception as e:
+            results[name] = {'error': f"Failed to submit query: {e}", 'seconds': time.monotonic() - submitted}
+
+    if not jobs:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = {
+            pool.submit(_collect, job, timeout, submitted): name
+            for name, (job, submitted) in jobs.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            job, submitted = jobs[name]
+            try:
+                frame, seconds = future.result()
+                results[name] = {'result': frame, 'seconds': seconds}
+            except FutureTimeoutError:
+                job.cancel()
+                results[name] = {
+                    'error': f"Query timed out after {timeout:.0f} seconds",
+                    'seconds': time.monotonic() - submitted,
+                }
+            except Exception as e:
+                results[name] = {'error': str(e), 'seconds': time.monotonic() - submitted}
+
+    return results
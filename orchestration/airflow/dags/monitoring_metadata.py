@@ -0,0 +1,94 @@
+"""
+Metadata-based metrics collection for the monitoring DAG.
+
+Row counts, sizes and last-modified times for every monitored table come from each dataset's
+__TABLES__ metadata, so no table data is scanned. Null counts, which do need the rows, are
+collected in one more query for the tables that list null_columns.
+
+Monitored tables are dicts: {'dataset': ..., 'table': ..., 'null_columns': [...]},
+where null_columns is optional.
+"""
+
+STALE_AFTER_HOURS = 24
+
+
+def table_name(project_id, table):
+    """
+    Fully qualified name of a monitored table
+    """
+    return f"{project_id}.{table['dataset']}.{table['table']}"
+
+
+def _datasets(tables):
+    return sorted({table['dataset'] for table in tables})
+
+
+def compile_table_metadata_queries(project_id, tables):
+    """
+    One query per monitored dataset returning row count, size and hours since last
+    modification for every table in it, as {dataset: sql}
+    """
+    return {
+        dataset: (
+            f"SELECT dataset_id, table_id, row_count, size_bytes, "
+            f"TIMESTAMP_DIFF(CURRENT_TIMESTAMP(), TIMESTAMP_MILLIS(last_modified_time), HOUR) AS hours_since_update\n"
+            f"FROM `{project_id}.{dataset}.__TABLES__`"
+        )
+        for dataset in _datasets(tables)
+    }
+
+
+def compile_null_count_sql(project_id, tables):
+    """
+    One query returning the total null count over the null_columns of each table that
+    lists any, or None if no table does
+    """
+    selects = [
+        f"SELECT '{table['dataset']}' AS dataset_id, '{table['table']}' AS table_id, "
+        + ' + '.join(f"COUNTIF({column} IS NULL)" for column in table['null_columns'])
+        + f" AS null_count\nFROM `{table_name(project_id, table)}`"
+        for table in tables
+        if table.get('null_columns')
+    ]
+    if not selects:
+        return None
+    return '\nUNION ALL\n'.join(selects)
+
+
+def summarize_freshness(project_id, tables, metadata_frames, dataset_errors=None):
+    """
+    Freshness per table from the __TABLES__ metadata frames of the datasets that were read:
+    {table: {'hours_since_update', 'row_count', 'size_bytes'}}, or {'error'} for tables that
+    are missing or whose dataset could not be read ({dataset: error} in dataset_errors)
+    """
+    dataset_errors = dataset_errors or {}
+    rows = {
+        (row['dataset_id'], row['table_id']): row
+        for metadata in metadata_frames
+        for row in metadata.to_dict(orient='records')
+    }
+    results = {}
+    for table in tables:
+        if table['dataset'] in dataset_errors:
+            results[table_name(project_id, table)] = {'error': dataset_errors[table['dataset']]}
+            continue
+        row = rows.get((table['dataset'], table['table']))
+        if row is None:
+            results[table_name(project_id, table)] = {'error': 'Table not found in dataset metadata'}
+            continue
+        results[table_name(project_id, table)] = {
+            'hours_since_update': int(row['hours_since_update']),
+            'row_count': int(row['row_count']),
+            'size_bytes': int(row['size_bytes']),
+        }
+    return results
+
+
+def summarize_null_counts(project_id, null_counts):
+    """
+    Null counts per fully qualified table name from the null count query rows
+    """
+    return {
+        f"{project_id}.{row['dataset_id']}.{row['table_id']}": int(row['null_count'])
+        for row in null_counts.to_dict(orient='records')
+    }
@@ -0,0 +1,124 @@
+"""
+Time-series store for the monitoring DAG's per-table metrics.
+
+Every monitoring run appends one row per table:
+
+    run_at | table_name | row_count | hours_since_update | null_count | size_bytes | collection_seconds
+
+so trends and anomalies are computed from this small history instead of the monitored tables.
+The store is a local SQLite file by default (MONITORING_METRICS_BACKEND=local) or a day-partitioned
+BigQuery table (MONITORING_METRICS_BACKEND=bigquery).
+"""
+
+import os
+
+from history_store import append_bigquery, append_local, history_frame, read_bigquery, read_local
+
+METRICS_BACKEND = os.environ.get('MONITORING_METRICS_BACKEND', 'local')
+METRICS_PATH = os.environ.get(
+    'MONITORING_METRICS_PATH',
+    os.path.join(os.environ.get('AIRFLOW_HOME', '/opt/airflow'), 'monitoring', 'metrics.sqlite')
+)
+# dataset.table in the monitoring project
+METRICS_TABLE = os.environ.get('MONITORING_METRICS_TABLE', 'medallion_monitoring.table_metrics')
+
+METRICS_COLUMNS = {
+    'run_at': 'TIMESTAMP',
+    'table_name': 'STRING',
+    'row_count': 'INTEGER',
+    'hours_since_update': 'INTEGER',
+    'null_count': 'INTEGER',
+    'size_bytes': 'INTEGER',
+    'collection_seconds': 'FLOAT',
+}
+# SQLite table and the column identifying a row within a run
+LOCAL_TABLE = 'table_metrics'
+METRICS_KEY = 'table_name'
+
+
+def metrics_records(run_at, freshness, null_counts=None, collection_seconds=None):
+    """
+    One metrics record per table from the freshness results of a monitoring run.
+    Tables that could not be read are left out.
+    """
+    null_counts = null_counts or {}
+    records = []
+    for table, data in freshness.items():
+        if 'error' in data:
+            continue
+        records.append({
+            'run_at': run_at,
+            'table_name': table,
+            'row_count': data['row_count'],
+            'hours_since_update': data['hours_since_update'],
+            'null_count': null_counts.get(table),
+            'size_bytes': data.get('size_bytes'),
+            'collection_seconds': collection_seconds,
+        })
+    return records
+
+
+def metrics_frame(records):
+    """
+    Records as a DataFrame with the store's columns, naive UTC run_at and nullable integer counts
+    """
+    return history_frame(records, METRICS_COLUMNS)
+
+
+def append_local_metrics(records, path=METRICS_PATH):
+    """
+    Append metrics records to the SQLite store
+    """
+    return append_local(records, path, LOCAL_TABLE, METRICS_COLUMNS, METRICS_KEY)
+
+
+def read_local_metrics(days, path=METRICS_PATH):
+    """
+    Metrics records from the last `days` days in the SQLite store, oldest first
+    """
+    return read_local(days, path, LOCAL_TABLE, METRICS_COLUMNS, METRICS_KEY)
+
+
+def append_bigquery_metrics(records, client, table=METRICS_TABLE):
+    """
+    Append metrics records to the day-partitioned BigQuery store
+    """
+    return append_bigquery(records, client, table, METRICS_COLUMNS)
+
+
+def read_bigquery_metrics(days, client, table=METRICS_TABLE):
+    """
+    Metrics records from the last `days` days in the BigQuery store, oldest first
+    """
+    return read_bigquery(days, client, table, METRICS_COLUMNS, METRICS_KEY)
+
+
+def append_metrics(records, client=None, backend=METRICS_BACKEND):
+    """
+    Append metrics records to the configured store
+    """
+    if backend == 'bigquery':
+        return append_bigquery_metrics(records, client)
+    return append_local_metrics(records)
+
+
+def read_metrics_history(days, client=None, backend=METRICS_BACKEND):
+    """
+    Read the last `days` days of metrics from the configured store
+    """
+    if backend == 'bigquery':
+        return read_bigquery_metrics(days, client)
+    return read_local_metrics(days)
+
+
+def daily_row_counts(history):
+    """
+    Last recorded row count per table and day, as a long (table_name, process_date, daily_count) frame
+    """
+    latest = (
+        history.assign(process_date=history['run_at'].dt.normalize())
+        .sort_values('run_at')
+        .groupby(['table_name', 'process_date'], as_index=False)
+        .last()
+    )
+    return latest[['table_name', 'process_date', 'row_count']].rename(columns={'row_count': 'daily_count'})
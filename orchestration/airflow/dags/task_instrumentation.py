@@ -0,0 +1,173 @@
+"""
+Per-task instrumentation for the pipeline DAG.
+
+Every task try emits one structured event when it finishes, whether it succeeded, failed or
+is up for retry. The event is logged as a single JSON line prefixed with TASK_EVENT_PREFIX,
+and appended to a JSON Lines file when PIPELINE_TASK_EVENTS_PATH is set:
+
+    TASK_EVENT {"event": "task_metrics", "dag_id": ..., "task_id": ..., "run_id": ...,
+                "try_number": ..., "state": ..., "started_at": ..., "ended_at": ...,
+                "duration_seconds": ..., "metrics": {...}}
+
+The metrics depend on the task:
+
+- bronze conversions: rows, source and Parquet bytes
+- GCS uploads: gcs_bytes_uploaded
+- BigQuery loads and checks: the job's bytes processed and billed, slot-ms, and for loads the
+  input file bytes and output rows and bytes (bigquery_job_metrics)
+- dbt models: per-model timings and BigQuery adapter responses from run_results.json
+  (dbt_run_results_metrics), and the peak RSS of the dbt subprocesses (child_peak_rss_mb)
+
+Python tasks record their metrics with record_task_metrics; the DAG's task callbacks add the
+operator-specific metrics and emit the event with emit_task_event.
+"""
+
+import json
+import logging
+import os
+import resource
+import sys
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+TASK_EVENT_PREFIX = 'TASK_EVENT '
+TASK_METRICS_KEY = 'task_metrics'
+TASK_EVENTS_PATH = os.environ.get('PIPELINE_TASK_EVENTS_PATH')
+
+
+def record_task_metrics(ti, metrics):
+    """
+    Store a task's metrics in XCom, where the task callbacks pick them up
+    """
+    ti.xcom_push(key=TASK_METRICS_KEY, value=metrics)
+
+
+def child_peak_rss_mb():
+    """
+    Peak resident memory in MB of the largest subprocess this task has waited for
+    """
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def local_file_bytes(path):
+    """
+    Size of a local file in bytes, or None if it does not exist
+    """
+    return os.path.getsize(path) if path and os.path.exists(path) else None
+
+
+def _int_or_none(value):
+    return int(value) if value is not None else None
+
+
+def bigquery_job_metrics(job_resource):
+    """
+    Cost and volume metrics from a BigQuery job's API representation (job.to_api_repr()).
+    Query jobs report bytes processed and billed; load jobs report input and output volumes.
+    """
+    statistics = job_resource.get('statistics', {})
+    query = statistics.get('query', {})
+    load = statistics.get('load', {})
+    metrics = {
+        'job_id': job_resource.get('jobReference', {}).get('jobId'),
+        'job_type': job_resource.get('configuration', {}).get('jobType'),
+        'slot_ms': _int_or_none(statistics.get('totalSlotMs', query.get('totalSlotMs'))),
+        'bytes_processed': _int_or_none(statistics.get('totalBytesProcessed', query.get('totalBytesProcessed'))),
+        'bytes_billed': _int_or_none(query.get('totalBytesBilled')),
+        'cache_hit': query.get('cacheHit'),
+    }
+    if load:
+        metrics.update({
+            'input_file_bytes': _int_or_none(load.get('inputFileBytes')),
+            'output_rows': _int_or_none(load.get('outputRows')),
+            'output_bytes': _int_or_none(load.get('outputBytes')),
+        })
+    if statistics.get('startTime') and statistics.get('endTime'):
+        metrics['job_seconds'] = (int(statistics['endTime']) - int(statistics['startTime'])) / 1000
+    return metrics
+
+
+def _timing_seconds(timing, phase):
+    for step in timing:
+        if step.get('name') == phase and step.get('started_at') and step.get('completed_at'):
+            started = datetime.fromisoformat(step['started_at'].replace('Z', '+00:00'))
+            completed = datetime.fromisoformat(step['completed_at'].replace('Z', '+00:00'))
+            return (completed - started).total_seconds()
+    return None
+
+
+def dbt_run_results_metrics(path):
+    """
+    Per-node timings and BigQuery adapter responses from a dbt run_results.json.
+    Returns None if the file does not exist (dbt failed before writing it).
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        run_results = json.load(f)
+
+    nodes = []
+    for result in run_results.get('results', []):
+        unique_id = result.get('unique_id', '')
+        adapter_response = result.get('adapter_response') or {}
+        nodes.append({
+            'unique_id': unique_id,
+            'resource_type': unique_id.split('.')[0],
+            'name': unique_id.split('.')[-1],
+            'status': result.get('status'),
+            'execution_seconds': result.get('execution_time'),
+            'compile_seconds': _timing_seconds(result.get('timing', []), 'compile'),
+            'execute_seconds': _timing_seconds(result.get('timing', []), 'execute'),
+            'bytes_processed': adapter_response.get('bytes_processed'),
+            'bytes_billed': adapter_response.get('bytes_billed'),
+            'slot_ms': adapter_response.get('slot_ms'),
+            'rows_affected': adapter_response.get('rows_affected'),
+            'job_id': adapter_response.get('job_id'),
+        })
+    return {
+        'elapsed_seconds': run_results.get('elapsed_time'),
+        'generated_at': run_results.get('metadata', {}).get('generated_at'),
+        'invocation_id': run_results.get('metadata', {}).get('invocation_id'),
+        'nodes': nodes,
+    }
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def task_event(ti, metrics=None, now=None):
+    """
+    The event for a finished task try: identity, state, timing and metrics
+    """
+    ended_at = ti.end_date or now or datetime.now(timezone.utc)
+    duration = ti.duration
+    if duration is None and ti.start_date is not None:
+        duration = (ended_at - ti.start_date).total_seconds()
+    return {
+        'event': 'task_metrics',
+        'dag_id': ti.dag_id,
+        'task_id': ti.task_id,
+        'run_id': ti.run_id,
+        'try_number': ti.try_number,
+        'state': str(ti.state) if ti.state is not None else None,
+        'started_at': _isoformat(ti.start_date),
+        'ended_at': _isoformat(ended_at),
+        'duration_seconds': duration,
+        'metrics': metrics or {},
+    }
+
+
+def emit_task_event(event, path=TASK_EVENTS_PATH):
+    """
+    Log the event as one JSON line, and append it to the JSON Lines file at path if given
+    """
+    line = json.dumps(event, sort_keys=True, default=str)
+    logger.info(f"{TASK_EVENT_PREFIX}{line}")
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(line + '\n')
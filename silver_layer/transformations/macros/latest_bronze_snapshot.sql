@@ -0,0 +1,12 @@
+{#
+    Bronze tables are ingestion-time partitioned: every load of a changed source file
+    lands a full snapshot in that day's partition. Silver models read the latest one.
+#}
+{% macro latest_bronze_snapshot(table_name) %}
+    SELECT *
+    FROM {{ source('bronze', table_name) }}
+    WHERE _PARTITIONTIME = (
+        SELECT MAX(_PARTITIONTIME)
+        FROM {{ source('bronze', table_name) }}
+    )
+{% endmacro %}
@@ -1,39 +1,13 @@
 {{ config(
     materialized='table',
+    partition_by={'field': 'processed_at', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['client_name'],
     schema='gold'
 ) }}
 
-WITH contracts AS (
-    SELECT 
-        contract_id,
-        contract_name,
-        client_name,
-        start_date,
-        end_date,
-        contract_value,
-        contract_status,
-        DATE_DIFF(end_date, start_date, DAY) AS contract_duration_days
-    FROM {{ ref('contracts_silver') }}
-),
-
-budgets AS (
-    SELECT 
-        budget_id,
-        contract_id,
-        budget_name,
-        original_amount,
-        actual_cost
-    FROM {{ ref('budgets_silver') }}
-),
-
-change_orders AS (
-    SELECT 
-        change_order_id,
-        contract_id,
-        change_order_name,
-        change_order_type,
-        approved_amount
-    FROM {{ ref('change_orders_silver') }}
+WITH contract_rollup AS (
+    SELECT *
+    FROM {{ ref('contract_rollup') }}
 ),
 
 client_contracts AS (
@@ -49,38 +23,37 @@ client_contracts AS (
         COUNT(CASE WHEN contract_status = 'completed' THEN 1 END) AS completed_contracts,
         COUNT(CASE WHEN contract_status = 'pending' THEN 1 END) AS pending_contracts,
         COUNT(CASE WHEN contract_status = 'cancelled' THEN 1 END) AS cancelled_contracts
-    FROM contracts
+    FROM contract_rollup
     GROUP BY client_name
 ),
 
 client_budgets AS (
     SELECT
-        c.client_name,
-        COUNT(DISTINCT b.budget_id) AS total_budgets,
-        SUM(b.original_amount) AS total_budget_amount,
-        SUM(b.actual_cost) AS total_actual_cost,
-        SUM(b.actual_cost) - SUM(b.original_amount) AS total_budget_variance,
+        client_name,
+        -- Distinct IDs, as before the rollup: a duplicated budget or change order row is counted once
+        SUM(distinct_budget_count) AS total_budgets,
+        SUM(total_original_budget) AS total_budget_amount,
+        SUM(total_actual_cost) AS total_actual_cost,
+        SUM(total_actual_cost) - SUM(total_original_budget) AS total_budget_variance,
         CASE
-            WHEN SUM(b.original_amount) = 0 THEN 0
-            ELSE (SUM(b.actual_cost) / SUM(b.original_amount)) * 100
+            WHEN SUM(total_original_budget) = 0 THEN 0
+            ELSE (SUM(total_actual_cost) / SUM(total_original_budget)) * 100
         END AS budget_utilization_percentage
-    FROM contracts c
-    LEFT JOIN budgets b ON c.contract_id = b.contract_id
-    GROUP BY c.client_name
+    FROM contract_rollup
+    GROUP BY client_name
 ),
 
 client_change_orders AS (
     SELECT
-        c.client_name,
-        COUNT(DISTINCT co.change_order_id) AS total_change_orders,
-        SUM(co.approved_amount) AS total_change_order_amount,
+        client_name,
+        SUM(distinct_change_order_count) AS total_change_orders,
+        SUM(total_approved_amount) AS total_change_order_amount,
         CASE
-            WHEN SUM(c.contract_value) = 0 THEN 0
-            ELSE (SUM(co.approved_amount) / SUM(c.contract_value)) * 100
+            WHEN SUM(contract_value) = 0 THEN 0
+            ELSE (SUM(total_approved_amount) / SUM(contract_value)) * 100
         END AS change_order_percentage
-    FROM contracts c
-    LEFT JOIN change_orders co ON c.contract_id = co.contract_id
-    GROUP BY c.client_name
+    FROM contract_rollup
+    GROUP BY client_name
 )
 
 SELECT
@@ -1,19 +1,17 @@
 {{ config(
     materialized='table',
+    partition_by={'field': 'processed_at', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['client_name'],
     schema='gold'
 ) }}
 
 WITH contract_data AS (
     SELECT 
         contract_id,
-        contract_name,
         client_name,
-        start_date,
-        end_date,
         contract_value,
-        contract_status,
-        DATE_DIFF(end_date, start_date, DAY) AS contract_duration_days
-    FROM {{ ref('contracts_silver') }}
+        contract_duration_days
+    FROM {{ ref('contract_rollup') }}
 )
 
 SELECT
@@ -27,4 +25,4 @@ SELECT
     CURRENT_TIMESTAMP() AS processed_at
 FROM contract_data
 GROUP BY client_name
-ORDER BY total_contract_value DESC 
\ No newline at end of file
+ORDER BY total_contract_value DESC
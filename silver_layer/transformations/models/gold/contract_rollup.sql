@@ -0,0 +1,69 @@
+{{ config(
+    materialized='table',
+    cluster_by=['client_name', 'contract_id'],
+    schema='gold'
+) }}
+
+-- Per-contract rollup shared by the gold models. Each silver table is scanned once here and
+-- budgets and change orders are aggregated per contract before the join, so rows never fan out.
+
+WITH contracts AS (
+    SELECT 
+        contract_id,
+        contract_name,
+        client_name,
+        start_date,
+        end_date,
+        contract_value,
+        contract_status,
+        DATE_DIFF(end_date, start_date, DAY) AS contract_duration_days
+    FROM {{ ref('contracts_silver') }}
+),
+
+budget_summary AS (
+    SELECT
+        contract_id,
+        COUNT(*) AS budget_count,
+        COUNT(DISTINCT budget_id) AS distinct_budget_count,
+        SUM(original_amount) AS total_original_budget,
+        SUM(actual_cost) AS total_actual_cost
+    FROM {{ ref('budgets_silver') }}
+    GROUP BY contract_id
+),
+
+change_order_summary AS (
+    SELECT
+        contract_id,
+        COUNT(*) AS change_order_count,
+        COUNT(DISTINCT change_order_id) AS distinct_change_order_count,
+        SUM(estimated_amount) AS total_estimated_amount,
+        SUM(approved_amount) AS total_approved_amount,
+        SUM(committed_amount) AS total_committed_amount
+    FROM {{ ref('change_orders_silver') }}
+    GROUP BY contract_id
+)
+
+SELECT
+    c.contract_id,
+    c.contract_name,
+    c.client_name,
+    c.start_date,
+    c.end_date,
+    c.contract_value,
+    c.contract_status,
+    c.contract_duration_days,
+    -- Budget metrics (sums stay NULL for contracts without budgets)
+    COALESCE(bs.budget_count, 0) AS budget_count,
+    COALESCE(bs.distinct_budget_count, 0) AS distinct_budget_count,
+    bs.total_original_budget,
+    bs.total_actual_cost,
+    -- Change order metrics (sums stay NULL for contracts without change orders)
+    COALESCE(cos.change_order_count, 0) AS change_order_count,
+    COALESCE(cos.distinct_change_order_count, 0) AS distinct_change_order_count,
+    cos.total_estimated_amount,
+    cos.total_approved_amount,
+    cos.total_committed_amount,
+    CURRENT_TIMESTAMP() AS processed_at
+FROM contracts c
+LEFT JOIN budget_summary bs ON c.contract_id = bs.contract_id
+LEFT JOIN change_order_summary cos ON c.contract_id = cos.contract_id
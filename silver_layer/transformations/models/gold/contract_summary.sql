@@ -1,30 +1,26 @@
 {{ config(
     materialized = 'table',
+    partition_by = {'field': 'generated_at', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by = ['client_name'],
     schema = 'gold'
 ) }}
 
-WITH silver_contracts AS (
+WITH contract_rollup AS (
     SELECT *
-    FROM {{ ref('contracts_silver') }}
-),
-
-silver_budgets AS (
-    SELECT *
-    FROM {{ ref('budgets_silver') }}
+    FROM {{ ref('contract_rollup') }}
 ),
 
 contract_metrics AS (
     SELECT
-        c.client_name,
-        COUNT(DISTINCT c.contract_id) AS total_contracts,
-        SUM(c.contract_value) AS total_contract_value,
-        AVG(c.contract_value) AS avg_contract_value,
-        MIN(c.start_date) AS earliest_contract_date,
-        MAX(c.end_date) AS latest_contract_end_date,
-        SUM(b.original_amount) AS total_budget_allocated
-    FROM silver_contracts c
-    LEFT JOIN silver_budgets b ON c.contract_id = b.contract_id
-    GROUP BY c.client_name
+        client_name,
+        COUNT(DISTINCT contract_id) AS total_contracts,
+        SUM(contract_value) AS total_contract_value,
+        AVG(contract_value) AS avg_contract_value,
+        MIN(start_date) AS earliest_contract_date,
+        MAX(end_date) AS latest_contract_end_date,
+        SUM(total_original_budget) AS total_budget_allocated
+    FROM contract_rollup
+    GROUP BY client_name
 )
 
 SELECT
@@ -1,5 +1,6 @@
 {{ config(
     materialized='table',
+    partition_by={'field': 'month_start_date', 'data_type': 'date', 'granularity': 'month'},
     schema='gold'
 ) }}
 
@@ -110,6 +111,7 @@ date_spine AS (
 SELECT
     ds.year,
     ds.month,
+    DATE(ds.year, ds.month, 1) AS month_start_date,
     -- Contract metrics
     COALESCE(mc.new_contracts, 0) AS new_contracts,
     COALESCE(mc.new_contract_value, 0) AS new_contract_value,
@@ -1,5 +1,9 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key='budget_id',
+    partition_by={'field': 'processed_at', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['contract_id', 'budget_id'],
     schema='silver'
 ) }}
 
@@ -18,7 +22,7 @@ WITH source_budgets AS (
         SAFE_CAST(actualCost AS NUMERIC) AS actual_cost,
         SAFE_CAST(TRIM(createdAt) AS TIMESTAMP) AS created_at,
         SAFE_CAST(TRIM(updatedAt) AS TIMESTAMP) AS updated_at
-    FROM {{ source('bronze', 'budgets') }}
+    FROM ({{ latest_bronze_snapshot('budgets') }})
 )
 
 SELECT
@@ -36,4 +40,9 @@ SELECT
     created_at,
     updated_at,
     CURRENT_TIMESTAMP() AS processed_at
-FROM source_budgets 
\ No newline at end of file
+FROM source_budgets
+{% if is_incremental() %}
+-- Only merge rows updated since the current high-water mark (rows without a timestamp are always merged)
+WHERE updated_at > (SELECT MAX(updated_at) FROM {{ this }})
+   OR updated_at IS NULL
+{% endif %}
@@ -1,5 +1,9 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key='change_order_id',
+    partition_by={'field': 'processed_at', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['contract_id', 'change_order_id'],
     schema='silver'
 ) }}
 
@@ -19,7 +23,7 @@ WITH source_change_orders AS (
         SAFE_CAST(TRIM(createdAt) AS TIMESTAMP) AS created_at,
         SAFE_CAST(TRIM(updatedAt) AS TIMESTAMP) AS updated_at,
         SAFE_CAST(TRIM(statusChangedAt) AS TIMESTAMP) AS status_changed_at
-    FROM {{ source('bronze', 'co') }}
+    FROM ({{ latest_bronze_snapshot('co') }})
 )
 
 SELECT
@@ -38,4 +42,9 @@ SELECT
     updated_at,
     status_changed_at,
     CURRENT_TIMESTAMP() AS processed_at
-FROM source_change_orders 
\ No newline at end of file
+FROM source_change_orders
+{% if is_incremental() %}
+-- Only merge rows updated since the current high-water mark (rows without a timestamp are always merged)
+WHERE updated_at > (SELECT MAX(updated_at) FROM {{ this }})
+   OR updated_at IS NULL
+{% endif %}
@@ -1,8 +1,14 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key='contract_id',
+    partition_by={'field': 'processed_at', 'data_type': 'timestamp', 'granularity': 'day'},
+    cluster_by=['contract_id'],
     schema='silver'
 ) }}
 
+-- Bronze contracts have no updatedAt column, so every run merges the latest snapshot on contract_id
+
 WITH source_contracts AS (
     SELECT 
         contract_id,
@@ -12,7 +18,7 @@ WITH source_contracts AS (
         CAST(end_date AS DATE) AS end_date,
         CAST(contract_value AS NUMERIC) AS contract_value,
         contract_status
-    FROM {{ source('bronze', 'contracts') }}
+    FROM ({{ latest_bronze_snapshot('contracts') }})
 )
 
 SELECT
@@ -0,0 +1,464 @@
+"""
+End-to-end pipeline benchmarks.
+
+Generates synthetic bronze data at each scale and measures every medallion stage on it:
+
+- bronze parsing: CSV export to typed Parquet landing file, per bronze table
+- validation: each dataset registered in validate_data_quality.VALIDATION_SUITES, checked against
+  a benchmark suite built from the schema registry (benchmark_suite)
+- models: each silver and gold dbt model, rebuilt on the local DuckDB backend
+- monitoring: daily volumes and anomaly scoring over a metrics history, and the metrics store
+
+Every case runs in a fresh process, so its peak RSS is its own. Wall time, peak RSS and rows/sec
+are written to a results file and compared with a stored baseline; slower or larger cases beyond
+the tolerance are reported as regressions and make the run exit non-zero.
+
+    python tests/benchmarks/run_benchmarks.py --scales 10000,100000,1000000
+    python tests/benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(BENCHMARKS_DIR))
+DAGS_DIR = os.path.join(BASE_DIR, 'orchestration', 'airflow', 'dags')
+TESTS_DIR = os.path.join(BASE_DIR, 'tests')
+for path in (BASE_DIR, DAGS_DIR, TESTS_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+DEFAULT_SCALES = [10000, 100000, 1000000]
+WORK_DIR = os.path.join(BENCHMARKS_DIR, 'data')
+RESULTS_PATH = os.path.join(BENCHMARKS_DIR, 'results', 'latest.json')
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+# A case regresses when it is this much slower or larger than its baseline
+TIME_TOLERANCE = 0.25
+RSS_TOLERANCE = 0.25
+# Differences below these are noise, whatever the relative change
+MIN_SECONDS_DELTA = 0.05
+MIN_RSS_DELTA_MB = 10.0
+
+CASE_TIMEOUT_SECONDS = 3600
+
+# Metrics history shape for the monitoring cases: four runs a day over 120 days
+MONITORING_RUNS_PER_DAY = 4
+MONITORING_DAYS = 120
+
+# Validation suites, the generated file each one validates and the bronze table its
+# benchmark expectations are derived from
+SUITE_DATA = {
+    'bronze_contracts': 'contracts.csv',
+    'bronze_budgets': 'budgets.csv',
+    'silver_contracts': 'contracts_silver.csv',
+}
+SUITE_TABLES = {
+    'bronze_contracts': 'contracts',
+    'bronze_budgets': 'budgets',
+    'silver_contracts': 'contracts',
+}
+
+# Expected Great Expectations type per registry logical type (STRING otherwise)
+SUITE_EXPECTED_TYPES = {'amount': 'NUMERIC', 'integer': 'NUMERIC', 'date': 'DATE', 'timestamp': 'DATE'}
+
+
+def benchmark_suite(name, data_file):
+    """
+    Expectation suite for a generated dataset, so validation is timed without the project's
+    (uncommitted) Great Expectations suites: the column list, then per registry column a type
+    check, not-null and uniqueness on the table's ID, and value sets on known categories
+    """
+    import pandas as pd
+    from bronze.registry import schema_registry
+    from bronze.synthetic import CONTRACT_STATUSES
+
+    value_sets = {'contract_status': CONTRACT_STATUSES}
+    columns = pd.read_csv(data_file, nrows=0).columns.tolist()
+    registry = schema_registry()[SUITE_TABLES[name]]
+    expectations = [{'expectation_type': 'expect_table_columns_to_match_ordered_list',
+                     'kwargs': {'column_list': columns}}]
+    for position, column in enumerate(registry):
+        if column['name'] not in columns:
+            continue
+        kwargs = {'column': column['name']}
+        if position == 0:
+            expectations.append({'expectation_type': 'expect_column_values_to_not_be_null', 'kwargs': kwargs})
+            expectations.append({'expectation_type': 'expect_column_values_to_be_unique', 'kwargs': kwargs})
+        if column['name'] in value_sets:
+            expectations.append({'expectation_type': 'expect_column_values_to_be_in_set',
+                                 'kwargs': dict(kwargs, value_set=value_sets[column['name']])})
+        expectations.append({'expectation_type': 'expect_column_values_to_be_of_type',
+                             'kwargs': dict(kwargs, type_=SUITE_EXPECTED_TYPES.get(column['logical_type'], 'STRING'))})
+    return {'expectation_suite_name': f'benchmark.{name}', 'expectations': expectations}
+
+
+def _peak_rss_mb():
+    # On Linux ru_maxrss survives exec, so a spawned process would report its parent's peak;
+    # VmHWM is the peak of this process's own address space
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# Benchmark cases. Each runs in its own process, does its setup, times only the measured work
+# and returns {'rows', 'seconds'}, or {'skipped': reason} when the stage cannot run here.
+
+def bench_bronze_parse(table, csv_path, out_dir):
+    from bronze.landing import convert_csv_to_parquet
+    from bronze.schemas import BRONZE_TABLES
+
+    config = BRONZE_TABLES[table]
+    started = time.perf_counter()
+    stats = convert_csv_to_parquet(
+        csv_path,
+        os.path.join(out_dir, f'{table}.parquet'),
+        config['schema_fields'],
+        allow_quoted_newlines=config['allow_quoted_newlines'],
+        allow_jagged_rows=config['allow_jagged_rows'],
+    )
+    return {'rows': stats['rows'], 'seconds': time.perf_counter() - started}
+
+
+def bench_validation_suite(name, data_file, expectations_path, rows):
+    # Measure the parse and validation itself, never a cached table or result from an earlier run
+    os.environ['BRONZE_ARROW_CACHE_MAX_BYTES'] = '0'
+    import validate_data_quality
+
+    suite = validate_data_quality.VALIDATION_SUITES[name]
+    started = time.perf_counter()
+    result = validate_data_quality.validate_dataset(
+        data_file, expectations_path, suite['label'], suite['chunk_size'], suite['table'], cache_max_bytes=0,
+    )
+    seconds = time.perf_counter() - started
+    if result is None:
+        return {'error': f"validation of {data_file} did not produce a result"}
+    return {'rows': rows, 'seconds': seconds}
+
+
+def bench_model(database, model, rows):
+    from local_backend import DBT_DIR, connect, run_models
+
+    conn = connect(database)
+    try:
+        started = time.perf_counter()
+        run_models(conn, DBT_DIR, models=[model], full_refresh=True)
+        return {'rows': rows, 'seconds': time.perf_counter() - started}
+    finally:
+        conn.close()
+
+
+def metrics_history(rows, runs_per_day=MONITORING_RUNS_PER_DAY, days=MONITORING_DAYS, seed=0):
+    """
+    Synthetic metrics store history of about `rows` rows: growing row counts per table
+    with a weekly cycle and noise, recorded runs_per_day times a day
+    """
+    import numpy as np
+    import pandas as pd
+    from monitoring_store import metrics_frame
+
+    rng = np.random.default_rng(seed)
+    tables = max(1, rows // (runs_per_day * days))
+    run_at = pd.date_range(end=pd.Timestamp.utcnow().floor('D'), periods=runs_per_day * days, freq=f'{24 // runs_per_day}H')
+    run_at = run_at.tz_localize(None)
+    step = np.arange(len(run_at))
+    base = rng.lognormal(10, 1.5, tables)
+    counts = (
+        base[:, None] * (1 + step[None, :] * 0.001)
+        * (1 + 0.1 * np.sin(2 * np.pi * run_at.dayofweek.to_numpy()[None, :] / 7))
+        * rng.normal(1, 0.02, (tables, len(run_at)))
+    )
+    return metrics_frame({
+        'run_at': np.tile(run_at, tables),
+        'table_name': np.repeat([f'project.dataset.table_{i}' for i in range(tables)], len(run_at)),
+        'row_count': counts.astype('int64').ravel(),
+        'hours_since_update': rng.integers(0, 30, tables * len(run_at)),
+        'null_count': rng.integers(0, 10, tables * len(run_at)),
+        'size_bytes': (counts * 120).astype('int64').ravel(),
+        'collection_seconds': rng.random(tables * len(run_at)),
+    })
+
+
+def bench_volume_anomalies(rows):
+    from anomaly_detection import anomaly_alerts, score_history, volume_trends
+    from monitoring_store import daily_row_counts
+
+    history = metrics_history(rows)
+    since = history['run_at'].max().normalize() - datetime.timedelta(days=7)
+    started = time.perf_counter()
+    scored = score_history(daily_row_counts(history))
+    volume_trends(scored, since)
+    anomaly_alerts(scored, since)
+    return {'rows': len(history), 'seconds': time.perf_counter() - started}
+
+
+def bench_metrics_store(rows, path):
+    from monitoring_store import append_local_metrics, read_local_metrics
+
+    records = metrics_history(rows).to_dict(orient='records')
+    if os.path.exists(path):
+        os.remove(path)
+    started = time.perf_counter()
+    append_local_metrics(records, path)
+    read_local_metrics(MONITORING_DAYS + 1, path)
+    return {'rows': len(records), 'seconds': time.perf_counter() - started}
+
+
+BENCHMARKS = {
+    'bench_bronze_parse': bench_bronze_parse,
+    'bench_validation_suite': bench_validation_suite,
+    'bench_model': bench_model,
+    'bench_volume_anomalies': bench_volume_anomalies,
+    'bench_metrics_store': bench_metrics_store,
+}
+
+
+def _run_case(function_name, args, queue):
+    """
+    Child process entry point: run one case and report its outcome with the process's peak RSS
+    """
+    try:
+        outcome = BENCHMARKS[function_name](*args)
+    except Exception as e:
+        outcome = {'error': f"{type(e).__name__}: {e}"}
+    outcome['peak_rss_mb'] = _peak_rss_mb()
+    queue.put(outcome)
+
+
+def run_case(case, timeout=CASE_TIMEOUT_SECONDS):
+    """
+    Run a case ({'name', 'stage', 'scale', 'function', 'args'}) in a fresh process and
+    return its result record
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_case, args=(case['function'], case['args'], queue))
+    process.start()
+    try:
+        outcome = queue.get(timeout=timeout)
+    except Exception:
+        process.terminate()
+        outcome = {'error': f"no result within {timeout} seconds"}
+    process.join()
+
+    record = {'case': case['name'], 'stage': case['stage'], 'scale': case['scale']}
+    if 'error' in outcome or 'skipped' in outcome:
+        record['status'] = 'error' if 'error' in outcome else 'skipped'
+        record['detail'] = outcome.get('error') or outcome.get('skipped')
+        return record
+
+    record.update({
+        'status': 'ok',
+        'rows': outcome['rows'],
+        'seconds': round(outcome['seconds'], 4),
+        'rows_per_second': round(outcome['rows'] / outcome['seconds'], 1) if outcome['seconds'] > 0 else None,
+        'peak_rss_mb': round(outcome['peak_rss_mb'], 1),
+    })
+    return record
+
+
+def prepare_scale(scale, work_dir, seed=0):
+    """
+    Generate the bronze data for one scale, build the local database every model case
+    starts from, and return the cases to run
+    """
+    from bronze.synthetic import contracts_for_rows, generate_bronze
+    from dbt_lineage import scan_model_lineage
+    from local_backend import DBT_DIR, build_order, connect, load_bronze, run_models
+
+    scale_dir = os.path.join(work_dir, f'scale_{scale}')
+    bronze_dir = os.path.join(scale_dir, 'bronze')
+    if os.path.exists(scale_dir):
+        shutil.rmtree(scale_dir)
+    os.makedirs(scale_dir)
+
+    generated = generate_bronze(bronze_dir, contracts_for_rows(scale), seed=seed, formats=('csv',))
+    database = os.path.join(scale_dir, 'local.duckdb')
+    conn = connect(database)
+    try:
+        load_bronze(conn, {table: files['csv'] for table, files in generated['files'].items()})
+        models = run_models(conn, DBT_DIR, full_refresh=True)
+        silver_contracts = os.path.join(bronze_dir, SUITE_DATA['silver_contracts'])
+        conn.execute(f"COPY {models['contracts_silver']['relation']} TO '{silver_contracts}' (HEADER)")
+    finally:
+        conn.close()
+
+    # A model's rows are the rows it reads: its bronze sources and the models it refs
+    lineage = scan_model_lineage(DBT_DIR)
+    source_rows = {f'bronze.{table}': rows for table, rows in generated['rows'].items()}
+    input_rows = {
+        model: sum(source_rows[source] for source in lineage[model]['sources'])
+        + sum(models[ref]['rows'] for ref in lineage[model]['refs'])
+        for model in lineage
+    }
+    suite_rows = {
+        'bronze_contracts': generated['rows']['contracts'],
+        'bronze_budgets': generated['rows']['budgets'],
+        'silver_contracts': models['contracts_silver']['rows'],
+    }
+
+    cases = [
+        {'name': f'bronze_parse/{table}', 'stage': 'bronze_parse', 'scale': scale,
+         'function': 'bench_bronze_parse', 'args': (table, files['csv'], os.path.join(scale_dir, 'landing'))}
+        for table, files in generated['files'].items()
+    ]
+    suites_dir = os.path.join(scale_dir, 'expectations')
+    os.makedirs(suites_dir)
+    for name, data_file in SUITE_DATA.items():
+        with open(os.path.join(suites_dir, f'{name}.json'), 'w') as f:
+            json.dump(benchmark_suite(name, os.path.join(bronze_dir, data_file)), f, indent=2)
+    cases += [
+        {'name': f'validation/{name}', 'stage': 'validation', 'scale': scale,
+         'function': 'bench_validation_suite',
+         'args': (name, os.path.join(bronze_dir, data_file), os.path.join(suites_dir, f'{name}.json'), suite_rows[name])}
+        for name, data_file in SUITE_DATA.items()
+    ]
+    cases += [
+        {'name': f'model/{model}', 'stage': 'models', 'scale': scale,
+         'function': 'bench_model', 'args': (database, model, input_rows[model])}
+        for model in build_order(lineage)
+    ]
+    cases += [
+        {'name': 'monitoring/volume_anomalies', 'stage': 'monitoring', 'scale': scale,
+         'function': 'bench_volume_anomalies', 'args': (scale,)},
+        {'name': 'monitoring/metrics_store', 'stage': 'monitoring', 'scale': scale,
+         'function': 'bench_metrics_store', 'args': (scale, os.path.join(scale_dir, 'metrics.sqlite'))},
+    ]
+    return cases
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, work_dir=WORK_DIR, seed=0, stages=None):
+    """
+    Run every case at every scale and return the results document
+    """
+    results = []
+    for scale in scales:
+        print(f"Preparing scale {scale}...")
+        for case in prepare_scale(scale, work_dir, seed):
+            if stages and case['stage'] not in stages:
+                continue
+            record = run_case(case)
+            results.append(record)
+            print(format_record(record))
+    return {
+        'created_at': datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'commit': _git_commit(),
+        'machine': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        'seed': seed,
+        'scales': list(scales),
+        'results': results,
+    }
+
+
+def compare_to_baseline(results, baseline, time_tolerance=TIME_TOLERANCE, rss_tolerance=RSS_TOLERANCE):
+    """
+    Regressions of the results against the baseline: one dict per (case, scale, metric) that is
+    slower or uses more memory than its baseline by more than the tolerance and the noise floor
+    """
+    baseline_records = {
+        (record['case'], record['scale']): record
+        for record in baseline.get('results', [])
+        if record.get('status') == 'ok'
+    }
+    checks = [('seconds', time_tolerance, MIN_SECONDS_DELTA), ('peak_rss_mb', rss_tolerance, MIN_RSS_DELTA_MB)]
+    regressions = []
+    for record in results['results']:
+        previous = baseline_records.get((record['case'], record['scale']))
+        if previous is None or record.get('status') != 'ok':
+            continue
+        for metric, tolerance, min_delta in checks:
+            value, base = record[metric], previous[metric]
+            if value > base * (1 + tolerance) and value - base > min_delta:
+                regressions.append({
+                    'case': record['case'],
+                    'scale': record['scale'],
+                    'metric': metric,
+                    'baseline': base,
+                    'value': value,
+                    'change_pct': round((value - base) / base * 100, 1) if base else None,
+                })
+    return regressions
+
+
+def format_record(record):
+    label = f"{record['case']} @ {record['scale']}"
+    if record['status'] != 'ok':
+        return f"{label:<50} {record['status'].upper()}: {record['detail']}"
+    rate = f"{record['rows_per_second']:,.0f} rows/s" if record['rows_per_second'] else '-'
+    return f"{label:<50} {record['seconds']:>9.3f}s {record['peak_rss_mb']:>9.1f} MB  {rate}"
+
+
+def _write_json(path, document):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the medallion pipeline stages at several data scales')
+    parser.add_argument('--scales', default=','.join(str(scale) for scale in DEFAULT_SCALES),
+                        help='Comma-separated approximate bronze row counts')
+    parser.add_argument('--stages', help='Comma-separated stages to run (bronze_parse, validation, models, monitoring)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--work-dir', default=WORK_DIR, help='Directory for the generated data')
+    parser.add_argument('--results', default=RESULTS_PATH, help='Results file to write')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline results to compare with')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline')
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    stages = set(args.stages.split(',')) if args.stages else None
+    results = run_benchmarks(scales, args.work_dir, args.seed, stages)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare_to_baseline(results, json.load(f))
+    results['regressions'] = regressions
+    _write_json(args.results, results)
+    print(f"Results written to {args.results}")
+
+    if args.update_baseline:
+        _write_json(args.baseline, results)
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['case']} @ {regression['scale']}: {regression['metric']} "
+            f"{regression['baseline']} -> {regression['value']} (+{regression['change_pct']}%)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
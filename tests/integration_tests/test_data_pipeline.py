@@ -6,9 +6,11 @@ import pytest
 # Add parent directory to path to import validate_data_quality
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from validate_data_quality import (
+    ARROW_CACHE_DIR,
     validate_bronze_layer,
     validate_silver_layer
 )
+from bronze.arrow_cache import read_cached_bronze
 
 def test_bronze_to_silver_pipeline():
     """
@@ -33,8 +35,9 @@ def test_bronze_to_silver_pipeline():
     
     # Step 3: Verify specific transformations
     # Load bronze and silver data
-    bronze_contracts = pd.read_csv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 
-                                  'bronze', 'data', 'sample_contracts.csv'))
+    bronze_contracts = read_cached_bronze(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 
+                                          'bronze', 'data', 'sample_contracts.csv'), 'contracts',
+                                          cache_dir=ARROW_CACHE_DIR)
     
     silver_contracts = pd.read_csv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 
                                   'silver_layer', 'data', 'contracts_silver.csv'))
@@ -42,17 +42,25 @@ class TestAirflowDags(unittest.TestCase):
             'create_bronze_dataset',
             'create_silver_dataset',
             'create_gold_dataset',
+            'detect_bronze_changes',
+            'convert_contracts_to_parquet',
+            'convert_budgets_to_parquet',
+            'convert_co_to_parquet',
             'upload_contracts_to_gcs',
             'upload_budgets_to_gcs',
             'upload_co_to_gcs',
             'load_contracts_to_bq',
             'load_budgets_to_bq',
             'load_co_to_bq',
-            'run_dbt_models',
-            'validate_silver_contracts',
-            'validate_silver_budgets',
-            'validate_silver_change_orders',
-            'validate_gold_project_analytics'
+            'run_dbt_models.plan_dbt_run',
+            'run_dbt_models.contracts_silver',
+            'run_dbt_models.budgets_silver',
+            'run_dbt_models.change_orders_silver',
+            'run_dbt_models.contract_rollup',
+            'run_dbt_models.record_dbt_run',
+            'update_bronze_manifest',
+            'generate_dbt_docs',
+            'validate_data_quality'
         ]
         
         for task_id in expected_tasks:
@@ -67,6 +75,41 @@ class TestAirflowDags(unittest.TestCase):
                 f"create_bronze_dataset should be upstream of {task_id}"
             )
         
+        # Change detection should gate the conversion tasks and dbt
+        for task_id in ['convert_contracts_to_parquet', 'convert_budgets_to_parquet', 'convert_co_to_parquet', 'run_dbt_models.plan_dbt_run']:
+            self.assertIn(
+                'detect_bronze_changes',
+                [task.task_id for task in dag.get_task(task_id).upstream_list],
+                f"detect_bronze_changes should be upstream of {task_id}"
+            )
+        
+        # The manifest should only be updated after dbt succeeds
+        self.assertIn(
+            'run_dbt_models.record_dbt_run',
+            [task.task_id for task in dag.get_task('update_bronze_manifest').upstream_list],
+            "run_dbt_models.record_dbt_run should be upstream of update_bronze_manifest"
+        )
+        
+        # Docs generation should run after dbt without blocking the validations
+        self.assertIn(
+            'run_dbt_models.record_dbt_run',
+            [task.task_id for task in dag.get_task('generate_dbt_docs').upstream_list],
+            "run_dbt_models.record_dbt_run should be upstream of generate_dbt_docs"
+        )
+        self.assertEqual(
+            [],
+            dag.get_task('generate_dbt_docs').downstream_list,
+            "generate_dbt_docs should not block downstream tasks"
+        )
+        
+        # Parquet conversion tasks should be upstream of upload tasks
+        for table in ['contracts', 'budgets', 'co']:
+            self.assertIn(
+                f'convert_{table}_to_parquet',
+                [task.task_id for task in dag.get_task(f'upload_{table}_to_gcs').upstream_list],
+                f"convert_{table}_to_parquet should be upstream of upload_{table}_to_gcs"
+            )
+        
         # Upload tasks should be upstream of load tasks
         self.assertIn(
             'upload_contracts_to_gcs',
@@ -86,29 +129,36 @@ class TestAirflowDags(unittest.TestCase):
             "upload_co_to_gcs should be upstream of load_co_to_bq"
         )
         
-        # Load tasks should be upstream of run_dbt_models
+        # Load tasks should be upstream of the dbt run plan
         for task_id in ['load_contracts_to_bq', 'load_budgets_to_bq', 'load_co_to_bq']:
             self.assertIn(
                 task_id,
-                [task.task_id for task in dag.get_task('run_dbt_models').upstream_list],
-                f"{task_id} should be upstream of run_dbt_models"
+                [task.task_id for task in dag.get_task('run_dbt_models.plan_dbt_run').upstream_list],
+                f"{task_id} should be upstream of run_dbt_models.plan_dbt_run"
             )
         
-        # Silver and gold dataset creation should be upstream of run_dbt_models
+        # Silver and gold dataset creation should be upstream of the dbt run plan
         for task_id in ['create_silver_dataset', 'create_gold_dataset']:
             self.assertIn(
                 task_id,
-                [task.task_id for task in dag.get_task('run_dbt_models').upstream_list],
-                f"{task_id} should be upstream of run_dbt_models"
+                [task.task_id for task in dag.get_task('run_dbt_models.plan_dbt_run').upstream_list],
+                f"{task_id} should be upstream of run_dbt_models.plan_dbt_run"
             )
         
-        # run_dbt_models should be upstream of validation tasks
-        for task_id in ['validate_silver_contracts', 'validate_silver_budgets', 'validate_silver_change_orders', 'validate_gold_project_analytics']:
+        # dbt model tasks should follow the ref() lineage
+        for model in ['contracts_silver', 'budgets_silver', 'change_orders_silver']:
             self.assertIn(
-                'run_dbt_models',
-                [task.task_id for task in dag.get_task(task_id).upstream_list],
-                f"run_dbt_models should be upstream of {task_id}"
+                f'run_dbt_models.{model}',
+                [task.task_id for task in dag.get_task('run_dbt_models.contract_rollup').upstream_list],
+                f"run_dbt_models.{model} should be upstream of run_dbt_models.contract_rollup"
             )
+        
+        # The batched data quality checks should run once every model is built
+        self.assertIn(
+            'run_dbt_models.record_dbt_run',
+            [task.task_id for task in dag.get_task('validate_data_quality').upstream_list],
+            "run_dbt_models.record_dbt_run should be upstream of validate_data_quality"
+        )
     
     def test_medallion_monitoring_dag_structure(self):
         """Test the structure of the medallion_monitoring DAG."""
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the DAGs folder to the Python path to import the anomaly detection helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from anomaly_detection import anomaly_alerts, score_history, volume_trends
+from monitoring_store import daily_row_counts, metrics_frame
+
+@pytest.fixture
+def daily_history():
+    """Six weeks of daily counts: a noisy steady table with one spike, and a table with a Monday peak."""
+    rng = np.random.default_rng(42)
+    dates = pd.date_range('2025-01-01', periods=42, freq='D')
+    rows = []
+    for i, date in enumerate(dates):
+        steady = 1000 + rng.normal(0, 10)
+        if i == 38:
+            steady = 2000
+        weekly = 500 + rng.normal(0, 5) + (200 if date.weekday() == 0 else 0)
+        rows.append(('steady', date, int(steady)))
+        rows.append(('weekly', date, int(weekly)))
+    # Shuffled input must give the same result
+    return pd.DataFrame(rows, columns=['table_name', 'process_date', 'daily_count']).sample(frac=1, random_state=0)
+
+def test_only_the_spike_is_flagged(daily_history):
+    scored = score_history(daily_history)
+
+    assert len(scored) == len(daily_history)
+    flagged = scored[scored['is_anomaly'] & (scored['process_date'] >= '2025-01-22')]
+    assert list(zip(flagged['table_name'], flagged['process_date'].dt.strftime('%Y-%m-%d'))) == [('steady', '2025-02-08')]
+
+def test_weekly_cycle_is_flagged_without_the_seasonal_baseline(daily_history):
+    scored = score_history(daily_history, method='robust')
+    flagged = scored[scored['is_anomaly'] & (scored['table_name'] == 'weekly')]
+    assert (flagged['process_date'].dt.weekday == 0).all()
+    assert len(flagged) >= 4
+
+def test_short_or_flat_history_is_not_flagged():
+    history = pd.DataFrame({
+        'table_name': 'flat',
+        'process_date': pd.date_range('2025-01-01', periods=10, freq='D'),
+        'daily_count': [5] * 9 + [6],
+    })
+    scored = score_history(history)
+    assert not scored['is_anomaly'].any()
+    # No baseline until MIN_PERIODS earlier days exist
+    assert scored['z_score'].iloc[:5].isnull().all()
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        score_history(pd.DataFrame(columns=['table_name', 'process_date', 'daily_count']), method='prophet')
+
+def test_trends_and_alerts_are_json_friendly(daily_history):
+    scored = score_history(daily_history)
+    trends = volume_trends(scored, since='2025-02-05')
+    alerts = anomaly_alerts(scored, since='2025-02-05')
+
+    assert sorted(trends) == ['steady', 'weekly']
+    assert [day['process_date'] for day in trends['steady']][:2] == ['2025-02-05', '2025-02-06']
+    assert [(alert['table'], alert['date']) for alert in alerts] == [('steady', '2025-02-08')]
+    assert alerts[0]['value'] == 2000
+    json.dumps(trends)
+    json.dumps(alerts)
+
+def test_empty_history():
+    scored = score_history(pd.DataFrame({
+        'table_name': pd.Series(dtype=object),
+        'process_date': pd.Series(dtype='datetime64[ns]'),
+        'daily_count': pd.Series(dtype='int64'),
+    }))
+    assert volume_trends(scored) == {}
+    assert anomaly_alerts(scored) == []
+
+def test_history_with_gap_days_from_the_store():
+    """Store frames have nullable Int64 counts, so a missed day or new table pivots to pd.NA."""
+    records = []
+    for i, run_at in enumerate(pd.date_range('2025-01-01 06:00', periods=20, freq='D')):
+        if i != 12:
+            records.append({'run_at': run_at.isoformat(), 'table_name': 'steady', 'row_count': 1000 + i})
+        if i >= 15:
+            records.append({'run_at': run_at.isoformat(), 'table_name': 'new_table', 'row_count': 50})
+    daily = daily_row_counts(metrics_frame(records))
+    assert str(daily['daily_count'].dtype) == 'Int64'
+
+    scored = score_history(daily)
+    assert len(scored) == len(daily)
+    assert not scored['is_anomaly'].any()
+    assert sorted(volume_trends(scored)) == ['new_table', 'steady']
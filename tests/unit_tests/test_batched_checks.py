@@ -0,0 +1,55 @@
+import os
+import sys
+import pytest
+
+# Add the DAGs folder to the Python path to import the batched check helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from batched_checks import (
+    compile_batched_check_sql,
+    evaluate_check_results,
+    format_failed_assertions,
+    qualify_assertions
+)
+
+@pytest.fixture
+def assertions():
+    return [
+        {'name': 'contracts_id_not_null', 'table': 'p.silver.contracts_silver', 'condition': 'contract_id IS NULL'},
+        {'name': 'contracts_value_positive', 'table': 'p.silver.contracts_silver', 'condition': 'contract_value <= 0'},
+        {'name': 'budgets_id_not_null', 'table': 'p.silver.budgets_silver', 'condition': 'budget_id IS NULL'},
+    ]
+
+def test_compile_scans_each_table_once(assertions):
+    sql = compile_batched_check_sql(assertions)
+    assert sql.count('FROM `p.silver.contracts_silver`') == 1
+    assert sql.count('FROM `p.silver.budgets_silver`') == 1
+    assert sql.count('UNION ALL') == 1
+    assert "STRUCT('contracts_value_positive' AS assertion_name, COUNTIF(contract_value <= 0) AS failing_rows)" in sql
+
+def test_compile_requires_assertions():
+    with pytest.raises(ValueError):
+        compile_batched_check_sql([])
+
+def test_evaluate_and_report_failures(assertions):
+    rows = [
+        ('contracts_id_not_null', 'p.silver.contracts_silver', 0),
+        ('contracts_value_positive', 'p.silver.contracts_silver', 3),
+    ]
+    results = evaluate_check_results(assertions, rows)
+
+    assert [result['success'] for result in results] == [True, False, False]
+    assert format_failed_assertions(results).splitlines() == [
+        'contracts_value_positive on p.silver.contracts_silver: 3 rows where contract_value <= 0',
+        'budgets_id_not_null on p.silver.budgets_silver: no result returned',
+    ]
+
+def test_all_passing_reports_nothing(assertions):
+    rows = [(assertion['name'], assertion['table'], 0) for assertion in assertions]
+    assert format_failed_assertions(evaluate_check_results(assertions, rows)) == ''
+
+def test_qualify_assertions():
+    assertions = [{'name': 'budgets_id_not_null', 'table': 'silver.budgets_silver', 'condition': 'budget_id IS NULL'}]
+    qualified = qualify_assertions(assertions, {'silver': 'p.medallion_silver'})
+
+    assert qualified[0]['table'] == 'p.medallion_silver.budgets_silver'
+    assert assertions[0]['table'] == 'silver.budgets_silver'
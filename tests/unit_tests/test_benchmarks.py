@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+
+# Add the benchmarks folder to the Python path to import the benchmark runner
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
+from run_benchmarks import benchmark_suite, compare_to_baseline, metrics_history, run_case
+
+def _results(*records):
+    return {'results': [
+        {'case': case, 'scale': 1000, 'status': 'ok', 'seconds': seconds, 'peak_rss_mb': rss}
+        for case, seconds, rss in records
+    ]}
+
+def test_compare_flags_slower_and_larger_cases():
+    baseline = _results(('model/a', 1.0, 100.0), ('model/b', 1.0, 100.0), ('model/c', 0.01, 100.0))
+    results = _results(('model/a', 1.5, 100.0), ('model/b', 1.1, 200.0), ('model/c', 0.04, 105.0), ('model/new', 9.0, 900.0))
+    regressions = compare_to_baseline(results, baseline)
+
+    assert [(r['case'], r['metric']) for r in regressions] == [('model/a', 'seconds'), ('model/b', 'peak_rss_mb')]
+    assert regressions[0]['change_pct'] == 50.0
+
+def test_compare_ignores_cases_that_did_not_run():
+    baseline = _results(('model/a', 1.0, 100.0))
+    results = {'results': [{'case': 'model/a', 'scale': 1000, 'status': 'skipped', 'detail': 'no suite'}]}
+    assert compare_to_baseline(results, baseline) == []
+
+def test_metrics_history_size():
+    history = metrics_history(4800)
+    assert len(history) == 4800
+    assert history['table_name'].nunique() == 10
+
+def test_run_case_in_fresh_process(tmp_path):
+    csv_path = tmp_path / 'contracts.csv'
+    csv_path.write_text(
+        "contract_id,contract_name,client_name,start_date,end_date,contract_value,contract_status\n"
+        "CONT-001,Office Renovation,Acme Corp,2023-01-01,2023-12-31,150000,executed\n"
+    )
+    record = run_case({
+        'name': 'bronze_parse/contracts', 'stage': 'bronze_parse', 'scale': 1,
+        'function': 'bench_bronze_parse', 'args': ('contracts', str(csv_path), str(tmp_path / 'landing')),
+    })
+
+    assert record['status'] == 'ok'
+    assert record['rows'] == 1
+    assert record['seconds'] > 0 and record['peak_rss_mb'] > 0
+
+def test_validation_case_runs_a_benchmark_suite(tmp_path):
+    csv_path = tmp_path / 'contracts.csv'
+    csv_path.write_text(
+        "contract_id,contract_name,client_name,start_date,end_date,contract_value,contract_status\n"
+        "CONT-001,Office Renovation,Acme Corp,2023-01-01,2023-12-31,150000,executed\n"
+        "CONT-002,Road Survey,Acme Corp,2023-02-01,2023-10-31,75000,active\n"
+    )
+    suite = benchmark_suite('bronze_contracts', str(csv_path))
+    types = {e['kwargs']['column']: e['kwargs']['type_'] for e in suite['expectations']
+             if e['expectation_type'] == 'expect_column_values_to_be_of_type'}
+    assert (types['contract_value'], types['start_date'], types['contract_id']) == ('NUMERIC', 'DATE', 'STRING')
+    suite_path = tmp_path / 'suite.json'
+    suite_path.write_text(json.dumps(suite))
+
+    record = run_case({
+        'name': 'validation/bronze_contracts', 'stage': 'validation', 'scale': 1,
+        'function': 'bench_validation_suite', 'args': ('bronze_contracts', str(csv_path), str(suite_path), 2),
+    })
+    assert record['status'] == 'ok'
+    assert record['rows'] == 2
@@ -0,0 +1,58 @@
+import os
+import sys
+import pytest
+
+# Add the DAGs folder to the Python path to import the BigQuery compatibility layer
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from bigquery_compat import translate_sql
+from batched_checks import compile_batched_check_sql
+
+def test_casts_and_date_functions():
+    sql = translate_sql(
+        "SELECT SAFE_CAST(TRIM(createdAt) AS TIMESTAMP) AS created_at, CAST(amount AS NUMERIC) AS amount, "
+        "DATE_DIFF(end_date, start_date, DAY) AS days, DATE(year, month, 1) AS month_start_date, "
+        "TIMESTAMP_DIFF(CURRENT_TIMESTAMP(), TIMESTAMP_MILLIS(last_modified_time), HOUR) AS hours"
+    )
+    assert sql == (
+        "SELECT TRY_CAST(TRIM(createdAt) AS TIMESTAMP) AS created_at, CAST(amount AS DECIMAL(38, 9)) AS amount, "
+        "date_diff('day', start_date, end_date) AS days, make_date(year, month, 1) AS month_start_date, "
+        "date_diff('hour', epoch_ms(last_modified_time), CURRENT_TIMESTAMP) AS hours"
+    )
+
+def test_generate_array_unnest():
+    sql = translate_sql(
+        "FROM UNNEST(GENERATE_ARRAY(EXTRACT(YEAR FROM DATE_SUB(CURRENT_DATE(), INTERVAL 3 YEAR)), 2025)) AS year\n"
+        "CROSS JOIN UNNEST(GENERATE_ARRAY(1, 12)) AS month"
+    )
+    assert sql == (
+        "FROM UNNEST(generate_series(EXTRACT(YEAR FROM (CURRENT_DATE - INTERVAL 3 YEAR)), 2025)) AS year(year)\n"
+        "CROSS JOIN UNNEST(generate_series(1, 12)) AS month(month)"
+    )
+
+def test_literals_and_comments_are_not_rewritten():
+    sql = "SELECT 'SAFE_CAST(x AS DATE), y' AS s -- DATE_DIFF(a, b, DAY)\nFROM t"
+    assert translate_sql(sql) == sql
+
+def test_batched_checks_translate():
+    sql = translate_sql(compile_batched_check_sql([
+        {'name': 'id_not_null', 'table': 'p.silver.contracts_silver', 'condition': "status IN ('a, b') OR id IS NULL"},
+    ]))
+    assert "struct_pack(assertion_name := 'id_not_null', failing_rows := count_if(status IN ('a, b') OR id IS NULL))" in sql
+    assert 'FROM "silver"."contracts_silver"' in sql
+    assert 'UNNEST(results) AS result(result)' in sql
+
+def test_translated_sql_runs_on_duckdb():
+    duckdb = pytest.importorskip('duckdb')
+    sql = translate_sql(
+        "SELECT year, month, DATE(year, month, 1) AS month_start_date, "
+        "DATE_DIFF(DATE(year, month, 1), SAFE_CAST('2024-01-01' AS DATE), DAY) AS days, "
+        "SAFE_CAST('not a number' AS NUMERIC) AS amount\n"
+        "FROM UNNEST(GENERATE_ARRAY(2024, 2025)) AS year\n"
+        "CROSS JOIN UNNEST(GENERATE_ARRAY(1, 12)) AS month\n"
+        "ORDER BY year, month"
+    )
+    rows = duckdb.connect().execute(sql).fetchall()
+
+    assert len(rows) == 24
+    assert rows[1][:2] == (2024, 2) and rows[1][3] == 31
+    assert rows[0][4] is None
@@ -0,0 +1,87 @@
+import os
+import sys
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+# Add the repository root to the Python path to import the bronze package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from bronze.arrow_cache import arrow_cache_path, open_arrow_cache, read_cached_bronze
+from bronze.registry import read_bronze_csv
+from bronze.synthetic import generate_bronze
+
+@pytest.fixture
+def contracts_path(tmp_path):
+    generate_bronze(str(tmp_path / 'bronze'), contracts=500, seed=3, formats=('csv',))
+    return str(tmp_path / 'bronze' / 'contracts.csv')
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'cache')
+
+def test_cached_read_matches_csv(contracts_path, cache_dir):
+    parsed = read_bronze_csv(contracts_path, 'contracts')
+    first = read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)
+    assert os.path.exists(arrow_cache_path(contracts_path, cache_dir))
+    # Nothing is written next to the source
+    assert not [name for name in os.listdir(os.path.dirname(contracts_path)) if not name.endswith('.csv')]
+    cached = read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)
+
+    for frame in (first, cached):
+        assert frame.dtypes.astype(str).to_dict() == parsed.dtypes.astype(str).to_dict()
+        assert frame.astype(object).equals(parsed.astype(object))
+
+def test_cache_is_memory_mapped(contracts_path, cache_dir):
+    read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)
+    allocated = pa.total_allocated_bytes()
+    arrow_table = open_arrow_cache(contracts_path, 'contracts', cache_dir)
+
+    assert arrow_table.num_rows == 500
+    assert pa.total_allocated_bytes() == allocated
+    frame = read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)
+    assert type(frame['contract_id'].array).__name__ == 'ArrowStringArray'
+
+def test_changed_source_invalidates_cache(contracts_path, cache_dir):
+    read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)
+    # Touching the file without changing it keeps the cache
+    os.utime(contracts_path, (0, 0))
+    assert open_arrow_cache(contracts_path, 'contracts', cache_dir) is not None
+
+    frame = pd.read_csv(contracts_path).head(10)
+    frame.to_csv(contracts_path, index=False)
+    assert open_arrow_cache(contracts_path, 'contracts', cache_dir) is None
+    assert len(read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)) == 10
+    assert open_arrow_cache(contracts_path, 'contracts', cache_dir).num_rows == 10
+
+def test_chunked_cached_read_matches_csv(contracts_path, cache_dir):
+    read_cached_bronze(contracts_path, 'contracts', cache_dir=cache_dir)
+    chunks = list(read_cached_bronze(contracts_path, 'contracts', chunksize=200, cache_dir=cache_dir))
+    csv_chunks = list(read_bronze_csv(contracts_path, 'contracts', chunksize=200))
+
+    assert [len(chunk) for chunk in chunks] == [200, 200, 100]
+    assert [chunk.index[0] for chunk in chunks] == [chunk.index[0] for chunk in csv_chunks]
+    assert pd.concat(chunks).astype(object).equals(pd.concat(csv_chunks).astype(object))
+
+def test_large_files_are_not_cached(contracts_path, cache_dir):
+    frame = read_cached_bronze(contracts_path, 'contracts', max_bytes=1, cache_dir=cache_dir)
+    assert len(frame) == 500
+    assert not os.path.exists(arrow_cache_path(contracts_path, cache_dir))
+
+def test_unwritable_cache_dir_falls_back_to_parsing(contracts_path, tmp_path):
+    # A file where the cache directory should be makes every cache write fail
+    blocked = tmp_path / 'blocked'
+    blocked.write_text('')
+    whole = read_cached_bronze(contracts_path, 'contracts', cache_dir=str(blocked))
+    chunks = list(read_cached_bronze(contracts_path, 'contracts', chunksize=200, cache_dir=str(blocked)))
+
+    assert whole.astype(object).equals(read_bronze_csv(contracts_path, 'contracts').astype(object))
+    assert [len(chunk) for chunk in chunks] == [200, 200, 100]
+
+def test_cache_is_keyed_by_source_path(tmp_path, cache_dir):
+    paths = []
+    for name in ('a', 'b'):
+        generate_bronze(str(tmp_path / name), contracts=50 if name == 'a' else 80, seed=4, formats=('csv',))
+        paths.append(str(tmp_path / name / 'contracts.csv'))
+    assert arrow_cache_path(paths[0], cache_dir) != arrow_cache_path(paths[1], cache_dir)
+    assert [len(read_cached_bronze(path, 'contracts', cache_dir=cache_dir)) for path in paths] == [50, 80]
+    assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,70 @@
+import os
+import sys
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add the project root to the Python path to import the bronze package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from bronze.landing import arrow_schema, convert_csv_to_parquet
+from bronze.schemas import BRONZE_TABLES
+
+CONTRACTS_CSV = """contract_id,contract_name,client_name,start_date,end_date,contract_value,contract_status
+CONT-001,Office Renovation,Acme Corp,2023-01-01,2023-12-31,150000,executed
+CONT-002,IT Infrastructure Upgrade,,2023-02-15,2023-08-15,75000.50,approved
+CONT-003,Marketing Campaign,Global Marketing,2023-03-10,2023-06-30,45000,pending
+"""
+
+CO_CSV = """id,number,name,scope,type,contractId,estimated,proposed,submitted,approved,committed,createdAt,updatedAt,statusChangedAt
+CO001,0001,"Change Order 1
+second line",in,Schedule Of Rates,CONT-001,10000,10000,10000,10000,10000,2024-01-15,2024-01-20,2024-01-25
+CO002,0002,Change Order 2,out
+"""
+
+@pytest.fixture
+def contracts_csv(tmp_path):
+    path = tmp_path / 'contracts.csv'
+    path.write_text(CONTRACTS_CSV)
+    return str(path)
+
+@pytest.fixture
+def co_csv(tmp_path):
+    path = tmp_path / 'co.csv'
+    path.write_text(CO_CSV)
+    return str(path)
+
+def test_arrow_schema_maps_bigquery_types():
+    schema = arrow_schema(BRONZE_TABLES['contracts']['schema_fields'])
+    assert schema.field('contract_id').type == pa.string()
+    assert schema.field('contract_id').nullable == False
+    assert schema.field('start_date').type == pa.date32()
+    assert schema.field('contract_value').type == pa.decimal128(38, 9)
+
+def test_convert_contracts_to_typed_parquet(contracts_csv, tmp_path):
+    parquet_path = str(tmp_path / 'landing' / 'contracts.parquet')
+    stats = convert_csv_to_parquet(contracts_csv, parquet_path, BRONZE_TABLES['contracts']['schema_fields'], row_group_size=2)
+    
+    table = pq.read_table(parquet_path)
+    assert stats['rows'] == 3
+    assert stats['row_groups'] == 2
+    assert table.schema == arrow_schema(BRONZE_TABLES['contracts']['schema_fields'])
+    # Empty CSV fields load as NULL, as they did with the BigQuery CSV load
+    assert table.column('client_name').to_pylist()[1] is None
+    assert not os.path.exists(parquet_path + '.tmp')
+
+def test_convert_pads_jagged_rows_and_keeps_quoted_newlines(co_csv, tmp_path):
+    parquet_path = str(tmp_path / 'co.parquet')
+    stats = convert_csv_to_parquet(co_csv, parquet_path, BRONZE_TABLES['co']['schema_fields'],
+                                   allow_quoted_newlines=True, allow_jagged_rows=True)
+    
+    rows = pq.read_table(parquet_path).to_pylist()
+    assert stats['jagged_rows'] == 1
+    assert rows[0]['name'] == 'Change Order 1\nsecond line'
+    assert rows[1]['id'] == 'CO002'
+    assert rows[1]['statusChangedAt'] is None
+
+def test_convert_rejects_jagged_rows_when_not_allowed(co_csv, tmp_path):
+    with pytest.raises(pa.ArrowInvalid):
+        convert_csv_to_parquet(co_csv, str(tmp_path / 'co.parquet'), BRONZE_TABLES['co']['schema_fields'],
+                               allow_quoted_newlines=True)
+    assert not os.path.exists(str(tmp_path / 'co.parquet.tmp'))
@@ -0,0 +1,65 @@
+import datetime
+import os
+import sys
+import pytest
+
+# Add the project root to the Python path to import the bronze package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+import bronze.manifest as manifest
+from bronze.manifest import (
+    detect_changed_tables,
+    fingerprint_file,
+    load_manifest,
+    record_loaded_tables
+)
+
+@pytest.fixture
+def bronze_sources(tmp_path, monkeypatch):
+    """Point the manifest at temporary contracts and budgets source files."""
+    sources = {
+        'contracts': tmp_path / 'contracts.csv',
+        'budgets': tmp_path / 'budgets.csv',
+    }
+    sources['contracts'].write_text("contract_id\nCONT-001\n")
+    sources['budgets'].write_text("id\nB001\n")
+    monkeypatch.setattr(manifest, 'source_path', lambda table: str(sources[table]))
+    return sources
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / 'landing' / 'manifest.json')
+
+def test_all_tables_changed_without_manifest(bronze_sources, manifest_path):
+    changed = detect_changed_tables(['contracts', 'budgets'], manifest_path)
+    assert set(changed) == {'contracts', 'budgets'}
+    assert changed['contracts']['size'] == os.path.getsize(bronze_sources['contracts'])
+
+def test_unchanged_tables_are_skipped_after_recording(bronze_sources, manifest_path):
+    record_loaded_tables(detect_changed_tables(['contracts', 'budgets'], manifest_path), manifest_path)
+    assert detect_changed_tables(['contracts', 'budgets'], manifest_path) == {}
+    assert 'loaded_at' in load_manifest(manifest_path)['contracts']
+
+def test_modified_table_is_detected(bronze_sources, manifest_path):
+    record_loaded_tables(detect_changed_tables(['contracts', 'budgets'], manifest_path), manifest_path)
+    bronze_sources['budgets'].write_text("id\nB001\nB002\n")
+    assert list(detect_changed_tables(['contracts', 'budgets'], manifest_path)) == ['budgets']
+
+def test_touched_file_with_same_content_is_unchanged(bronze_sources, manifest_path):
+    record_loaded_tables(detect_changed_tables(['contracts', 'budgets'], manifest_path), manifest_path)
+    stat = os.stat(bronze_sources['contracts'])
+    os.utime(bronze_sources['contracts'], (stat.st_atime, stat.st_mtime + 60))
+    assert detect_changed_tables(['contracts', 'budgets'], manifest_path) == {}
+
+def test_unchanged_table_is_reloaded_before_its_snapshot_expires(bronze_sources, manifest_path):
+    record_loaded_tables(detect_changed_tables(['contracts', 'budgets'], manifest_path), manifest_path)
+    loaded_at = datetime.datetime.fromisoformat(load_manifest(manifest_path)['contracts']['loaded_at'])
+    
+    assert detect_changed_tables(['contracts'], manifest_path, refresh_days=15, now=loaded_at + datetime.timedelta(days=14)) == {}
+    assert list(detect_changed_tables(['contracts'], manifest_path, refresh_days=15, now=loaded_at + datetime.timedelta(days=15))) == ['contracts']
+    # Without partition expiration, unchanged files are never reloaded
+    assert detect_changed_tables(['contracts'], manifest_path, refresh_days=0, now=loaded_at + datetime.timedelta(days=365)) == {}
+
+def test_fingerprint_reuses_hash_when_size_and_mtime_match(bronze_sources):
+    path = str(bronze_sources['contracts'])
+    previous = dict(fingerprint_file(path), sha256='cached')
+    assert fingerprint_file(path, previous)['sha256'] == 'cached'
@@ -0,0 +1,108 @@
+import datetime
+import os
+import sys
+from unittest import mock
+import pytest
+
+bigquery = pytest.importorskip('google.cloud.bigquery')
+from google.api_core.exceptions import NotFound
+
+# Add the repository root to the Python path to import the bronze package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from bronze.partitioning import migrate_bronze_table, partition_expiration_ms, time_partitioning
+
+TABLE_ID = 'p.bronze.contracts'
+STAGING_ID = 'p.bronze.contracts_partitioned'
+TODAY = datetime.date(2025, 3, 5)
+
+def _table(table_id, time_partitioning=None, num_rows=3):
+    resource = {
+        'tableReference': {'projectId': 'p', 'datasetId': 'bronze', 'tableId': table_id.split('.')[-1]},
+        'schema': {'fields': [{'name': 'contract_id', 'type': 'STRING'}, {'name': 'contract_value', 'type': 'NUMERIC'}]},
+        'numRows': str(num_rows),
+    }
+    if time_partitioning:
+        resource['timePartitioning'] = time_partitioning
+    return bigquery.Table.from_api_repr(resource)
+
+def _client(*tables):
+    client = mock.MagicMock()
+    client.project = 'p'
+    client.get_table.side_effect = list(tables)
+    return client
+
+def _calls(client):
+    """Return the (method, first argument) of the client calls that touch tables, in order."""
+    methods = {'get_table', 'create_table', 'delete_table', 'copy_table', 'update_table', 'query'}
+    return [(name, args[0]) for name, args, _ in client.mock_calls if name in methods]
+
+def test_missing_table_is_left_to_the_next_load():
+    client = _client(NotFound('contracts'))
+    assert migrate_bronze_table(client, 'bronze', 'contracts') == 'missing'
+    assert _calls(client) == [('get_table', TABLE_ID)]
+
+def test_partitioned_table_only_gets_its_expiration():
+    expiration_ms = str(partition_expiration_ms(30))
+    client = _client(_table(TABLE_ID, {'type': 'DAY', 'expirationMs': expiration_ms}))
+    assert migrate_bronze_table(client, 'bronze', 'contracts', expiration_days=30) == 'partitioned'
+    assert _calls(client) == [('get_table', TABLE_ID)]
+
+    client = _client(_table(TABLE_ID, {'type': 'DAY'}))
+    assert migrate_bronze_table(client, 'bronze', 'contracts', dry_run=True, expiration_days=30) == 'would set expiration'
+    assert _calls(client) == [('get_table', TABLE_ID)]
+
+    client = _client(_table(TABLE_ID, {'type': 'DAY'}))
+    assert migrate_bronze_table(client, 'bronze', 'contracts', expiration_days=30) == 'expiration set'
+    updated, fields = client.update_table.call_args[0]
+    assert updated.time_partitioning.expiration_ms == partition_expiration_ms(30) and fields == ['time_partitioning']
+
+def test_field_partitioned_table_is_not_touched():
+    client = _client(_table(TABLE_ID, {'type': 'DAY', 'field': 'start_date'}))
+    with pytest.raises(ValueError, match='partitioned by start_date'):
+        migrate_bronze_table(client, 'bronze', 'contracts')
+    assert _calls(client) == [('get_table', TABLE_ID)]
+
+def test_dry_run_only_reports_unpartitioned_tables():
+    client = _client(_table(TABLE_ID))
+    assert migrate_bronze_table(client, 'bronze', 'contracts', dry_run=True) == 'would migrate'
+    assert _calls(client) == [('get_table', TABLE_ID)]
+
+def test_migration_copies_rows_before_replacing_the_table():
+    client = _client(_table(TABLE_ID), _table(STAGING_ID))
+    assert migrate_bronze_table(client, 'bronze', 'contracts', expiration_days=30, today=TODAY) == 'migrated'
+
+    calls = _calls(client)
+    assert [name for name, _ in calls] == [
+        'get_table', 'delete_table', 'create_table', 'query', 'get_table', 'delete_table', 'copy_table', 'delete_table',
+    ]
+    # A leftover staging table is dropped first; the original is only deleted once the rows are copied
+    assert client.delete_table.call_args_list[0] == mock.call(STAGING_ID, not_found_ok=True)
+    assert [args[0] for args, _ in client.delete_table.call_args_list[1:]] == [TABLE_ID, STAGING_ID]
+    assert client.copy_table.call_args[0] == (STAGING_ID, TABLE_ID)
+
+    staging = calls[2][1]
+    assert staging.time_partitioning.type_ == 'DAY' and staging.time_partitioning.field is None
+    assert staging.time_partitioning.expiration_ms == partition_expiration_ms(30)
+    assert [field.name for field in staging.schema] == ['contract_id', 'contract_value']
+    sql = calls[3][1]
+    assert f'INSERT INTO `{STAGING_ID}` (_PARTITIONTIME, `contract_id`, `contract_value`)' in sql
+    assert "TIMESTAMP('2025-03-04')" in sql and f'FROM `{TABLE_ID}`' in sql
+
+def test_staging_table_is_kept_if_the_copy_fails():
+    client = _client(_table(TABLE_ID), _table(STAGING_ID))
+    client.copy_table.return_value.result.side_effect = RuntimeError('copy failed')
+    with pytest.raises(RuntimeError, match='copy failed'):
+        migrate_bronze_table(client, 'bronze', 'contracts', today=TODAY)
+    assert [args[0] for args, _ in client.delete_table.call_args_list] == [STAGING_ID, TABLE_ID]
+    assert client.delete_table.call_args_list[0][1] == {'not_found_ok': True}
+
+def test_original_table_is_kept_if_rows_are_missing_from_staging():
+    client = _client(_table(TABLE_ID, num_rows=3), _table(STAGING_ID, num_rows=2))
+    with pytest.raises(RuntimeError, match='Copied 2 of the 3 rows'):
+        migrate_bronze_table(client, 'bronze', 'contracts', today=TODAY)
+    assert [args[0] for args, _ in client.delete_table.call_args_list] == [STAGING_ID]
+    client.copy_table.assert_not_called()
+
+def test_load_time_partitioning_sets_the_expiration():
+    assert time_partitioning(30) == {'type': 'DAY', 'expirationMs': '2592000000'}
+    assert time_partitioning(0) == {'type': 'DAY'}
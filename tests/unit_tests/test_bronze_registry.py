@@ -0,0 +1,87 @@
+import os
+import sys
+import pandas as pd
+
+# Add the repository root to the Python path to import the bronze package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from bronze.registry import compact_dtypes, memory_usage_bytes, read_bronze_csv, schema_registry
+from bronze.schemas import BRONZE_TABLES
+from bronze.synthetic import generate_bronze
+
+def test_registry_covers_every_bronze_column():
+    registry = schema_registry()
+    assert sorted(registry) == sorted(BRONZE_TABLES)
+    for table, config in BRONZE_TABLES.items():
+        assert [column['name'] for column in registry[table]] == [field['name'] for field in config['schema_fields']]
+
+def test_logical_types_from_sources_yml():
+    assert compact_dtypes('contracts') == {
+        'contract_id': 'string[pyarrow]',
+        'contract_name': 'string[pyarrow]',
+        'client_name': 'category',
+        'start_date': 'datetime64[ns]',
+        'end_date': 'datetime64[ns]',
+        'contract_value': 'float64',
+        'contract_status': 'category',
+    }
+    budgets = compact_dtypes('budgets')
+    assert (budgets['contractId'], budgets['originalAmount'], budgets['createdAt']) == ('category', 'float64', 'datetime64[ns]')
+
+def test_malformed_values_are_kept(tmp_path):
+    path = tmp_path / 'budgets.csv'
+    path.write_text(
+        "id,contractId,name,code,scope,plannedStartDate,plannedEndDate,actualStartDate,actualEndDate,originalAmount,actualCost,createdAt,updatedAt\n"
+        "B1,C1,Budget 1,BUD001,budgetAndCost,2024-01-01,2024-12-31,,,50000,25000,2023-12-15,2024-02-01\n"
+        "B2,C1,Budget 2,BUD002,budgetAndCost,31/12/2024,2024-11-30,,,unknown,40000,2023-12-20,2024-02-15\n"
+    )
+    frame = read_bronze_csv(str(path), 'budgets')
+
+    assert str(frame['plannedEndDate'].dtype) == 'datetime64[ns]'
+    assert str(frame['actualCost'].dtype) == 'float64'
+    assert frame['plannedStartDate'].tolist() == ['2024-01-01', '31/12/2024']
+    assert frame['originalAmount'].tolist() == ['50000', 'unknown']
+    assert str(frame['code'].dtype) == 'string'
+
+def test_compact_dtypes_cut_memory(tmp_path):
+    generate_bronze(str(tmp_path), contracts=2000, seed=1, formats=('csv',))
+    for table in BRONZE_TABLES:
+        path = str(tmp_path / f'{table}.csv')
+        raw = pd.read_csv(path)
+        typed = read_bronze_csv(path, table)
+        assert len(typed) == len(raw)
+        assert memory_usage_bytes(raw) > 3 * memory_usage_bytes(typed)
+
+def test_chunked_read_matches_whole_file(tmp_path):
+    generate_bronze(str(tmp_path), contracts=500, seed=2, formats=('csv',))
+    path = str(tmp_path / 'contracts.csv')
+    whole = read_bronze_csv(path, 'contracts')
+    chunks = list(read_bronze_csv(path, 'contracts', chunksize=100))
+
+    assert len(chunks) == 5
+    assert pd.concat(chunks, ignore_index=True).astype(object).equals(whole.astype(object))
+
+def test_integer_columns_are_never_rounded(tmp_path, monkeypatch):
+    import bronze.registry as registry
+    # Register contract_value as an integer, which the registry reads as nullable Int64
+    with open(registry.SOURCES_PATH) as f:
+        sources = f.read()
+    sources_path = tmp_path / 'sources.yml'
+    sources_path.write_text(sources.replace(
+        '- name: contract_value\n            description: "Value of the contract"\n            meta:\n              logical_type: amount',
+        '- name: contract_value\n            description: "Value of the contract"\n            meta:\n              logical_type: integer'))
+    schema_registry = registry.schema_registry
+    monkeypatch.setattr(registry, 'schema_registry', lambda sources_path=str(sources_path): schema_registry(sources_path))
+    assert registry.compact_dtypes('contracts')['contract_value'] == 'Int64'
+
+    header = "contract_id,contract_name,client_name,start_date,end_date,contract_value,contract_status\n"
+    whole = tmp_path / 'whole.csv'
+    whole.write_text(header + "C1,A,X,2024-01-01,2024-12-31,12,active\nC2,B,Y,2024-01-01,2024-12-31,13.0,active\nC3,C,Z,2024-01-01,2024-12-31,,active\n")
+    frame = registry.read_bronze_csv(str(whole), 'contracts')
+    assert str(frame['contract_value'].dtype) == 'Int64'
+    assert frame['contract_value'].tolist()[:2] == [12, 13]
+
+    fractional = tmp_path / 'fractional.csv'
+    fractional.write_text(header + "C1,A,X,2024-01-01,2024-12-31,12,active\nC2,B,Y,2024-01-01,2024-12-31,12.7,active\n")
+    frame = registry.read_bronze_csv(str(fractional), 'contracts')
+    assert str(frame['contract_value'].dtype) == 'string'
+    assert frame['contract_value'].tolist() == ['12.0', '12.7']
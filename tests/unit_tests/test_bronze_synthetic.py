@@ -0,0 +1,62 @@
+import os
+import sys
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+# Add the project root to the Python path to import the bronze package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from bronze.landing import convert_csv_to_parquet
+from bronze.schemas import BRONZE_TABLES
+from bronze.synthetic import DIRTY_VALUES, contracts_for_rows, generate_bronze
+
+@pytest.fixture
+def generated(tmp_path):
+    stats = generate_bronze(str(tmp_path / 'a'), 2500, seed=7, dirty_rate=0.05, chunk_contracts=1000)
+    return stats, {table: pq.read_table(stats['files'][table]['parquet']) for table in BRONZE_TABLES}
+
+def test_generates_every_table_in_chunks(generated):
+    stats, tables = generated
+    assert stats['rows']['contracts'] == 2500
+    assert stats['rows']['budgets'] > 2500 and stats['rows']['co'] > 2500
+    for table, data in tables.items():
+        assert data.num_rows == stats['rows'][table]
+    assert tables['contracts'].column('contract_id').unique().to_pylist() == tables['contracts'].column('contract_id').to_pylist()
+
+def test_referential_integrity(generated):
+    _, tables = generated
+    contract_ids = tables['contracts'].column('contract_id')
+    for table in ['budgets', 'co']:
+        assert pc.all(pc.is_in(tables[table].column('contractId'), value_set=contract_ids)).as_py()
+
+def test_dirty_values_at_configured_rate(generated):
+    _, tables = generated
+    planned = tables['budgets'].column('plannedStartDate')
+    dirty_share = pc.sum(pc.is_in(planned, value_set=pa.array(DIRTY_VALUES['date']))).as_py() / len(planned)
+    assert 0.03 < dirty_share < 0.07
+
+def test_clients_are_skewed(generated):
+    _, tables = generated
+    counts = sorted(tables['contracts'].column('client_name').value_counts().field('counts').to_pylist(), reverse=True)
+    assert sum(counts[:10]) > 0.4 * sum(counts)
+
+def test_deterministic_for_seed(tmp_path, generated):
+    stats, tables = generated
+    again = generate_bronze(str(tmp_path / 'b'), 2500, seed=7, dirty_rate=0.05, chunk_contracts=1000, formats=('parquet',))
+    other = generate_bronze(str(tmp_path / 'c'), 2500, seed=8, dirty_rate=0.05, chunk_contracts=1000, formats=('parquet',))
+
+    assert pq.read_table(again['files']['budgets']['parquet']).equals(tables['budgets'])
+    assert not pq.read_table(other['files']['budgets']['parquet']).equals(tables['budgets'])
+
+def test_csv_converts_to_landing_parquet(tmp_path, generated):
+    stats, tables = generated
+    config = BRONZE_TABLES['co']
+    result = convert_csv_to_parquet(stats['files']['co']['csv'], str(tmp_path / 'co.parquet'), config['schema_fields'],
+                                    allow_quoted_newlines=config['allow_quoted_newlines'],
+                                    allow_jagged_rows=config['allow_jagged_rows'])
+    assert result['rows'] == stats['rows']['co']
+    assert pq.read_table(str(tmp_path / 'co.parquet')).equals(tables['co'])
+
+def test_contracts_for_rows():
+    assert contracts_for_rows(60000) == 10000
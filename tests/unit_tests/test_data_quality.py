@@ -1,4 +1,7 @@
+import datetime
+import json
 import os
+import subprocess
 import sys
 import pandas as pd
 import pytest
@@ -10,8 +13,26 @@ from validate_data_quality import (
     validate_not_null,
     validate_column_type,
     validate_values_in_set,
-    validate_unique
+    validate_unique,
+    compile_expectation_plan,
+    run_expectation_suite,
+    stream_expectation_suite,
+    read_dataset,
+    validate_dataset,
+    validation_cache_key,
+    read_cached_result,
+    write_cached_result,
+    evict_validation_cache,
+    generate_data_docs
 )
+import validate_data_quality
+
+@pytest.fixture(autouse=True)
+def arrow_cache_dir(tmp_path, monkeypatch):
+    """Keep the bronze Arrow caches of test files out of the repository."""
+    cache_dir = str(tmp_path / 'arrow_cache')
+    monkeypatch.setattr(validate_data_quality, 'ARROW_CACHE_DIR', cache_dir)
+    return cache_dir
 
 # Sample data for testing
 @pytest.fixture
@@ -77,4 +98,353 @@ def test_validate_unique_success(sample_contracts_df):
     assert validate_unique(sample_contracts_df, 'contract_id') == True
 
 def test_validate_unique_failure(sample_budgets_df):
-    assert validate_unique(sample_budgets_df, 'contract_id') == False 
\ No newline at end of file
+    assert validate_unique(sample_budgets_df, 'contract_id') == False 
+# Test the expectation engine
+@pytest.fixture
+def budgets_df_with_issues():
+    return pd.DataFrame({
+        'budget_id': ['BUD-001', 'BUD-002', 'BUD-003', 'BUD-004', None],
+        'contract_id': ['CONT-001', 'CONT-001', 'CONT-001', 'CONT-002', 'CONT-002'],
+        'budget_name': ['Renovation Materials', 'Labor Costs', 'Permits and Fees', 'Hardware', 'Software Licenses'],
+        'budget_amount': [80000, 60000, 10000, 45000, 20000],
+        'fiscal_year': [2023, 2023, 2023, 2023, 2023],
+        'department': ['Facilities', 'Facilities', 'Legal', 'IT', 'IT']
+    })
+
+@pytest.fixture
+def sample_budgets_suite():
+    return {
+        'expectation_suite_name': 'bronze.budgets',
+        'expectations': [
+            {'expectation_type': 'expect_table_columns_to_match_ordered_list',
+             'kwargs': {'column_list': ['budget_id', 'contract_id', 'budget_name', 'budget_amount', 'fiscal_year', 'department']}},
+            {'expectation_type': 'expect_column_values_to_not_be_null', 'kwargs': {'column': 'budget_id'}},
+            {'expectation_type': 'expect_column_values_to_be_unique', 'kwargs': {'column': 'budget_id'}},
+            {'expectation_type': 'expect_column_values_to_be_unique', 'kwargs': {'column': 'contract_id'}},
+            {'expectation_type': 'expect_column_values_to_be_in_set',
+             'kwargs': {'column': 'department', 'value_set': ['Facilities', 'IT']}},
+            {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'budget_amount', 'type_': 'NUMERIC'}}
+        ]
+    }
+
+def test_compile_expectation_plan_groups_by_column(sample_budgets_suite):
+    plan = compile_expectation_plan(sample_budgets_suite)
+    assert len(plan['table']) == 1
+    assert [index for index, _, _ in plan['columns']['budget_id']] == [1, 2]
+    assert plan['size'] == 6
+
+def test_run_expectation_suite_structured_results(budgets_df_with_issues, sample_budgets_suite):
+    validation_result = run_expectation_suite(budgets_df_with_issues, sample_budgets_suite)
+    results = validation_result['results']
+    
+    assert validation_result['success'] == False
+    assert [r['expectation_type'] for r in results] == [e['expectation_type'] for e in sample_budgets_suite['expectations']]
+    assert results[1]['result']['unexpected_count'] == 1
+    assert results[1]['result']['partial_unexpected_index_list'] == [4]
+    assert results[2]['success'] == True
+    assert results[3]['result']['unexpected_count'] == 3
+    assert results[4]['result']['partial_unexpected_list'] == ['Legal']
+    assert results[5]['success'] == True
+    assert validation_result['statistics']['unsuccessful_expectations'] == 3
+
+def test_run_expectation_suite_missing_column(sample_budgets_df):
+    suite = {'expectations': [{'expectation_type': 'expect_column_values_to_not_be_null', 'kwargs': {'column': 'missing'}}]}
+    validation_result = run_expectation_suite(sample_budgets_df, suite)
+    assert validation_result['success'] == False
+    assert validation_result['results'][0]['exception_info']['raised_exception'] == True
+
+# Test streaming validation
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 100])
+def test_stream_expectation_suite_matches_in_memory(tmp_path, budgets_df_with_issues, sample_budgets_suite, chunk_size):
+    data_file = tmp_path / 'budgets.csv'
+    budgets_df_with_issues.to_csv(data_file, index=False)
+    
+    in_memory = run_expectation_suite(pd.read_csv(data_file), sample_budgets_suite)
+    streamed = stream_expectation_suite(data_file, sample_budgets_suite, chunk_size)
+    assert streamed == in_memory
+
+def test_stream_uniqueness_across_many_chunks(tmp_path):
+    ids = pd.Series(range(5000)).astype(str)
+    # Repeats of earlier values land in later chunks, some twice within one chunk
+    frame = pd.DataFrame({'budget_id': pd.concat([ids, ids.sample(300, random_state=1), pd.Series(['7', '7'])],
+                                                  ignore_index=True)})
+    data_file = tmp_path / 'ids.csv'
+    frame.to_csv(data_file, index=False)
+    suite = {'expectation_suite_name': 'ids', 'expectations': [
+        {'expectation_type': 'expect_column_values_to_be_unique', 'kwargs': {'column': 'budget_id'}}]}
+    
+    streamed = stream_expectation_suite(str(data_file), suite, chunk_size=97)
+    in_memory = run_expectation_suite(pd.read_csv(data_file), suite)
+    assert streamed['results'][0]['result']['unexpected_count'] == 302
+    assert streamed['results'] == in_memory['results']
+
+@pytest.fixture
+def contracts_suite():
+    return {
+        'expectation_suite_name': 'bronze.contracts',
+        'expectations': [
+            {'expectation_type': 'expect_column_values_to_be_unique', 'kwargs': {'column': 'contract_id'}},
+            {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'contract_id', 'type_': 'STRING'}},
+            {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'start_date', 'type_': 'DATE'}},
+            {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'contract_value', 'type_': 'NUMERIC'}},
+            {'expectation_type': 'expect_column_values_to_be_in_set',
+             'kwargs': {'column': 'contract_status', 'value_set': ['executed', 'approved', 'pending', 'draft']}},
+        ],
+    }
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 100])
+def test_typed_validation_matches_untyped(tmp_path, sample_contracts_df, contracts_suite, chunk_size):
+    data_file = tmp_path / 'contracts.csv'
+    sample_contracts_df.loc[4, 'start_date'] = 'not a date'
+    sample_contracts_df.loc[1, 'contract_id'] = 'CONT-001'
+    sample_contracts_df.to_csv(data_file, index=False)
+    
+    untyped = run_expectation_suite(pd.read_csv(data_file), contracts_suite)
+    typed = run_expectation_suite(read_dataset(data_file, 'contracts'), contracts_suite)
+    streamed = stream_expectation_suite(data_file, contracts_suite, chunk_size, table='contracts')
+    
+    successes = [result['success'] for result in untyped['results']]
+    assert successes == [False, True, True, True, False]
+    assert [result['success'] for result in typed['results']] == successes
+    assert [result['success'] for result in streamed['results']] == successes
+    assert typed['results'][0]['result']['partial_unexpected_list'] == ['CONT-001']
+    assert streamed['results'][4] == typed['results'][4]
+
+def test_registry_integer_columns_are_numeric(tmp_path, monkeypatch, sample_contracts_df):
+    import bronze.registry as registry
+    # Register contract_value as an integer, which the registry reads as nullable Int64
+    with open(registry.SOURCES_PATH) as f:
+        sources = f.read()
+    sources_path = tmp_path / 'sources.yml'
+    sources_path.write_text(sources.replace(
+        '- name: contract_value\n            description: "Value of the contract"\n            meta:\n              logical_type: amount',
+        '- name: contract_value\n            description: "Value of the contract"\n            meta:\n              logical_type: integer'))
+    schema_registry = registry.schema_registry
+    monkeypatch.setattr(registry, 'schema_registry', lambda sources_path=str(sources_path): schema_registry(sources_path))
+    
+    data_file = tmp_path / 'contracts.csv'
+    sample_contracts_df.loc[2, 'contract_value'] = None
+    sample_contracts_df.to_csv(data_file, index=False)
+    frame = registry.read_bronze_csv(str(data_file), 'contracts')
+    assert str(frame['contract_value'].dtype) == 'Int64'
+    
+    suite = {'expectation_suite_name': 'ints', 'expectations': [
+        {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'contract_value', 'type_': 'NUMERIC'}}]}
+    assert run_expectation_suite(frame, suite)['success']
+
+def test_silver_datasets_are_read_untyped(tmp_path, sample_contracts_df, arrow_cache_dir):
+    assert validate_data_quality.VALIDATION_SUITES['silver_contracts']['table'] is None
+    data_file = tmp_path / 'contracts_silver.csv'
+    sample_contracts_df.assign(processed_at='2025-03-05 01:00:00').to_csv(data_file, index=False)
+    suite_file = tmp_path / 'suite.json'
+    suite_file.write_text(json.dumps({'expectation_suite_name': 'silver.contracts', 'expectations': [
+        {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'contract_value', 'type_': 'NUMERIC'}}]}))
+    
+    result = validate_dataset(str(data_file), str(suite_file), 'silver contracts',
+                              table=validate_data_quality.VALIDATION_SUITES['silver_contracts']['table'], cache_max_bytes=0)
+    assert result['results'][0]['result']['observed_value'] == 'int64'
+    assert not os.path.exists(arrow_cache_dir)
+
+@pytest.fixture
+def cached_validation(tmp_path, sample_budgets_suite, budgets_df_with_issues):
+    data_file = tmp_path / 'budgets.csv'
+    budgets_df_with_issues.to_csv(data_file, index=False)
+    suite_file = tmp_path / 'suite.json'
+    suite_file.write_text(json.dumps(sample_budgets_suite))
+    return str(data_file), str(suite_file), str(tmp_path / 'cache')
+
+def test_validation_cache_skips_unchanged_datasets(cached_validation, monkeypatch):
+    data_file, suite_file, cache_dir = cached_validation
+    first = validate_dataset(data_file, suite_file, 'budgets', cache_dir=cache_dir)
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged dataset was validated again")
+    monkeypatch.setattr(validate_data_quality, 'run_expectation_suite', fail)
+    
+    assert validate_dataset(data_file, suite_file, 'budgets', cache_dir=cache_dir) == first
+
+def test_validation_cache_key_follows_data_and_suite(cached_validation, sample_budgets_suite):
+    data_file, suite_file, _ = cached_validation
+    key = validation_cache_key(data_file, sample_budgets_suite)
+    
+    reordered = dict(reversed(list(sample_budgets_suite.items())))
+    assert validation_cache_key(data_file, reordered) == key
+    
+    changed_suite = {**sample_budgets_suite, 'expectations': sample_budgets_suite['expectations'][:1]}
+    assert validation_cache_key(data_file, changed_suite) != key
+    
+    with open(data_file, 'a') as f:
+        f.write('BUD-009,CONT-002,Extra,100,2023,IT\n')
+    assert validation_cache_key(data_file, sample_budgets_suite) != key
+
+def test_validation_cache_key_follows_read_configuration(cached_validation, sample_budgets_suite, monkeypatch):
+    data_file, _, _ = cached_validation
+    key = validation_cache_key(data_file, sample_budgets_suite, 'budgets', 100)
+    
+    assert validation_cache_key(data_file, sample_budgets_suite, 'budgets', 200) != key
+    assert validation_cache_key(data_file, sample_budgets_suite, None, 100) != key
+    
+    import bronze.registry as registry
+    compact_dtypes = registry.compact_dtypes
+    monkeypatch.setattr(registry, 'compact_dtypes', lambda table: {**compact_dtypes(table), 'originalAmount': 'Int64'})
+    assert validation_cache_key(data_file, sample_budgets_suite, 'budgets', 100) != key
+
+def test_type_mapping_change_invalidates_cached_result(tmp_path, sample_contracts_df, monkeypatch):
+    data_file = tmp_path / 'contracts.csv'
+    sample_contracts_df.to_csv(data_file, index=False)
+    suite_file = tmp_path / 'suite.json'
+    suite_file.write_text(json.dumps({'expectation_suite_name': 'contracts', 'expectations': [
+        {'expectation_type': 'expect_column_values_to_be_of_type', 'kwargs': {'column': 'contract_value', 'type_': 'NUMERIC'}}]}))
+    cache_dir = str(tmp_path / 'cache')
+    
+    assert validate_dataset(str(data_file), str(suite_file), 'contracts', table='contracts', cache_dir=cache_dir)['success']
+    
+    # contract_value is read as float64; without it in NUMERIC the cached success must not be reused
+    type_mapping = {**validate_data_quality.TYPE_MAPPING, 'NUMERIC': ['int64']}
+    monkeypatch.setattr(validate_data_quality, 'TYPE_MAPPING', type_mapping)
+    assert not validate_dataset(str(data_file), str(suite_file), 'contracts', table='contracts', cache_dir=cache_dir)['success']
+
+def test_validation_cache_evicts_least_recently_used(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    for index, key in enumerate(['a' * 64, 'b' * 64, 'c' * 64]):
+        write_cached_result(key, {'payload': 'x' * 100}, cache_dir=cache_dir, max_bytes=10000)
+        os.utime(os.path.join(cache_dir, key[:2], f'{key}.json'), (index, index))
+    
+    # Reading 'a' makes it the most recently used, so 'b' is evicted first
+    assert read_cached_result('a' * 64, cache_dir=cache_dir) is not None
+    assert evict_validation_cache(max_bytes=250, cache_dir=cache_dir) == 1
+    assert read_cached_result('b' * 64, cache_dir=cache_dir) is None
+    assert read_cached_result('a' * 64, cache_dir=cache_dir) is not None
+    assert read_cached_result('c' * 64, cache_dir=cache_dir) is not None
+
+@pytest.fixture
+def registered_datasets(tmp_path, monkeypatch, sample_budgets_df, budgets_df_with_issues, sample_budgets_suite):
+    """Register a passing, a failing and a suite-less dataset, logging every read with the reading process."""
+    passing_suite = {'expectation_suite_name': 'budgets_ok', 'expectations': sample_budgets_suite['expectations'][:2]}
+    suites = {'budgets_ok': passing_suite, 'budgets_bad': sample_budgets_suite}
+    data_files = {}
+    for name, frame in (('budgets_bad', budgets_df_with_issues), ('budgets_ok', sample_budgets_df), ('budgets_missing', sample_budgets_df)):
+        data_files[name] = str(tmp_path / f'{name}.csv')
+        frame.to_csv(data_files[name], index=False)
+        if name in suites:
+            (tmp_path / f'{name}.json').write_text(json.dumps(suites[name]))
+    
+    monkeypatch.setattr(validate_data_quality, 'GE_DIR', str(tmp_path / 'great_expectations'))
+    monkeypatch.setattr(validate_data_quality, 'EXPECTATIONS_DIR', str(tmp_path))
+    monkeypatch.setattr(validate_data_quality, 'VALIDATION_SUITES', {
+        name: {'layer': 'bronze', 'dataset': name, 'label': name, 'suite_file': f'{name}.json',
+               'fallback_file': (f'{name}.json',), 'chunk_size': 0, 'table': None}
+        for name in data_files
+    })
+    
+    reads_log = tmp_path / 'reads.log'
+    original_read_dataset = validate_data_quality.read_dataset
+    def logged_read_dataset(data_file, *args, **kwargs):
+        with open(reads_log, 'a') as f:
+            f.write(f'{os.getpid()} {data_file}\n')
+        return original_read_dataset(data_file, *args, **kwargs)
+    monkeypatch.setattr(validate_data_quality, 'read_dataset', logged_read_dataset)
+    
+    original_validate_dataset = validate_data_quality.validate_dataset
+    def uncached_validate_dataset(*args, **kwargs):
+        return original_validate_dataset(*args, cache_max_bytes=0, **kwargs)
+    monkeypatch.setattr(validate_data_quality, 'validate_dataset', uncached_validate_dataset)
+    return data_files, reads_log
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_run_validations_validates_each_dataset_once(registered_datasets, max_workers):
+    data_files, reads_log = registered_datasets
+    results = validate_data_quality.run_validations(data_files, max_workers=max_workers)
+    
+    # Results come back in the order the datasets were given
+    assert list(results) == ['budgets_bad', 'budgets_ok', 'budgets_missing']
+    assert results['budgets_ok']['success'] is True
+    assert results['budgets_bad']['success'] is False
+    assert [r['success'] for r in results['budgets_bad']['results']] == [True, False, True, False, False, True]
+    # A dataset without a suite is reported as None without failing the others
+    assert results['budgets_missing'] is None
+    
+    reads = [line.split(' ', 1) for line in reads_log.read_text().splitlines()]
+    assert sorted(data_file for _, data_file in reads) == sorted([data_files['budgets_bad'], data_files['budgets_ok']])
+    in_process = {int(pid) for pid, _ in reads} == {os.getpid()}
+    assert in_process == (max_workers == 1)
+
+def test_run_validations_reports_failing_layer(registered_datasets, capsys):
+    data_files, _ = registered_datasets
+    results = validate_data_quality.run_validations(data_files, max_workers=2)
+    
+    assert not validate_data_quality.print_layer_results('bronze', data_files, results)
+    assert validate_data_quality.print_layer_results('bronze', {'budgets_ok': data_files['budgets_ok']}, results)
+    output = capsys.readouterr().out
+    assert 'budgets_bad: FAILED' in output and 'budgets_ok: PASSED' in output and 'budgets_missing: FAILED' in output
+
+@pytest.fixture
+def docs_results(budgets_df_with_issues, sample_budgets_suite):
+    return {
+        'bronze_budgets': run_expectation_suite(budgets_df_with_issues, sample_budgets_suite),
+        'bronze_contracts': None,
+    }
+
+def _docs_run(results, docs_dir, minute, runs_per_page=50):
+    run_at = datetime.datetime(2025, 3, 5, 1, minute)
+    return generate_data_docs(results, docs_dir=docs_dir, run_at=run_at, runs_per_page=runs_per_page)
+
+def test_data_docs_only_render_changed_results(tmp_path, docs_results):
+    docs_dir = str(tmp_path / 'docs')
+    index_path = _docs_run(docs_results, docs_dir, 0)
+    suite_pages = sorted(p.relative_to(docs_dir).as_posix() for p in (tmp_path / 'docs' / 'suites').rglob('*.html'))
+    assert len(suite_pages) == 2
+    
+    _docs_run(docs_results, docs_dir, 1)
+    assert sorted(p.relative_to(docs_dir).as_posix() for p in (tmp_path / 'docs' / 'suites').rglob('*.html')) == suite_pages
+    
+    docs_results['bronze_contracts'] = {**docs_results['bronze_budgets'], 'success': True}
+    _docs_run(docs_results, docs_dir, 2)
+    assert len(list((tmp_path / 'docs' / 'suites').rglob('*.html'))) == 3
+    
+    index = open(index_path).read()
+    assert index.count('<td>2025-03-05 01:0') == 3
+    assert all(page in index for page in suite_pages)
+
+def test_data_docs_history_is_paginated(tmp_path, docs_results):
+    docs_dir = tmp_path / 'docs'
+    for minute in range(5):
+        _docs_run(docs_results, str(docs_dir), minute, runs_per_page=2)
+    
+    assert sorted(p.name for p in docs_dir.glob('runs-*.html')) == ['runs-00001.html', 'runs-00002.html', 'runs-00003.html']
+    first_page = (docs_dir / 'runs-00001.html').read_text()
+    assert 'runs-00002.html' in first_page and '2025-03-05 01:01' in first_page
+    assert (docs_dir / 'index.html').read_text() == (docs_dir / 'runs-00003.html').read_text()
+    assert json.loads((docs_dir / 'history' / 'state.json').read_text()) == {'pages': 3, 'runs': 5}
+
+def test_data_docs_failure_samples_render_lazily(tmp_path, docs_results):
+    _docs_run(docs_results, str(tmp_path / 'docs'), 0)
+    page = next((tmp_path / 'docs' / 'suites' / 'bronze_budgets').glob('*.html')).read_text()
+    
+    # The duplicate contract IDs only appear inside the inert template
+    body, template = page.split('<template id="sample-3">')
+    assert 'data-sample="sample-3"' in body and 'CONT-001' not in body
+    assert template.split('</template>')[0].count('CONT-001') == 2
+
+# Importing the module for the pandas-only path must stay cheap and offline
+STARTUP_BUDGET_SECONDS = float(os.environ.get('VALIDATION_STARTUP_BUDGET', '1.5'))
+
+def test_import_stays_within_startup_budget():
+    tests_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import sys, time, json\n"
+        "started = time.perf_counter()\n"
+        "import validate_data_quality\n"
+        "seconds = time.perf_counter() - started\n"
+        "heavy = sorted(m for m in ('great_expectations', 'sqlalchemy', 'google.cloud.bigquery', 'bronze.arrow_cache', 'yaml') if m in sys.modules)\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    # Best of three runs, so a cold disk cache does not fail the budget
+    runs = [
+        json.loads(subprocess.run([sys.executable, '-c', script], cwd=tests_dir, check=True,
+                                  capture_output=True, text=True).stdout.splitlines()[-1])
+        for _ in range(3)
+    ]
+    
+    assert all(run['heavy'] == [] for run in runs)
+    assert min(run['seconds'] for run in runs) < STARTUP_BUDGET_SECONDS
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+import pytest
+
+# Add the DAGs folder to the Python path to import the dbt lineage helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from dbt_lineage import (
+    affected_models,
+    load_dbt_lineage,
+    manifest_lineage,
+    scan_model_lineage
+)
+
+DBT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../silver_layer/transformations'))
+
+@pytest.fixture
+def project_lineage():
+    return scan_model_lineage(DBT_DIR)
+
+def test_scan_finds_refs_and_bronze_sources(project_lineage):
+    assert project_lineage['contracts_silver'] == {'refs': [], 'sources': ['bronze.contracts']}
+    assert project_lineage['change_orders_silver']['sources'] == ['bronze.co']
+    assert project_lineage['contract_rollup']['refs'] == ['budgets_silver', 'change_orders_silver', 'contracts_silver']
+    assert project_lineage['project_analytics']['refs'] == ['contract_rollup']
+
+def test_affected_models_follow_the_lineage(project_lineage):
+    affected = affected_models(project_lineage, {'bronze.budgets'})
+    assert 'budgets_silver' in affected
+    assert 'contract_rollup' in affected
+    assert 'contracts_silver' not in affected
+    assert 'change_orders_silver' not in affected
+    assert affected_models(project_lineage, set()) == []
+
+def test_manifest_lineage(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(json.dumps({
+        'nodes': {
+            'model.medallion.orders_silver': {
+                'resource_type': 'model',
+                'name': 'orders_silver',
+                'depends_on': {'nodes': ['source.medallion.bronze.orders']},
+            },
+            'model.medallion.orders_gold': {
+                'resource_type': 'model',
+                'name': 'orders_gold',
+                'depends_on': {'nodes': ['model.medallion.orders_silver']},
+            },
+            'test.medallion.not_null_orders_gold_id': {
+                'resource_type': 'test',
+                'name': 'not_null_orders_gold_id',
+                'depends_on': {'nodes': ['model.medallion.orders_gold']},
+            },
+        },
+        'sources': {
+            'source.medallion.bronze.orders': {'source_name': 'bronze', 'name': 'orders'},
+        },
+    }))
+
+    assert manifest_lineage(str(manifest_path)) == {
+        'orders_silver': {'refs': [], 'sources': ['bronze.orders']},
+        'orders_gold': {'refs': ['orders_silver'], 'sources': []},
+    }
+
+def test_load_without_project_is_empty(tmp_path):
+    assert load_dbt_lineage(str(tmp_path)) == {}
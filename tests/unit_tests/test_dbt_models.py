@@ -49,9 +49,13 @@ class TestDbtModels(unittest.TestCase):
         for model in silver_models:
             with open(model, 'r') as f:
                 content = f.read()
-                # Check that silver models have the correct materialization
-                self.assertIn("materialized='table'", content, 
-                             f"Silver model {os.path.basename(model)} should be materialized as a table")
+                # Check that silver models are incremental merges on their key
+                self.assertIn("materialized='incremental'", content, 
+                             f"Silver model {os.path.basename(model)} should be materialized incrementally")
+                self.assertIn("incremental_strategy='merge'", content, 
+                             f"Silver model {os.path.basename(model)} should use the merge strategy")
+                self.assertIn("unique_key=", content, 
+                             f"Silver model {os.path.basename(model)} should declare a unique_key")
                 self.assertIn("schema='silver'", content, 
                              f"Silver model {os.path.basename(model)} should be in the silver schema")
         
@@ -66,6 +70,25 @@ class TestDbtModels(unittest.TestCase):
                 self.assertIn("schema='gold'", content, 
                              f"Gold model {os.path.basename(model)} should be in the gold schema")
     
+    def test_model_partitioning_and_clustering(self):
+        """Test that models declare partitioning and clustering so queries can prune."""
+        for model in glob.glob(os.path.join(self.models_dir, 'silver/*.sql')):
+            with open(model, 'r') as f:
+                content = f.read()
+                self.assertIn("partition_by={'field': 'processed_at'", content,
+                             f"Silver model {os.path.basename(model)} should be partitioned on processed_at")
+                self.assertRegex(content, r"cluster_by=\['contract_id'",
+                                 f"Silver model {os.path.basename(model)} should be clustered on contract_id")
+        
+        for model in glob.glob(os.path.join(self.models_dir, 'gold/*.sql')):
+            with open(model, 'r') as f:
+                content = f.read()
+                self.assertRegex(content, r"(partition_by|cluster_by)\s*=",
+                                 f"Gold model {os.path.basename(model)} should declare partitioning or clustering")
+        
+        with open(os.path.join(self.models_dir, 'gold/time_analytics.sql'), 'r') as f:
+            self.assertIn("'granularity': 'month'", f.read(), "time_analytics should be partitioned by month")
+    
     def test_schema_yml_files(self):
         """Test that schema.yml files are valid."""
         # Check that schema.yml files exist in silver and gold directories
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+import pytest
+
+# Add the DAGs folder to the Python path to import the dbt performance history
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from dbt_performance import (
+    append_local_runs,
+    cost_per_model,
+    growth_trends,
+    model_run_records,
+    optimization_candidates,
+    performance_frame,
+    read_local_runs,
+    slowest_models
+)
+
+def _result(model, seconds, bytes_billed):
+    return {
+        'unique_id': f'model.medallion.{model}',
+        'status': 'success',
+        'execution_time': seconds,
+        'timing': [],
+        'adapter_response': {'bytes_processed': bytes_billed, 'bytes_billed': bytes_billed, 'slot_ms': 100, 'rows_affected': 10},
+    }
+
+@pytest.fixture
+def target_path(tmp_path):
+    (tmp_path / 'run_results.json').write_text(json.dumps({
+        'metadata': {'generated_at': '2025-03-05T01:00:00Z', 'invocation_id': 'abc'},
+        'results': [
+            _result('contracts_silver', 4.0, 2 ** 30),
+            {'unique_id': 'test.medallion.not_null_contracts_silver_contract_id', 'status': 'pass', 'execution_time': 1.0},
+        ],
+    }))
+    (tmp_path / 'manifest.json').write_text(json.dumps({'nodes': {
+        'model.medallion.contracts_silver': {'config': {
+            'materialized': 'incremental', 'partition_by': {'field': 'start_date', 'data_type': 'date'},
+        }},
+    }}))
+    return str(tmp_path)
+
+def _history():
+    start = datetime.utcnow() - timedelta(days=10)
+    records = []
+    for day in range(10):
+        run_at = (start + timedelta(days=day)).isoformat()
+        records.append({'run_at': run_at, 'model': 'budgets_silver', 'materialized': 'table', 'status': 'success',
+                        'execution_seconds': 10.0 + 2 * day, 'rows_affected': 1000 + 100 * day,
+                        'bytes_processed': 2 ** 30, 'bytes_billed': 2 ** 40, 'slot_ms': 3600000})
+        records.append({'run_at': run_at, 'model': 'contracts_silver', 'materialized': 'incremental',
+                        'partition_by': 'start_date', 'status': 'success', 'execution_seconds': 3.0,
+                        'rows_affected': 50, 'bytes_processed': 2 ** 20, 'bytes_billed': 10 * 2 ** 20, 'slot_ms': 1000})
+    return performance_frame(records)
+
+def test_model_run_records(target_path):
+    records = model_run_records(target_path)
+
+    assert len(records) == 1
+    record = records[0]
+    assert (record['model'], record['materialized'], record['partition_by']) == ('contracts_silver', 'incremental', 'start_date')
+    assert (record['run_at'], record['invocation_id']) == ('2025-03-05T01:00:00Z', 'abc')
+    assert (record['execution_seconds'], record['bytes_billed'], record['rows_affected']) == (4.0, 2 ** 30, 10)
+    assert model_run_records(os.path.dirname(target_path) + '/missing') == []
+
+def test_local_history_round_trip(tmp_path):
+    path = str(tmp_path / 'dbt_performance.sqlite')
+    history = _history()
+    assert append_local_runs(history.to_dict(orient='records'), path=path) == 20
+
+    stored = read_local_runs(30, path=path)
+    assert len(stored) == 20
+    assert stored['bytes_billed'].dtype == 'Int64'
+    assert len(read_local_runs(5, path=path)) < 20
+
+def test_slowest_models():
+    report = slowest_models(_history(), runs=3)
+    assert list(report['model']) == ['budgets_silver', 'contracts_silver']
+    assert report.loc[0, 'median_seconds'] == 26.0
+    assert report.loc[0, 'runs'] == 3
+
+def test_growth_trends():
+    report = growth_trends(_history()).set_index('model')
+    assert report.loc['budgets_silver', 'execution_seconds_per_day'] == pytest.approx(2.0)
+    assert report.loc['budgets_silver', 'rows_affected_per_day'] == pytest.approx(100.0)
+    assert report.loc['contracts_silver', 'execution_seconds_per_day'] == pytest.approx(0.0, abs=1e-9)
+
+def test_cost_and_optimization_candidates():
+    report = cost_per_model(_history(), price_per_tib=6.25).set_index('model')
+    assert report.loc['budgets_silver', 'estimated_cost'] == pytest.approx(62.5)
+    assert report.loc['budgets_silver', 'slot_hours'] == pytest.approx(10.0)
+
+    candidates = optimization_candidates(_history())
+    assert list(candidates['model']) == ['budgets_silver']
+    assert candidates.loc[0, 'suggestion'] == 'make incremental, partition'
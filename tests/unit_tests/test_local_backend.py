@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+import pytest
+
+duckdb = pytest.importorskip('duckdb')
+pytest.importorskip('jinja2')
+
+# Add the DAGs folder to the Python path to import the local execution backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from local_backend import DBT_DIR, build_order, connect, render_model, run_models, run_pipeline
+from dbt_lineage import scan_model_lineage
+
+BRONZE_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../bronze/data'))
+
+@pytest.fixture
+def bronze_dir(tmp_path):
+    for table in ['contracts', 'budgets', 'co']:
+        shutil.copy(os.path.join(BRONZE_DATA_DIR, f'{table}_simple.csv.bak'), tmp_path / f'{table}.csv')
+    return str(tmp_path)
+
+def test_build_order_follows_refs():
+    order = build_order(scan_model_lineage(DBT_DIR))
+    assert order.index('contracts_silver') < order.index('contract_rollup') < order.index('client_analytics')
+    assert build_order(scan_model_lineage(DBT_DIR), ['time_analytics']) == ['time_analytics']
+
+def test_render_model_incremental():
+    relations = {'budgets_silver': 'silver.budgets_silver'}
+    full_sql, config = render_model(DBT_DIR, 'budgets_silver', relations)
+    incremental_sql, _ = render_model(DBT_DIR, 'budgets_silver', relations, incremental=True)
+
+    assert config['materialized'] == 'incremental' and config['unique_key'] == 'budget_id'
+    assert 'FROM bronze.budgets' in full_sql and '_PARTITIONTIME' in full_sql
+    assert 'is_incremental' not in full_sql and 'FROM silver.budgets_silver' not in full_sql
+    assert 'FROM silver.budgets_silver' in incremental_sql
+
+def test_run_pipeline(bronze_dir):
+    conn = connect()
+    summary = run_pipeline(conn, bronze_dir=bronze_dir)
+
+    assert summary['bronze']['contracts']['rows'] == 3
+    assert summary['models']['contracts_silver']['rows'] == 3
+    assert summary['models']['project_analytics']['rows'] == 3
+    assert all(check['success'] for check in summary['checks'])
+
+    # A second run merges into the incremental models without duplicating rows
+    summary = run_pipeline(conn, bronze_dir=bronze_dir)
+    assert summary['models']['budgets_silver']['rows'] == 5
+    assert conn.execute('SELECT COUNT(DISTINCT budget_id) FROM silver.budgets_silver').fetchone()[0] == 5
+
+def test_client_budget_counts_ignore_duplicate_rows(bronze_dir):
+    conn = connect()
+    run_pipeline(conn, bronze_dir=bronze_dir)
+    # A budget row duplicated in silver (e.g. by a full refresh over two snapshots)
+    # B002 is the only sample budget whose contract is loaded
+    conn.execute("INSERT INTO silver.budgets_silver SELECT * FROM silver.budgets_silver WHERE budget_id = 'B002'")
+    models = run_models(conn, models=['contract_rollup', 'client_analytics'])
+
+    rollup = conn.execute(
+        f"SELECT SUM(budget_count), SUM(distinct_budget_count) FROM {models['contract_rollup']['relation']}"
+    ).fetchone()
+    assert rollup == (2, 1)
+    total_budgets = conn.execute(f"SELECT SUM(total_budgets) FROM {models['client_analytics']['relation']}").fetchone()[0]
+    assert total_budgets == 1
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import pandas as pd
+
+# Add the DAGs folder to the Python path to import the monitoring helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from monitoring_executor import run_queries
+
+class FakeJob:
+    """Query job that finishes `delay` seconds after submission, like a BigQuery QueryJob."""
+
+    def __init__(self, sql, delay):
+        self.sql = sql
+        self.delay = delay
+        self.submitted = time.monotonic()
+        self.cancelled = False
+
+    def result(self, timeout=None):
+        remaining = self.submitted + self.delay - time.monotonic()
+        if timeout is not None and remaining > timeout:
+            time.sleep(timeout)
+            raise FutureTimeoutError()
+        time.sleep(max(remaining, 0))
+        if self.sql.startswith('FAIL'):
+            raise RuntimeError(f"Syntax error in {self.sql}")
+        return self
+
+    def to_dataframe(self):
+        return pd.DataFrame({'sql': [self.sql]})
+
+    def cancel(self):
+        self.cancelled = True
+
+class FakeClient:
+    def __init__(self, delays):
+        self.delays = delays
+        self.jobs = {}
+
+    def query(self, sql):
+        if sql.startswith('REJECT'):
+            raise ValueError("Invalid query")
+        self.jobs[sql] = FakeJob(sql, self.delays.get(sql, 0))
+        return self.jobs[sql]
+
+def test_queries_run_concurrently():
+    client = FakeClient({'a': 0.3, 'b': 0.3, 'c': 0.3})
+
+    started = time.monotonic()
+    results = run_queries(client, {'a': 'a', 'b': 'b', 'c': 'c'})
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.6
+    assert {name: list(result['result']['sql']) for name, result in results.items()} == {'a': ['a'], 'b': ['b'], 'c': ['c']}
+    assert all(result['seconds'] >= 0.3 for result in results.values())
+
+def test_partial_failures_and_timeouts_are_reported_per_query():
+    client = FakeClient({'slow': 5})
+
+    results = run_queries(
+        client,
+        {'ok': 'ok', 'failed': 'FAIL x', 'rejected': 'REJECT x', 'slow': 'slow'},
+        timeout=0.2,
+    )
+
+    assert list(results['ok']['result']['sql']) == ['ok']
+    assert 'Syntax error' in results['failed']['error']
+    assert 'Failed to submit query' in results['rejected']['error']
+    assert 'timed out' in results['slow']['error']
+    assert client.jobs['slow'].cancelled
+
+def test_no_queries():
+    assert run_queries(FakeClient({}), {}) == {}
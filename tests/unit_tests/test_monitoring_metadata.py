@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+import pandas as pd
+import pytest
+
+# Add the DAGs folder to the Python path to import the monitoring helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from monitoring_metadata import (
+    compile_null_count_sql,
+    compile_table_metadata_queries,
+    summarize_freshness
+)
+
+@pytest.fixture
+def tables():
+    return [
+        {'dataset': 'bronze', 'table': 'contracts'},
+        {'dataset': 'silver', 'table': 'contracts_silver', 'null_columns': ['contract_id', 'contract_name']},
+        {'dataset': 'silver', 'table': 'budgets_silver'},
+    ]
+
+def test_one_metadata_query_per_dataset(tables):
+    queries = compile_table_metadata_queries('p', tables)
+    assert sorted(queries) == ['bronze', 'silver']
+    assert '`p.bronze.__TABLES__`' in queries['bronze']
+    assert '`p.silver.__TABLES__`' in queries['silver']
+
+def test_null_counts_only_scan_tables_with_null_columns(tables):
+    sql = compile_null_count_sql('p', tables)
+    assert sql.count('FROM') == 1
+    assert 'COUNTIF(contract_id IS NULL) + COUNTIF(contract_name IS NULL) AS null_count' in sql
+    assert compile_null_count_sql('p', tables[:1]) is None
+
+def test_summarize_freshness(tables):
+    metadata = [
+        pd.DataFrame([{'dataset_id': 'bronze', 'table_id': 'contracts', 'row_count': 10, 'size_bytes': 800, 'hours_since_update': 30}]),
+        pd.DataFrame([{'dataset_id': 'silver', 'table_id': 'contracts_silver', 'row_count': 8, 'size_bytes': 640, 'hours_since_update': 2}]),
+    ]
+    results = summarize_freshness('p', tables, metadata)
+
+    assert results['p.bronze.contracts'] == {'hours_since_update': 30, 'row_count': 10, 'size_bytes': 800}
+    assert results['p.silver.contracts_silver'] == {'hours_since_update': 2, 'row_count': 8, 'size_bytes': 640}
+    assert 'error' in results['p.silver.budgets_silver']
+    json.dumps(results)
+
+def test_failed_dataset_marks_its_tables(tables):
+    metadata = [
+        pd.DataFrame([{'dataset_id': 'bronze', 'table_id': 'contracts', 'row_count': 10, 'size_bytes': 800, 'hours_since_update': 30}]),
+    ]
+    results = summarize_freshness('p', tables, metadata, {'silver': 'Not found: Dataset p:silver'})
+
+    assert results['p.bronze.contracts']['row_count'] == 10
+    assert results['p.silver.contracts_silver'] == {'error': 'Not found: Dataset p:silver'}
+    assert results['p.silver.budgets_silver'] == {'error': 'Not found: Dataset p:silver'}
@@ -0,0 +1,58 @@
+import os
+import sys
+from datetime import datetime, timedelta
+import pytest
+
+# Add the DAGs folder to the Python path to import the monitoring helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from monitoring_store import (
+    append_local_metrics,
+    daily_row_counts,
+    metrics_records,
+    read_local_metrics
+)
+
+@pytest.fixture
+def metrics_path(tmp_path):
+    return str(tmp_path / 'monitoring' / 'metrics.sqlite')
+
+def run_metrics(run_at, contracts_rows):
+    freshness = {
+        'p.bronze.contracts': {'hours_since_update': 1, 'row_count': contracts_rows, 'size_bytes': contracts_rows * 80},
+        'p.bronze.budgets': {'error': 'Table not found in dataset metadata'},
+    }
+    return metrics_records(run_at, freshness, {'p.bronze.contracts': 0}, collection_seconds=0.5)
+
+def test_metrics_records_skip_unreadable_tables():
+    records = run_metrics(datetime(2025, 3, 5), 100)
+    assert [record['table_name'] for record in records] == ['p.bronze.contracts']
+    assert records[0]['null_count'] == 0
+    assert records[0]['size_bytes'] == 8000
+
+def test_local_store_round_trip(metrics_path):
+    now = datetime.utcnow().replace(microsecond=0)
+    append_local_metrics(run_metrics(now - timedelta(days=30), 50), metrics_path)
+    append_local_metrics(run_metrics(now - timedelta(hours=1), 100), metrics_path)
+    append_local_metrics(run_metrics(now, 120), metrics_path)
+
+    history = read_local_metrics(7, metrics_path)
+
+    # The 30 day old run is outside the window
+    assert list(history['row_count']) == [100, 120]
+    assert history['run_at'].iloc[-1] == now
+    assert str(history['null_count'].dtype) == 'Int64'
+
+def test_daily_row_counts_keep_last_run_per_day(metrics_path):
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    append_local_metrics(run_metrics(today - timedelta(hours=12), 100), metrics_path)
+    append_local_metrics(run_metrics(today - timedelta(hours=6), 110), metrics_path)
+    append_local_metrics(run_metrics(today, 150), metrics_path)
+
+    daily = daily_row_counts(read_local_metrics(7, metrics_path))
+
+    assert list(daily['table_name']) == ['p.bronze.contracts', 'p.bronze.contracts']
+    assert list(daily['process_date']) == [today - timedelta(days=1), today]
+    assert list(daily['daily_count']) == [110, 150]
+
+def test_empty_store_has_no_daily_counts(metrics_path):
+    assert daily_row_counts(read_local_metrics(7, metrics_path)).empty
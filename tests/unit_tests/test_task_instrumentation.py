@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+# Add the DAGs folder to the Python path to import the instrumentation helpers
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../orchestration/airflow/dags')))
+from task_instrumentation import (
+    bigquery_job_metrics,
+    child_peak_rss_mb,
+    dbt_run_results_metrics,
+    emit_task_event,
+    task_event,
+    TASK_EVENT_PREFIX
+)
+
+def test_query_job_metrics():
+    job = {
+        'jobReference': {'jobId': 'job_1'},
+        'configuration': {'jobType': 'QUERY'},
+        'statistics': {
+            'startTime': '1700000000000', 'endTime': '1700000002500',
+            'totalBytesProcessed': '1048576', 'totalSlotMs': '420',
+            'query': {'totalBytesBilled': '10485760', 'cacheHit': False},
+        },
+    }
+    metrics = bigquery_job_metrics(job)
+
+    assert metrics == {
+        'job_id': 'job_1', 'job_type': 'QUERY', 'slot_ms': 420, 'bytes_processed': 1048576,
+        'bytes_billed': 10485760, 'cache_hit': False, 'job_seconds': 2.5,
+    }
+
+def test_load_job_metrics():
+    job = {
+        'jobReference': {'jobId': 'job_2'},
+        'configuration': {'jobType': 'LOAD'},
+        'statistics': {'totalSlotMs': '90', 'load': {'inputFileBytes': '2048', 'outputRows': '10', 'outputBytes': '800'}},
+    }
+    metrics = bigquery_job_metrics(job)
+
+    assert metrics['slot_ms'] == 90
+    assert metrics['bytes_processed'] is None
+    assert (metrics['input_file_bytes'], metrics['output_rows'], metrics['output_bytes']) == (2048, 10, 800)
+
+def test_dbt_run_results_metrics(tmp_path):
+    path = tmp_path / 'run_results.json'
+    path.write_text(json.dumps({
+        'metadata': {'generated_at': '2025-03-05T01:00:10Z'},
+        'elapsed_time': 9.5,
+        'results': [{
+            'unique_id': 'model.medallion.contracts_silver',
+            'status': 'success',
+            'execution_time': 8.25,
+            'timing': [
+                {'name': 'compile', 'started_at': '2025-03-05T01:00:00.000000Z', 'completed_at': '2025-03-05T01:00:00.500000Z'},
+                {'name': 'execute', 'started_at': '2025-03-05T01:00:00.500000Z', 'completed_at': '2025-03-05T01:00:08.250000Z'},
+            ],
+            'adapter_response': {'bytes_processed': 5000, 'bytes_billed': 10485760, 'slot_ms': 1200, 'job_id': 'j'},
+        }],
+    }))
+    metrics = dbt_run_results_metrics(str(path))
+
+    assert metrics['elapsed_seconds'] == 9.5
+    node = metrics['nodes'][0]
+    assert (node['resource_type'], node['name'], node['status']) == ('model', 'contracts_silver', 'success')
+    assert node['compile_seconds'] == 0.5 and node['execute_seconds'] == 7.75
+    assert (node['bytes_processed'], node['slot_ms']) == (5000, 1200)
+    assert dbt_run_results_metrics(str(tmp_path / 'missing.json')) is None
+
+def test_child_peak_rss_mb():
+    assert child_peak_rss_mb() >= 0
+
+def test_task_event_is_one_json_line(tmp_path, caplog):
+    started = datetime(2025, 3, 5, 1, 0, tzinfo=timezone.utc)
+    ti = SimpleNamespace(
+        dag_id='medallion_pipeline', task_id='validate_data_quality', run_id='scheduled__2025-03-05',
+        try_number=1, state='success', start_date=started, end_date=None, duration=None,
+    )
+    event = task_event(ti, {'bigquery': {'slot_ms': 420}}, now=datetime(2025, 3, 5, 1, 2, tzinfo=timezone.utc))
+    assert event['duration_seconds'] == 120
+    assert event['ended_at'] == '2025-03-05T01:02:00+00:00'
+
+    path = tmp_path / 'events' / 'tasks.jsonl'
+    with caplog.at_level(logging.INFO, logger='task_instrumentation'):
+        emit_task_event(event, path=str(path))
+        emit_task_event(event, path=str(path))
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == event
+    logged = [r.getMessage() for r in caplog.records if r.getMessage().startswith(TASK_EVENT_PREFIX)]
+    assert json.loads(logged[0][len(TASK_EVENT_PREFIX):])['metrics']['bigquery']['slot_ms'] == 420
@@ -7,20 +7,17 @@ This script validates data against defined expectations using pandas.
 import os
 import sys
 import json
+import hashlib
+import html
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 import datetime
-import great_expectations as ge
-from great_expectations.core.batch import RuntimeBatchRequest
-from great_expectations.data_context import BaseDataContext
-from great_expectations.data_context.types.base import DataContextConfig
-from great_expectations.core.expectation_configuration import ExpectationConfiguration
-from great_expectations.checkpoint import SimpleCheckpoint
-from great_expectations.checkpoint.types.checkpoint_result import CheckpointResult
-from great_expectations.datasource.new_datasource import Datasource
-from great_expectations.execution_engine.sqlalchemy_execution_engine import SqlAlchemyExecutionEngine
-from great_expectations.datasource.data_connector.runtime_data_connector import RuntimeDataConnector
-from great_expectations.datasource.data_connector.configured_asset_sql_data_connector import ConfiguredAssetSqlDataConnector
+from concurrent.futures import ProcessPoolExecutor
+
+# The bronze schema registry lives in the bronze package at the repository root. It is
+# imported where bronze files are read, so importing this module stays cheap
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Load environment variables
 load_dotenv()
@@ -40,59 +37,74 @@ PROJECT_ID = os.environ.get('GCP_PROJECT_ID', 'medallion-dev')
 SILVER_DATASET = os.environ.get('BIGQUERY_DATASET_SILVER', 'medallion_pipeline_silver')
 GOLD_DATASET = os.environ.get('BIGQUERY_DATASET_GOLD', 'medallion_pipeline_gold')
 
-# Configure Great Expectations context
-data_context_config = DataContextConfig(
-    store_backend_defaults=None,
-    datasources={
-        "bigquery_datasource": {
-            "class_name": "Datasource",
-            "execution_engine": {
-                "class_name": "SqlAlchemyExecutionEngine",
-                "connection_string": f"bigquery://{PROJECT_ID}",
+# Rows per chunk when streaming bronze files (0 loads the whole file into memory)
+BRONZE_CHUNK_SIZE = int(os.environ.get('BRONZE_CHUNK_SIZE', '100000'))
+
+# Number of worker processes used to validate datasets in parallel
+VALIDATION_WORKERS = int(os.environ.get('VALIDATION_WORKERS', os.cpu_count() or 1))
+
+# On-disk validation result cache and its size limit in bytes (0 disables the cache)
+VALIDATION_CACHE_DIR = os.environ.get('VALIDATION_CACHE_DIR', os.path.join(GE_DIR, 'uncommitted', 'validation_cache'))
+VALIDATION_CACHE_MAX_BYTES = int(os.environ.get('VALIDATION_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Memory-mapped Arrow caches of parsed bronze files (see bronze/arrow_cache.py)
+ARROW_CACHE_DIR = os.environ.get('BRONZE_ARROW_CACHE_DIR', os.path.join(GE_DIR, 'uncommitted', 'arrow_cache'))
+
+# Great Expectations datasources, by name. They point at BigQuery through SQLAlchemy and
+# are only added to the data context when a SQL-backed validation asks for them.
+DATASOURCES = {
+    "bigquery_datasource": {
+        "class_name": "Datasource",
+        "execution_engine": {
+            "class_name": "SqlAlchemyExecutionEngine",
+            "connection_string": f"bigquery://{PROJECT_ID}",
+        },
+        "data_connectors": {
+            "default_runtime_data_connector": {
+                "class_name": "RuntimeDataConnector",
+                "batch_identifiers": ["default_identifier_name"],
             },
-            "data_connectors": {
-                "default_runtime_data_connector": {
-                    "class_name": "RuntimeDataConnector",
-                    "batch_identifiers": ["default_identifier_name"],
-                },
-                "default_configured_data_connector": {
-                    "class_name": "ConfiguredAssetSqlDataConnector",
-                    "assets": {
-                        "contracts_silver": {
-                            "class_name": "Asset",
-                            "schema_name": f"{SILVER_DATASET}_silver",
-                            "table_name": "contracts_silver",
-                        },
-                        "budgets_silver": {
-                            "class_name": "Asset",
-                            "schema_name": f"{SILVER_DATASET}_silver",
-                            "table_name": "budgets_silver",
-                        },
-                        "change_orders_silver": {
-                            "class_name": "Asset",
-                            "schema_name": f"{SILVER_DATASET}_silver",
-                            "table_name": "change_orders_silver",
-                        },
-                        "contract_analytics": {
-                            "class_name": "Asset",
-                            "schema_name": f"{GOLD_DATASET}_gold",
-                            "table_name": "contract_analytics",
-                        },
-                        "project_analytics": {
-                            "class_name": "Asset",
-                            "schema_name": f"{GOLD_DATASET}_gold",
-                            "table_name": "project_analytics",
-                        }
+            "default_configured_data_connector": {
+                "class_name": "ConfiguredAssetSqlDataConnector",
+                "assets": {
+                    "contracts_silver": {
+                        "class_name": "Asset",
+                        "schema_name": f"{SILVER_DATASET}_silver",
+                        "table_name": "contracts_silver",
+                    },
+                    "budgets_silver": {
+                        "class_name": "Asset",
+                        "schema_name": f"{SILVER_DATASET}_silver",
+                        "table_name": "budgets_silver",
+                    },
+                    "change_orders_silver": {
+                        "class_name": "Asset",
+                        "schema_name": f"{SILVER_DATASET}_silver",
+                        "table_name": "change_orders_silver",
+                    },
+                    "contract_analytics": {
+                        "class_name": "Asset",
+                        "schema_name": f"{GOLD_DATASET}_gold",
+                        "table_name": "contract_analytics",
+                    },
+                    "project_analytics": {
+                        "class_name": "Asset",
+                        "schema_name": f"{GOLD_DATASET}_gold",
+                        "table_name": "project_analytics",
                     }
                 }
             }
         }
-    },
-    expectations_store_name="expectations_store",
-    validations_store_name="validations_store",
-    evaluation_parameter_store_name="evaluation_parameter_store",
-    checkpoint_store_name="checkpoint_store",
-    stores={
+    }
+}
+
+# Great Expectations context configuration, without datasources (see get_datasource)
+DATA_CONTEXT_CONFIG = {
+    "expectations_store_name": "expectations_store",
+    "validations_store_name": "validations_store",
+    "evaluation_parameter_store_name": "evaluation_parameter_store",
+    "checkpoint_store_name": "checkpoint_store",
+    "stores": {
         "expectations_store": {
             "class_name": "ExpectationsStore",
             "store_backend": {
@@ -118,7 +130,7 @@ data_context_config = DataContextConfig(
             }
         }
     },
-    data_docs_sites={
+    "data_docs_sites": {
         "local_site": {
             "class_name": "SiteBuilder",
             "store_backend": {
@@ -129,11 +141,30 @@ data_context_config = DataContextConfig(
                 "class_name": "DefaultSiteIndexBuilder",
             }
         }
-    }
-)
+    },
+}
 
-# Create context and datasource
-context = BaseDataContext(project_config=data_context_config)
+# The Great Expectations context is built on first use. The pandas validation path never
+# needs it, so importing this module stays cheap and works offline.
+_data_context = None
+
+def get_data_context():
+    """Return the Great Expectations data context, building it on first use."""
+    global _data_context
+    if _data_context is None:
+        from great_expectations.data_context import BaseDataContext
+        from great_expectations.data_context.types.base import DataContextConfig
+        
+        project_config = DataContextConfig(store_backend_defaults=None, datasources={}, **DATA_CONTEXT_CONFIG)
+        _data_context = BaseDataContext(project_config=project_config)
+    return _data_context
+
+def get_datasource(name="bigquery_datasource"):
+    """Return a Great Expectations datasource, adding it to the data context on first use."""
+    context = get_data_context()
+    if name not in {datasource["name"] for datasource in context.list_datasources()}:
+        context.add_datasource(name=name, **DATASOURCES[name])
+    return context.get_datasource(name)
 
 def load_expectations(file_path):
     """Load expectations from a JSON file."""
@@ -166,31 +197,38 @@ def validate_not_null(df, column):
         return False
     return True
 
-def validate_column_type(df, column, expected_type):
-    """Validate that a column has the expected data type."""
-    # Map Great Expectations types to pandas dtypes
-    type_mapping = {
-        "NUMERIC": ["int64", "float64"],
-        "STRING": ["object", "string"],
-        "DATE": ["datetime64[ns]", "object"]
-    }
-    
-    # Get the actual type
-    actual_type = str(df[column].dtype)
+# Map Great Expectations types to pandas dtypes
+TYPE_MAPPING = {
+    "NUMERIC": ["int64", "float64", "Int64"],
+    "STRING": ["object", "string", "category"],
+    # Date columns with malformed values are read as strings by the schema registry
+    "DATE": ["datetime64[ns]", "object", "string"]
+}
+
+def column_type_matches(series, expected_type):
+    """Return True if a column's dtype satisfies the expected Great Expectations type."""
+    actual_type = str(series.dtype)
     
     # Check if the column is of the expected type
-    if expected_type in type_mapping and actual_type in type_mapping[expected_type]:
+    if expected_type in TYPE_MAPPING and actual_type in TYPE_MAPPING[expected_type]:
         return True
     
     # For DATE type, try to convert and see if it works
-    if expected_type == "DATE" and actual_type not in type_mapping["DATE"]:
+    if expected_type == "DATE" and actual_type not in TYPE_MAPPING["DATE"]:
         try:
-            pd.to_datetime(df[column])
+            pd.to_datetime(series)
             return True
-        except:
+        except (ValueError, TypeError):
             pass
     
-    print(f"Column '{column}' has type '{actual_type}', expected '{expected_type}'")
+    return False
+
+def validate_column_type(df, column, expected_type):
+    """Validate that a column has the expected data type."""
+    if column_type_matches(df[column], expected_type):
+        return True
+    
+    print(f"Column '{column}' has type '{df[column].dtype}', expected '{expected_type}'")
     return False
 
 def validate_values_in_set(df, column, value_set):
@@ -209,138 +247,580 @@ def validate_unique(df, column):
         return False
     return True
 
-def validate_bronze_layer():
-    """Validate the bronze layer data using pandas."""
-    print("Validating Bronze Layer...")
+# Expectation engine
+#
+# A suite is compiled once into a plan that groups expectations by column, so each
+# column is evaluated in a single vectorized pass (the null mask and value lookups
+# are shared by every check on that column) instead of one full scan per check.
+
+TABLE_EXPECTATIONS = {
+    "expect_table_columns_to_match_ordered_list",
+}
+
+COLUMN_EXPECTATIONS = {
+    "expect_column_values_to_not_be_null",
+    "expect_column_values_to_be_of_type",
+    "expect_column_values_to_be_in_set",
+    "expect_column_values_to_be_unique",
+}
+
+# Maximum number of failing values/rows kept per expectation result
+PARTIAL_UNEXPECTED_COUNT = 20
+
+def compile_expectation_plan(expectations):
+    """Compile an expectation suite into an execution plan grouped by column."""
+    plan = {
+        "table": [],
+        "columns": {},
+        "unsupported": [],
+        "size": 0,
+    }
     
-    # Ensure sample files exist
-    if USE_SAMPLE_FILES:
-        contracts_file = os.path.join(BRONZE_DATA_DIR, 'sample_contracts.csv')
-        budgets_file = os.path.join(BRONZE_DATA_DIR, 'sample_budgets.csv')
-    else:
-        contracts_file = os.path.join(BRONZE_DATA_DIR, 'contracts.csv')
-        budgets_file = os.path.join(BRONZE_DATA_DIR, 'budgets.csv')
+    for index, expectation in enumerate(expectations["expectations"]):
+        expectation_type = expectation["expectation_type"]
+        kwargs = expectation.get("kwargs", {})
+        step = (index, expectation_type, kwargs)
+        
+        if expectation_type in TABLE_EXPECTATIONS:
+            plan["table"].append(step)
+        elif expectation_type in COLUMN_EXPECTATIONS:
+            plan["columns"].setdefault(kwargs["column"], []).append(step)
+        else:
+            plan["unsupported"].append(step)
+        plan["size"] += 1
     
-    if not os.path.exists(contracts_file) or not os.path.exists(budgets_file):
-        print(f"Error: Bronze data files not found at {BRONZE_DATA_DIR}")
-        return False
+    return plan
+
+def _build_result(expectation_type, kwargs, success, element_count=None,
+                  unexpected_count=None, unexpected_values=None, observed_value=None,
+                  exception_message=None):
+    """Build a Great Expectations style result dict for a single expectation."""
+    result = {}
+    if element_count is not None:
+        result["element_count"] = element_count
+    if unexpected_count is not None:
+        result["unexpected_count"] = unexpected_count
+        result["unexpected_percent"] = (unexpected_count / element_count * 100) if element_count else 0.0
+    if unexpected_values is not None:
+        # Report nulls as None so results stay JSON-friendly and comparable
+        unexpected_values = unexpected_values.astype(object).where(unexpected_values.notnull(), None)
+        result["partial_unexpected_list"] = unexpected_values.tolist()
+        result["partial_unexpected_index_list"] = unexpected_values.index.tolist()
+    if observed_value is not None:
+        result["observed_value"] = observed_value
+    
+    return {
+        "expectation_type": expectation_type,
+        "kwargs": kwargs,
+        "success": bool(success),
+        "result": result,
+        "exception_info": {
+            "raised_exception": exception_message is not None,
+            "exception_message": exception_message,
+        },
+    }
+
+def _evaluate_table_step(df, expectation_type, kwargs):
+    """Evaluate a table-level expectation."""
+    if expectation_type == "expect_table_columns_to_match_ordered_list":
+        observed_columns = df.columns.tolist()
+        return _build_result(
+            expectation_type, kwargs,
+            success=observed_columns == kwargs["column_list"],
+            observed_value=observed_columns,
+        )
+
+def _unexpected_mask(series, expectation_type, kwargs, null_mask):
+    """Return the boolean mask of rows failing a row-level column expectation."""
+    if expectation_type == "expect_column_values_to_not_be_null":
+        return null_mask
+    if expectation_type == "expect_column_values_to_be_in_set":
+        return ~series.isin(kwargs["value_set"])
+    if expectation_type == "expect_column_values_to_be_unique":
+        # Every repeat beyond the first occurrence counts as unexpected
+        return series.duplicated()
+    raise ValueError(f"Unsupported row-level expectation: {expectation_type}")
+
+def _evaluate_column_steps(series, steps):
+    """Evaluate every expectation on one column, sharing intermediate masks."""
+    element_count = len(series)
+    null_mask = series.isnull()
+    results = []
     
-    # Validate contracts
-    contracts_success = validate_bronze_contracts(contracts_file)
+    for index, expectation_type, kwargs in steps:
+        if expectation_type == "expect_column_values_to_be_of_type":
+            results.append((index, _build_result(
+                expectation_type, kwargs,
+                success=column_type_matches(series, kwargs["type_"]),
+                element_count=element_count,
+                observed_value=str(series.dtype),
+            )))
+            continue
+        
+        unexpected_mask = _unexpected_mask(series, expectation_type, kwargs, null_mask)
+        unexpected_count = int(unexpected_mask.sum())
+        
+        results.append((index, _build_result(
+            expectation_type, kwargs,
+            success=unexpected_count == 0,
+            element_count=element_count,
+            unexpected_count=unexpected_count,
+            unexpected_values=series[unexpected_mask].head(PARTIAL_UNEXPECTED_COUNT),
+        )))
     
-    # Validate budgets
-    budgets_success = validate_bronze_budgets(budgets_file)
+    return results
+
+def execute_expectation_plan(df, plan):
+    """Execute a compiled plan against a dataframe and return results in suite order."""
+    indexed_results = []
     
-    # Print results
-    print(f"Bronze Layer Validation Results:")
-    print(f"Contracts: {'PASSED' if contracts_success else 'FAILED'}")
-    print(f"Budgets: {'PASSED' if budgets_success else 'FAILED'}")
+    for index, expectation_type, kwargs in plan["table"]:
+        indexed_results.append((index, _evaluate_table_step(df, expectation_type, kwargs)))
     
-    return contracts_success and budgets_success
+    for column, steps in plan["columns"].items():
+        if column not in df.columns:
+            for index, expectation_type, kwargs in steps:
+                indexed_results.append((index, _build_result(
+                    expectation_type, kwargs, success=False,
+                    exception_message=f"Column '{column}' not found in dataset",
+                )))
+            continue
+        indexed_results.extend(_evaluate_column_steps(df[column], steps))
+    
+    indexed_results.sort(key=lambda item: item[0])
+    return [result for _, result in indexed_results]
 
-def validate_bronze_contracts(contracts_file):
-    """Validate the bronze contracts data against expectations."""
+def summarize_results(suite_name, results, unsupported=()):
+    """Wrap per-expectation results into a suite-level validation result."""
+    successful = sum(1 for result in results if result["success"])
+    return {
+        "suite_name": suite_name,
+        "success": successful == len(results),
+        "results": results,
+        "unsupported_expectations": [expectation_type for _, expectation_type, _ in unsupported],
+        "statistics": {
+            "evaluated_expectations": len(results),
+            "successful_expectations": successful,
+            "unsuccessful_expectations": len(results) - successful,
+            "success_percent": (successful / len(results) * 100) if results else 100.0,
+        },
+    }
+
+def run_expectation_suite(df, expectations):
+    """Validate a dataframe against an expectation suite and return structured results."""
+    plan = compile_expectation_plan(expectations)
+    results = execute_expectation_plan(df, plan)
+    return summarize_results(expectations.get("expectation_suite_name"), results, plan["unsupported"])
+
+# Streaming mode
+#
+# Bronze extracts can be larger than worker memory, so they are read in fixed-size
+# chunks while each expectation keeps a small running state. Uniqueness is tracked
+# with a sorted array of 64-bit value hashes: each chunk's hashes are looked up with a
+# binary search and its new ones merged in, so memory grows with the number of distinct
+# values of unique-checked columns (8 bytes each) rather than with the file size, and no
+# chunk re-sorts the hashes seen before it. For the same column dtypes, counts, samples
+# and row indices match the in-memory path. Bronze chunks read straight from the CSV are
+# typed one at a time, though, so a column whose values only fail to parse in some chunks
+# can report a different dtype than a whole-file read.
+
+def _combine_dtypes(dtypes):
+    """Return the dtype pandas would infer for a whole column from its per-chunk dtypes."""
+    if not dtypes:
+        return np.dtype(object)
+    if all(str(dtype) == str(dtypes[0]) for dtype in dtypes):
+        return dtypes[0]
     try:
-        contracts_df = pd.read_csv(contracts_file)
-    except Exception as e:
-        print(f"Error loading contracts data: {str(e)}")
-        return False
+        return np.result_type(*dtypes)
+    except TypeError:
+        # Mixed extension dtypes (strings, categoricals) only combine as object
+        return np.dtype(object)
+
+def _track_seen_hashes(seen_hashes, hashes):
+    """Return which hashes were already seen, and the sorted seen hashes with these merged in."""
+    positions = np.searchsorted(seen_hashes, hashes)
+    seen = np.zeros(len(hashes), dtype=bool)
+    in_range = positions < len(seen_hashes)
+    seen[in_range] = seen_hashes[positions[in_range]] == hashes[in_range]
+    new_hashes = np.unique(hashes[~seen])
+    return seen, np.insert(seen_hashes, np.searchsorted(seen_hashes, new_hashes), new_hashes)
+
+def _init_stream_state(plan):
+    """Create the running state for every step of a compiled plan."""
+    state = {"element_count": 0, "columns": None, "steps": {}}
+    for column, steps in plan["columns"].items():
+        for index, expectation_type, kwargs in steps:
+            state["steps"][index] = {
+                "unexpected_count": 0,
+                "samples": pd.Series(dtype=object),
+                "dtypes": [],
+                "parses_as_date": True,
+                "seen_hashes": np.array([], dtype=np.uint64),
+            }
+    return state
+
+def _update_stream_state(state, plan, chunk):
+    """Fold one chunk of rows into the running state."""
+    if state["columns"] is None:
+        state["columns"] = chunk.columns.tolist()
+    state["element_count"] += len(chunk)
     
-    # Load expectations from Great Expectations directory
-    expectations_path = os.path.join(GE_DIR, 'expectations', 'bronze_contracts.json')
-    if not os.path.exists(expectations_path):
-        # Fall back to original expectations directory
-        expectations_path = os.path.join(EXPECTATIONS_DIR, 'bronze', 'contracts_expectations.json')
+    for column, steps in plan["columns"].items():
+        if column not in chunk.columns:
+            continue
+        series = chunk[column]
+        null_mask = series.isnull()
+        
+        for index, expectation_type, kwargs in steps:
+            step_state = state["steps"][index]
+            
+            if expectation_type == "expect_column_values_to_be_of_type":
+                step_state["dtypes"].append(series.dtype)
+                if kwargs["type_"] == "DATE" and str(series.dtype) not in TYPE_MAPPING["DATE"]:
+                    step_state["parses_as_date"] = step_state["parses_as_date"] and column_type_matches(series, "DATE")
+                continue
+            
+            unexpected_mask = _unexpected_mask(series, expectation_type, kwargs, null_mask)
+            if expectation_type == "expect_column_values_to_be_unique":
+                hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+                seen, step_state["seen_hashes"] = _track_seen_hashes(step_state["seen_hashes"], hashes)
+                unexpected_mask = unexpected_mask | seen
+            
+            step_state["unexpected_count"] += int(unexpected_mask.sum())
+            if len(step_state["samples"]) < PARTIAL_UNEXPECTED_COUNT:
+                step_state["samples"] = pd.concat([
+                    step_state["samples"],
+                    series[unexpected_mask].head(PARTIAL_UNEXPECTED_COUNT - len(step_state["samples"])).astype(object),
+                ])
+
+def _finalize_stream_state(state, plan):
+    """Turn the running state into per-expectation results in suite order."""
+    df_columns = pd.DataFrame(columns=state["columns"] or [])
+    indexed_results = []
     
-    expectations = load_expectations(expectations_path)
-    if expectations is None:
-        return False
+    for index, expectation_type, kwargs in plan["table"]:
+        indexed_results.append((index, _evaluate_table_step(df_columns, expectation_type, kwargs)))
     
-    # Validate expectations
-    all_passed = True
+    for column, steps in plan["columns"].items():
+        for index, expectation_type, kwargs in steps:
+            if column not in df_columns.columns:
+                indexed_results.append((index, _build_result(
+                    expectation_type, kwargs, success=False,
+                    exception_message=f"Column '{column}' not found in dataset",
+                )))
+                continue
+            
+            step_state = state["steps"][index]
+            if expectation_type == "expect_column_values_to_be_of_type":
+                observed_type = _combine_dtypes(step_state["dtypes"])
+                success = str(observed_type) in TYPE_MAPPING.get(kwargs["type_"], [])
+                if not success and kwargs["type_"] == "DATE":
+                    success = step_state["parses_as_date"]
+                indexed_results.append((index, _build_result(
+                    expectation_type, kwargs,
+                    success=success,
+                    element_count=state["element_count"],
+                    observed_value=str(observed_type),
+                )))
+                continue
+            
+            indexed_results.append((index, _build_result(
+                expectation_type, kwargs,
+                success=step_state["unexpected_count"] == 0,
+                element_count=state["element_count"],
+                unexpected_count=step_state["unexpected_count"],
+                unexpected_values=step_state["samples"],
+            )))
     
-    for expectation in expectations["expectations"]:
-        expectation_type = expectation["expectation_type"]
-        kwargs = expectation["kwargs"]
-        
-        if expectation_type == "expect_table_columns_to_match_ordered_list":
-            result = validate_column_list(contracts_df, kwargs["column_list"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_not_be_null":
-            result = validate_not_null(contracts_df, kwargs["column"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_of_type":
-            result = validate_column_type(contracts_df, kwargs["column"], kwargs["type_"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_in_set":
-            result = validate_values_in_set(contracts_df, kwargs["column"], kwargs["value_set"])
-            if not result:
-                all_passed = False
+    indexed_results.sort(key=lambda item: item[0])
+    return [result for _, result in indexed_results]
+
+def read_dataset(data_file, table=None, chunksize=None):
+    """Read a CSV dataset, with the compact dtypes of its bronze table when it has one.
     
-    return all_passed
+    Bronze tables are read through their memory-mapped Arrow cache, so the CSV is only
+    parsed again when it changes.
+    """
+    if table is None:
+        return pd.read_csv(data_file, chunksize=chunksize)
+    from bronze.arrow_cache import read_cached_bronze
+    return read_cached_bronze(data_file, table, chunksize=chunksize, cache_dir=ARROW_CACHE_DIR)
 
-def validate_bronze_budgets(budgets_file):
-    """Validate the bronze budgets data against expectations."""
-    try:
-        budgets_df = pd.read_csv(budgets_file)
-    except Exception as e:
-        print(f"Error loading budgets data: {str(e)}")
-        return False
+def stream_expectation_suite(data_file, expectations, chunk_size=BRONZE_CHUNK_SIZE, table=None):
+    """Validate a CSV file against an expectation suite, reading it in fixed-size chunks."""
+    plan = compile_expectation_plan(expectations)
+    state = _init_stream_state(plan)
+    
+    for chunk in read_dataset(data_file, table, chunksize=chunk_size):
+        _update_stream_state(state, plan, chunk)
     
-    # Load expectations from Great Expectations directory
-    expectations_path = os.path.join(GE_DIR, 'expectations', 'bronze_budgets.json')
+    if state["columns"] is None:
+        # Header-only file: fall back to the in-memory path for an empty frame
+        return run_expectation_suite(read_dataset(data_file, table), expectations)
+    
+    results = _finalize_stream_state(state, plan)
+    return summarize_results(expectations.get("expectation_suite_name"), results, plan["unsupported"])
+
+def format_result_message(result):
+    """Render a failed expectation result as a human readable message."""
+    kwargs = result["kwargs"]
+    details = result["result"]
+    expectation_type = result["expectation_type"]
+    
+    if result["exception_info"]["raised_exception"]:
+        return result["exception_info"]["exception_message"]
+    if expectation_type == "expect_table_columns_to_match_ordered_list":
+        return f"Column mismatch. Expected: {kwargs['column_list']}, Got: {details['observed_value']}"
+    if expectation_type == "expect_column_values_to_not_be_null":
+        return f"Column '{kwargs['column']}' has {details['unexpected_count']} null values"
+    if expectation_type == "expect_column_values_to_be_of_type":
+        return f"Column '{kwargs['column']}' has type '{details['observed_value']}', expected '{kwargs['type_']}'"
+    if expectation_type == "expect_column_values_to_be_in_set":
+        return (f"Column '{kwargs['column']}' has {details['unexpected_count']} values not in the expected set: "
+                f"{details['partial_unexpected_list']}")
+    if expectation_type == "expect_column_values_to_be_unique":
+        return f"Column '{kwargs['column']}' has {details['unexpected_count']} duplicate values"
+    return f"{expectation_type} failed for {kwargs}"
+
+def print_validation_result(validation_result):
+    """Print the failures of a suite-level validation result."""
+    for result in validation_result["results"]:
+        if not result["success"]:
+            print(format_result_message(result))
+    for expectation_type in validation_result["unsupported_expectations"]:
+        print(f"Warning: Unsupported expectation type '{expectation_type}' was skipped")
+
+def resolve_expectations_path(suite_file, fallback_file):
+    """Return the Great Expectations suite path, falling back to the original expectations directory."""
+    expectations_path = os.path.join(GE_DIR, 'expectations', suite_file)
     if not os.path.exists(expectations_path):
-        # Fall back to original expectations directory
-        expectations_path = os.path.join(EXPECTATIONS_DIR, 'bronze', 'budgets_expectations.json')
+        expectations_path = os.path.join(EXPECTATIONS_DIR, *fallback_file)
+    return expectations_path
+
+# Validation result cache
+#
+# Results are content-addressed: the key hashes the data file's bytes together with the
+# expectation suite and the way the file is read (its bronze table's registry dtypes, the
+# type mapping and the chunk size), so an unchanged dataset checked against an unchanged
+# suite is never re-read or re-validated, across runs and across worker processes. Each entry is one JSON
+# file; reads refresh its mtime and writes evict the least recently used entries once the
+# cache grows past VALIDATION_CACHE_MAX_BYTES.
+
+# Bump when the expectation engine changes its results, so older entries are never reused
+VALIDATION_CACHE_VERSION = 3
+
+def file_digest(path, block_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def suite_digest(expectations):
+    """Return the SHA-256 hex digest of an expectation suite, independent of key order."""
+    return hashlib.sha256(json.dumps(expectations, sort_keys=True).encode('utf-8')).hexdigest()
+
+def read_config_digest(table=None, chunk_size=0):
+    """Return the SHA-256 hex digest of how a dataset is read and typed."""
+    dtypes = None
+    if table is not None:
+        from bronze.registry import compact_dtypes
+        dtypes = compact_dtypes(table)
+    config = {"table": table, "dtypes": dtypes, "type_mapping": TYPE_MAPPING, "chunk_size": chunk_size}
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+def validation_cache_key(data_file, expectations, table=None, chunk_size=0):
+    """Return the cache key for validating a data file, read as given, against an expectation suite."""
+    parts = [str(VALIDATION_CACHE_VERSION), file_digest(data_file), suite_digest(expectations),
+             read_config_digest(table, chunk_size)]
+    return hashlib.sha256(':'.join(parts).encode('utf-8')).hexdigest()
+
+def _cache_entry_path(key, cache_dir):
+    """Return the file holding a cache entry."""
+    return os.path.join(cache_dir, key[:2], f'{key}.json')
+
+def read_cached_result(key, cache_dir=VALIDATION_CACHE_DIR):
+    """Return the cached validation result for a key, or None on a miss."""
+    entry_path = _cache_entry_path(key, cache_dir)
+    try:
+        with open(entry_path, 'r') as f:
+            validation_result = json.load(f)
+        # Reading an entry makes it the most recently used
+        os.utime(entry_path)
+        return validation_result
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def evict_validation_cache(max_bytes=VALIDATION_CACHE_MAX_BYTES, cache_dir=VALIDATION_CACHE_DIR):
+    """Remove the least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for root, dirs, files in os.walk(cache_dir):
+        for filename in files:
+            entry_path = os.path.join(root, filename)
+            try:
+                stat = os.stat(entry_path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+    
+    total_bytes = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, entry_path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+    return removed
+
+def write_cached_result(key, validation_result, cache_dir=VALIDATION_CACHE_DIR,
+                        max_bytes=VALIDATION_CACHE_MAX_BYTES):
+    """Store a validation result under a key, then evict down to the size limit."""
+    entry_path = _cache_entry_path(key, cache_dir)
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
     
+    # Concurrent workers may write the same key, so each writes its own file and renames it
+    tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(validation_result, f, default=str)
+    os.replace(tmp_path, entry_path)
+    evict_validation_cache(max_bytes, cache_dir)
+
+def validate_dataset(data_file, expectations_path, label, chunk_size=0, table=None,
+                     cache_dir=VALIDATION_CACHE_DIR, cache_max_bytes=VALIDATION_CACHE_MAX_BYTES):
+    """Load a CSV dataset and validate it against an expectation suite.
+    
+    When chunk_size is set the file is streamed in chunks of that many rows instead of
+    being loaded whole. Columns of the given bronze table are read with its compact
+    dtypes from the schema registry. Results are cached on the data and suite contents and
+    on how the file is read, so unchanged datasets are not validated again. Returns a
+    suite-level validation result dict, or None if the data or suite could not be loaded.
+    """
     expectations = load_expectations(expectations_path)
     if expectations is None:
-        return False
-    
-    # Validate expectations
-    all_passed = True
+        return None
     
-    for expectation in expectations["expectations"]:
-        expectation_type = expectation["expectation_type"]
-        kwargs = expectation["kwargs"]
-        
-        if expectation_type == "expect_table_columns_to_match_ordered_list":
-            result = validate_column_list(budgets_df, kwargs["column_list"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_not_be_null":
-            result = validate_not_null(budgets_df, kwargs["column"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_of_type":
-            result = validate_column_type(budgets_df, kwargs["column"], kwargs["type_"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_in_set":
-            result = validate_values_in_set(budgets_df, kwargs["column"], kwargs["value_set"])
-            if not result:
-                all_passed = False
+    cache_key = None
+    try:
+        if cache_max_bytes > 0:
+            cache_key = validation_cache_key(data_file, expectations, table, chunk_size)
+            validation_result = read_cached_result(cache_key, cache_dir)
+            if validation_result is not None:
+                print(f"Using cached validation result for {label} data")
+                print_validation_result(validation_result)
+                return validation_result
         
-        elif expectation_type == "expect_column_values_to_be_unique":
-            result = validate_unique(budgets_df, kwargs["column"])
-            if not result:
-                all_passed = False
+        if chunk_size:
+            validation_result = stream_expectation_suite(data_file, expectations, chunk_size, table)
+        else:
+            validation_result = run_expectation_suite(read_dataset(data_file, table), expectations)
+    except Exception as e:
+        print(f"Error loading {label} data: {str(e)}")
+        return None
+    
+    if cache_key is not None:
+        try:
+            write_cached_result(cache_key, validation_result, cache_dir, cache_max_bytes)
+        except OSError as e:
+            print(f"Warning: Could not cache the {label} validation result: {str(e)}")
     
-    return all_passed
+    print_validation_result(validation_result)
+    return validation_result
 
-def validate_silver_layer():
-    """Validate the silver layer data using pandas."""
-    print("Validating Silver Layer...")
+# Registered datasets: layer, display name, GE suite file, fallback suite path, chunk size and
+# the bronze table whose registry dtypes its columns are read with. Silver datasets have no
+# table: their columns are renamed, derived and cast by the dbt models, so they are read untyped
+VALIDATION_SUITES = {
+    "bronze_contracts": {
+        "layer": "bronze",
+        "dataset": "Contracts",
+        "label": "contracts",
+        "suite_file": "bronze_contracts.json",
+        "fallback_file": ("bronze", "contracts_expectations.json"),
+        "chunk_size": BRONZE_CHUNK_SIZE,
+        "table": "contracts",
+    },
+    "bronze_budgets": {
+        "layer": "bronze",
+        "dataset": "Budgets",
+        "label": "budgets",
+        "suite_file": "bronze_budgets.json",
+        "fallback_file": ("bronze", "budgets_expectations.json"),
+        "chunk_size": BRONZE_CHUNK_SIZE,
+        "table": "budgets",
+    },
+    "silver_contracts": {
+        "layer": "silver",
+        "dataset": "Contracts",
+        "label": "silver contracts",
+        "suite_file": "silver_contracts.json",
+        "fallback_file": ("silver", "contracts_silver_expectations.json"),
+        "chunk_size": 0,
+        "table": None,
+    },
+}
+
+def validate_table(name, data_file):
+    """Validate a registered dataset against its expectation suite and return the structured result."""
+    suite = VALIDATION_SUITES[name]
+    expectations_path = resolve_expectations_path(suite["suite_file"], suite["fallback_file"])
+    return validate_dataset(data_file, expectations_path, suite["label"], suite["chunk_size"], suite["table"])
+
+def _validate_table_task(task):
+    """Process pool entry point: validate one (name, data_file) pair."""
+    name, data_file = task
+    return name, validate_table(name, data_file)
+
+def run_validations(data_files, max_workers=None):
+    """Validate every dataset exactly once, fanning them out over a process pool.
+    
+    data_files maps registered dataset names to data files. Returns a dict mapping each
+    name to its validation result (None if the data or suite could not be loaded).
+    """
+    max_workers = max_workers or VALIDATION_WORKERS
+    tasks = list(data_files.items())
+    
+    if max_workers <= 1 or len(tasks) <= 1:
+        return dict(map(_validate_table_task, tasks))
+    
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        return dict(executor.map(_validate_table_task, tasks))
+
+def is_passed(validation_result):
+    """Return True if a validation result exists and succeeded."""
+    return validation_result is not None and validation_result["success"]
+
+def print_layer_results(layer, data_files, results):
+    """Print per-dataset results for a layer and return whether the whole layer passed."""
+    print(f"{layer.capitalize()} Layer Validation Results:")
+    for name in data_files:
+        print(f"{VALIDATION_SUITES[name]['dataset']}: {'PASSED' if is_passed(results[name]) else 'FAILED'}")
+    return all(is_passed(results[name]) for name in data_files)
+
+def bronze_data_files():
+    """Return the bronze data files to validate, or None if they are missing."""
+    if USE_SAMPLE_FILES:
+        contracts_file = os.path.join(BRONZE_DATA_DIR, 'sample_contracts.csv')
+        budgets_file = os.path.join(BRONZE_DATA_DIR, 'sample_budgets.csv')
+    else:
+        contracts_file = os.path.join(BRONZE_DATA_DIR, 'contracts.csv')
+        budgets_file = os.path.join(BRONZE_DATA_DIR, 'budgets.csv')
     
+    if not os.path.exists(contracts_file) or not os.path.exists(budgets_file):
+        print(f"Error: Bronze data files not found at {BRONZE_DATA_DIR}")
+        return None
+    
+    return {"bronze_contracts": contracts_file, "bronze_budgets": budgets_file}
+
+def silver_data_files():
+    """Return the silver data files to validate, creating sample silver data if needed.
+    
+    Returns an empty dict when there is nothing to validate, or None on error.
+    """
     # For testing, create a simple silver contracts dataframe if it doesn't exist
     if USE_SAMPLE_FILES:
         # Check if sample contracts file exists
@@ -348,13 +828,14 @@ def validate_silver_layer():
         if not os.path.exists(sample_contracts_file):
             print(f"Warning: Sample contracts file not found at {sample_contracts_file}")
             print("Skipping silver contracts validation.")
-            return True
+            return {}
         
         # Create a silver version of the contracts data if it doesn't exist
         silver_contracts_file = os.path.join(SILVER_DATA_DIR, 'contracts_silver.csv')
         if not os.path.exists(silver_contracts_file):
             try:
-                contracts_df = pd.read_csv(sample_contracts_file)
+                from bronze.arrow_cache import read_cached_bronze
+                contracts_df = read_cached_bronze(sample_contracts_file, 'contracts', cache_dir=ARROW_CACHE_DIR)
                 # Add processed_at column for silver layer
                 contracts_df['processed_at'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
                 
@@ -363,146 +844,290 @@ def validate_silver_layer():
                 contracts_df.to_csv(silver_contracts_file, index=False)
             except Exception as e:
                 print(f"Error creating silver contracts data: {str(e)}")
-                return False
+                return None
     
     # Check if silver data file exists
     silver_contracts_file = os.path.join(SILVER_DATA_DIR, 'contracts_silver.csv')
     if not os.path.exists(silver_contracts_file):
         print(f"Warning: Silver contracts file not found at {silver_contracts_file}")
         print("Skipping silver contracts validation.")
-        return True
-    
-    # Validate silver contracts
-    silver_success = validate_silver_contracts(silver_contracts_file)
+        return {}
     
-    # Print results
-    print(f"Silver Layer Validation Results:")
-    print(f"Contracts: {'PASSED' if silver_success else 'FAILED'}")
-    
-    return silver_success
+    return {"silver_contracts": silver_contracts_file}
 
-def validate_silver_contracts(silver_contracts_file):
-    """Validate the silver contracts data against expectations."""
-    try:
-        contracts_df = pd.read_csv(silver_contracts_file)
-    except Exception as e:
-        print(f"Error loading silver contracts data: {str(e)}")
-        return False
-    
-    # Load expectations from Great Expectations directory
-    expectations_path = os.path.join(GE_DIR, 'expectations', 'silver_contracts.json')
-    if not os.path.exists(expectations_path):
-        # Fall back to original expectations directory
-        expectations_path = os.path.join(EXPECTATIONS_DIR, 'silver', 'contracts_silver_expectations.json')
+def validate_bronze_layer():
+    """Validate the bronze layer data using pandas."""
+    print("Validating Bronze Layer...")
     
-    expectations = load_expectations(expectations_path)
-    if expectations is None:
+    data_files = bronze_data_files()
+    if data_files is None:
         return False
     
-    # Validate expectations
-    all_passed = True
-    
-    for expectation in expectations["expectations"]:
-        expectation_type = expectation["expectation_type"]
-        kwargs = expectation["kwargs"]
-        
-        if expectation_type == "expect_table_columns_to_match_ordered_list":
-            result = validate_column_list(contracts_df, kwargs["column_list"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_not_be_null":
-            result = validate_not_null(contracts_df, kwargs["column"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_of_type":
-            result = validate_column_type(contracts_df, kwargs["column"], kwargs["type_"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_in_set":
-            result = validate_values_in_set(contracts_df, kwargs["column"], kwargs["value_set"])
-            if not result:
-                all_passed = False
-        
-        elif expectation_type == "expect_column_values_to_be_unique":
-            result = validate_unique(contracts_df, kwargs["column"])
-            if not result:
-                all_passed = False
-    
-    return all_passed
+    results = run_validations(data_files)
+    return print_layer_results("bronze", data_files, results)
 
-def generate_data_docs():
-    """Generate simple data docs."""
-    print("Generating Data Docs...")
-    
-    # Create data docs directory
-    data_docs_dir = os.path.join(GE_DIR, 'uncommitted', 'data_docs', 'local_site')
-    os.makedirs(data_docs_dir, exist_ok=True)
+def validate_bronze_contracts(contracts_file):
+    """Validate the bronze contracts data against expectations."""
+    return is_passed(validate_table("bronze_contracts", contracts_file))
+
+def validate_bronze_budgets(budgets_file):
+    """Validate the bronze budgets data against expectations."""
+    return is_passed(validate_table("bronze_budgets", budgets_file))
+
+def validate_silver_layer():
+    """Validate the silver layer data using pandas."""
+    print("Validating Silver Layer...")
     
-    # Get validation results
-    bronze_contracts_result = validate_bronze_contracts(os.path.join(BRONZE_DATA_DIR, 'sample_contracts.csv'))
-    bronze_budgets_result = validate_bronze_budgets(os.path.join(BRONZE_DATA_DIR, 'sample_budgets.csv'))
-    silver_contracts_result = validate_silver_contracts(os.path.join(SILVER_DATA_DIR, 'contracts_silver.csv'))
+    data_files = silver_data_files()
+    if data_files is None:
+        return False
+    if not data_files:
+        return True
     
-    # Create a simple HTML report
-    html_content = f"""<!DOCTYPE html>
+    results = run_validations(data_files)
+    return print_layer_results("silver", data_files, results)
+
+def validate_silver_contracts(silver_contracts_file):
+    """Validate the silver contracts data against expectations."""
+    return is_passed(validate_table("silver_contracts", silver_contracts_file))
+
+# Data docs
+#
+# The docs site is built from the results collected by run_validations, never by validating
+# again. Every distinct suite result gets its own page, named after a hash of the result, so
+# a run whose result did not change links to the page an earlier run rendered. Runs are
+# appended to history pages of DATA_DOCS_RUNS_PER_PAGE runs each; a run only rewrites the
+# newest history page and index.html (a copy of it), so generation time stays flat as the
+# history grows. Failing value samples sit in inert <template> elements and are only
+# rendered when their row is expanded.
+
+DATA_DOCS_DIR = os.environ.get('DATA_DOCS_DIR', os.path.join(GE_DIR, 'uncommitted', 'data_docs', 'local_site'))
+DATA_DOCS_RUNS_PER_PAGE = int(os.environ.get('DATA_DOCS_RUNS_PER_PAGE', '50'))
+
+DATA_DOCS_STYLE = """
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        h1 { color: #2c3e50; }
+        h2 { color: #3498db; }
+        .passed { color: green; }
+        .failed { color: red; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; vertical-align: top; }
+        th { background-color: #f2f2f2; }
+        nav { margin: 12px 0; }
+        nav a { margin-right: 12px; }
+"""
+
+# Renders a failure sample the first time its <details> element is opened
+DATA_DOCS_SCRIPT = """
+        document.addEventListener('toggle', function (event) {
+            var details = event.target;
+            if (!details.open || !details.dataset.sample || details.dataset.rendered) { return; }
+            details.appendChild(document.getElementById(details.dataset.sample).content.cloneNode(true));
+            details.dataset.rendered = 'true';
+        }, true);
+"""
+
+def result_digest(validation_result):
+    """Return a SHA-256 hash identifying a validation result."""
+    return hashlib.sha256(json.dumps(validation_result, sort_keys=True, default=str).encode()).hexdigest()
+
+def _status_cell(passed):
+    """Render a PASSED/FAILED table cell."""
+    return f'<td class="{"passed" if passed else "failed"}">{"PASSED" if passed else "FAILED"}</td>'
+
+def _html_page(title, body):
+    """Wrap a body in a complete data docs HTML page."""
+    return f"""<!DOCTYPE html>
 <html>
 <head>
-    <title>Data Quality Validation Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        h1 {{ color: #2c3e50; }}
-        h2 {{ color: #3498db; }}
-        .passed {{ color: green; }}
-        .failed {{ color: red; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-    </style>
+    <title>{html.escape(title)}</title>
+    <style>{DATA_DOCS_STYLE}    </style>
 </head>
 <body>
-    <h1>Data Quality Validation Report</h1>
-    <p>Generated at: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    <h1>{html.escape(title)}</h1>
+{body}
+    <script>{DATA_DOCS_SCRIPT}    </script>
+</body>
+</html>
+"""
+
+def _write_text_atomic(path, content):
+    """Write a text file atomically, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def _read_json(path, default):
+    """Read a JSON file, returning default if it does not exist."""
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _render_failure_sample(sample_id, result):
+    """Render the lazily shown sample of failing values for one expectation result."""
+    details = result["result"]
+    values = details.get("partial_unexpected_list") or []
+    if not values:
+        return ""
+    indices = details.get("partial_unexpected_index_list") or [None] * len(values)
+    rows = "".join(
+        f"<tr><td>{html.escape(str(index))}</td><td>{html.escape(str(value))}</td></tr>"
+        for index, value in zip(indices, values)
+    )
+    return f"""<details data-sample="{sample_id}"><summary>Show {len(values)} failing values</summary></details>
+                <template id="{sample_id}"><table><tr><th>Row</th><th>Value</th></tr>{rows}</table></template>"""
+
+def render_suite_page(name, validation_result, run_id):
+    """Render the page of one suite result, first produced by the given run."""
+    suite = VALIDATION_SUITES[name]
+    title = f"{suite['layer'].capitalize()} {suite['dataset']} Validation"
+    if validation_result is None:
+        return _html_page(title, f"""    <p>Run {html.escape(run_id)}: the data or expectation suite could not be loaded.</p>
+    <p><a href="../../index.html">All runs</a></p>""")
+    
+    statistics = validation_result["statistics"]
+    rows = ""
+    for index, result in enumerate(validation_result["results"]):
+        column = result["kwargs"].get("column", "")
+        message = "" if result["success"] else html.escape(format_result_message(result))
+        rows += f"""
+        <tr>
+            <td>{html.escape(result['expectation_type'])}</td>
+            <td>{html.escape(str(column))}</td>
+            {_status_cell(result['success'])}
+            <td>{message}
+                {_render_failure_sample(f'sample-{index}', result)}</td>
+        </tr>"""
+    unsupported = "".join(
+        f"<li>{html.escape(expectation_type)}</li>"
+        for expectation_type in validation_result["unsupported_expectations"]
+    )
     
-    <h2>Bronze Layer</h2>
+    return _html_page(title, f"""    <p>Suite: {html.escape(str(validation_result['suite_name']))} | First produced by run {html.escape(run_id)} |
+        <span class="{'passed' if validation_result['success'] else 'failed'}">{'PASSED' if validation_result['success'] else 'FAILED'}</span></p>
+    <p>{statistics['successful_expectations']} of {statistics['evaluated_expectations']} expectations passed
+        ({statistics['success_percent']:.1f}%)</p>
+    <p><a href="../../index.html">All runs</a></p>
     <table>
         <tr>
-            <th>Dataset</th>
+            <th>Expectation</th>
+            <th>Column</th>
             <th>Status</th>
-        </tr>
-        <tr>
-            <td>Contracts</td>
-            <td class="{'passed' if bronze_contracts_result else 'failed'}">{'PASSED' if bronze_contracts_result else 'FAILED'}</td>
-        </tr>
-        <tr>
-            <td>Budgets</td>
-            <td class="{'passed' if bronze_budgets_result else 'failed'}">{'PASSED' if bronze_budgets_result else 'FAILED'}</td>
-        </tr>
+            <th>Details</th>
+        </tr>{rows}
     </table>
+    {f'<h2>Skipped Expectations</h2><ul>{unsupported}</ul>' if unsupported else ''}""")
+
+def write_suite_page(name, validation_result, run_id, docs_dir=DATA_DOCS_DIR):
+    """Write the page of a suite result unless an earlier run already rendered it.
+    
+    Returns the page path relative to docs_dir and whether it was rendered now.
+    """
+    page = f"suites/{name}/{result_digest(validation_result)[:16]}.html"
+    page_path = os.path.join(docs_dir, *page.split('/'))
+    if os.path.exists(page_path):
+        return page, False
+    _write_text_atomic(page_path, render_suite_page(name, validation_result, run_id))
+    return page, True
+
+def _history_page_name(page):
+    """Return the file name of a history page."""
+    return f"runs-{page:05d}.html"
+
+def render_history_page(runs, page, pages):
+    """Render history page number page (of pages so far), newest run first."""
+    rows = ""
+    for run in reversed(runs):
+        links = "<br>".join(
+            f'<a href="{suite["page"]}" class="{"passed" if suite["success"] else "failed"}">'
+            f'{html.escape(suite["layer"].capitalize())} {html.escape(suite["dataset"])}: '
+            f'{"PASSED" if suite["success"] else "FAILED"}</a>'
+            for suite in run["suites"]
+        )
+        rows += f"""
+        <tr>
+            <td>{html.escape(run['run_at'])}</td>
+            {_status_cell(run['success'])}
+            <td>{links}</td>
+        </tr>"""
     
-    <h2>Silver Layer</h2>
+    # Links only point at pages that exist when this page is rendered, so older pages stay valid
+    links = []
+    if page < pages:
+        links.append('<a href="index.html">Latest runs</a>')
+        links.append(f'<a href="{_history_page_name(page + 1)}">Newer runs</a>')
+    if page > 1:
+        links.append(f'<a href="{_history_page_name(page - 1)}">Older runs</a>')
+    
+    return _html_page("Data Quality Validation Report", f"""    <nav>Page {page} {' '.join(links)}</nav>
     <table>
         <tr>
-            <th>Dataset</th>
+            <th>Run</th>
             <th>Status</th>
-        </tr>
-        <tr>
-            <td>Contracts</td>
-            <td class="{'passed' if silver_contracts_result else 'failed'}">{'PASSED' if silver_contracts_result else 'FAILED'}</td>
-        </tr>
-    </table>
-</body>
-</html>
-"""
+            <th>Suites</th>
+        </tr>{rows}
+    </table>""")
+
+def append_run_to_history(run, docs_dir=DATA_DOCS_DIR, runs_per_page=DATA_DOCS_RUNS_PER_PAGE):
+    """Add a run to the paginated history, rewriting only the pages it changes."""
+    history_dir = os.path.join(docs_dir, 'history')
+    state_path = os.path.join(history_dir, 'state.json')
+    state = _read_json(state_path, {"pages": 0, "runs": 0})
     
-    # Write the HTML report
-    with open(os.path.join(data_docs_dir, 'index.html'), 'w') as f:
-        f.write(html_content)
+    pages = state["pages"]
+    runs = _read_json(os.path.join(history_dir, f"runs-{pages:05d}.json"), []) if pages else []
+    if not pages or len(runs) >= runs_per_page:
+        pages += 1
+        if pages > 1:
+            # The previous page now has a newer page to link to
+            _write_text_atomic(os.path.join(docs_dir, _history_page_name(pages - 1)),
+                               render_history_page(runs, pages - 1, pages))
+        runs = []
+    runs.append(run)
     
-    data_docs_path = os.path.join(data_docs_dir, 'index.html')
-    print(f"Data Docs generated at: {data_docs_path}")
+    page_html = render_history_page(runs, pages, pages)
+    _write_text_atomic(os.path.join(history_dir, f"runs-{pages:05d}.json"), json.dumps(runs, default=str))
+    _write_text_atomic(os.path.join(docs_dir, _history_page_name(pages)), page_html)
+    _write_text_atomic(os.path.join(docs_dir, 'index.html'), page_html)
+    _write_text_atomic(state_path, json.dumps({"pages": pages, "runs": state["runs"] + 1}))
+
+def generate_data_docs(results, docs_dir=DATA_DOCS_DIR, run_at=None, runs_per_page=DATA_DOCS_RUNS_PER_PAGE):
+    """Add one validation run to the data docs and return the path of the index page.
+    
+    Takes the results collected by run_validations(). Only suite results that no earlier
+    run produced are rendered; the run itself is appended to the paginated history.
+    """
+    print("Generating Data Docs...")
+    
+    run_at = run_at or datetime.datetime.utcnow()
+    run_id = run_at.strftime('%Y%m%dT%H%M%S%fZ')
+    suites = []
+    rendered = 0
+    for name, validation_result in results.items():
+        page, is_new = write_suite_page(name, validation_result, run_id, docs_dir)
+        rendered += is_new
+        suites.append({
+            "name": name,
+            "layer": VALIDATION_SUITES[name]["layer"],
+            "dataset": VALIDATION_SUITES[name]["dataset"],
+            "success": is_passed(validation_result),
+            "page": page,
+        })
+    
+    append_run_to_history({
+        "run_id": run_id,
+        "run_at": run_at.strftime('%Y-%m-%d %H:%M:%S'),
+        "success": all(suite["success"] for suite in suites),
+        "suites": suites,
+    }, docs_dir, runs_per_page)
+    
+    data_docs_path = os.path.join(docs_dir, 'index.html')
+    print(f"Data Docs generated at: {data_docs_path} "
+          f"({rendered} suite pages rendered, {len(suites) - rendered} unchanged)")
+    return data_docs_path
 
 def main():
     """Main function to run all validations."""
@@ -511,12 +1136,17 @@ def main():
     # Create silver data directory if it doesn't exist
     os.makedirs(SILVER_DATA_DIR, exist_ok=True)
     
-    # Run validations
-    bronze_success = validate_bronze_layer()
-    silver_success = validate_silver_layer()
+    # Collect every dataset up front so each one is validated exactly once, in parallel
+    print("Validating Bronze and Silver Layers...")
+    bronze_files = bronze_data_files()
+    silver_files = silver_data_files()
+    results = run_validations({**(bronze_files or {}), **(silver_files or {})})
+    
+    bronze_success = bronze_files is not None and print_layer_results("bronze", bronze_files, results)
+    silver_success = silver_files is not None and print_layer_results("silver", silver_files, results)
     
-    # Generate data docs
-    generate_data_docs()
+    # Generate data docs from the collected results
+    generate_data_docs(results)
     
     # Print summary
     print("\nValidation Summary:")
@@ -531,4 +1161,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())